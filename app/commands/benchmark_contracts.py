@@ -0,0 +1,103 @@
+import time
+from collections.abc import Awaitable, Callable
+
+from app.commands.styles import error, print_command_title, success
+from app.datasources.db.database import db_session
+from app.datasources.db.models import Contract
+from app.routers.models import ContractsFieldsPublic, ContractsPublic
+from app.services.contract import get_contract_dict
+from app.services.pagination import PaginatedResponse
+
+# Every public field but `abi`, the most expensive one to decode and serialize
+FIELDS_WITHOUT_ABI = set(ContractsPublic.model_fields) - {"abi"}
+
+
+async def _get_orm_page(page_size: int, fields: set[str] | None) -> bytes:
+    """
+    Read path previous to `Contract.get_contract_rows_query`, loading `Contract` instances
+    with their `abi` and `project` and picking the requested fields from them
+
+    :param page_size:
+    :param fields: Fields to read, `None` for all of them
+    :return: Serialized page
+    """
+    # Every request uses a new session, so identity map must not be reused
+    db_session.expunge_all()
+    result = await db_session.execute(Contract.get_contracts_query().limit(page_size))
+    contracts = [
+        ContractsFieldsPublic.model_validate(
+            {field: getattr(contract, field) for field in fields}
+        )
+        if fields
+        else ContractsPublic.model_validate(contract)
+        for contract in result.scalars().all()
+    ]
+    return (
+        PaginatedResponse[ContractsPublic | ContractsFieldsPublic](
+            count=None, next=None, previous=None, results=contracts
+        )
+        .model_dump_json(by_alias=True)
+        .encode()
+    )
+
+
+async def _get_core_page(page_size: int, fields: set[str] | None) -> bytes:
+    """
+    :param page_size:
+    :param fields: Fields to read, `None` for all of them
+    :return: Serialized page
+    """
+    result = await db_session.execute(
+        Contract.get_contract_rows_query(fields=fields).limit(page_size)
+    )
+    model = ContractsFieldsPublic if fields else ContractsPublic
+    contracts = [model.model_validate(get_contract_dict(row)) for row in result.all()]
+    return (
+        PaginatedResponse[ContractsPublic | ContractsFieldsPublic](
+            count=None, next=None, previous=None, results=contracts
+        )
+        .model_dump_json(by_alias=True)
+        .encode()
+    )
+
+
+async def _measure(
+    get_page: Callable[[int, set[str] | None], Awaitable[bytes]],
+    page_size: int,
+    fields: set[str] | None,
+    iterations: int,
+) -> float:
+    """
+    :return: Mean milliseconds per page
+    """
+    await get_page(page_size, fields)  # Warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await get_page(page_size, fields)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+async def benchmark_contract_listings_command(page_size: int, iterations: int):
+    """
+    Compare the ORM and the Core read paths for contract listings using the contracts
+    already stored in database. Nothing is written.
+
+    :param page_size: Contracts per page
+    :param iterations: Pages read on every read path
+    """
+    print_command_title(
+        f"Benchmarking contract listings, {iterations} pages of {page_size} contracts"
+    )
+    for title, fields in (
+        ("With ABI", None),
+        ("Without ABI", FIELDS_WITHOUT_ABI),
+    ):
+        if await _get_orm_page(page_size, fields) != await _get_core_page(
+            page_size, fields
+        ):
+            error(f"{title}: ORM and Core read paths return different responses")
+            continue
+        orm_ms = await _measure(_get_orm_page, page_size, fields, iterations)
+        core_ms = await _measure(_get_core_page, page_size, fields, iterations)
+        print(f"{title}: ORM {orm_ms:.2f} ms/page, Core {core_ms:.2f} ms/page")
+        success(f"{title}: Core read path is {orm_ms / core_ms:.2f}x faster")
@@ -0,0 +1,146 @@
+import datetime
+import logging
+import time
+
+import httpx
+from fastapi import FastAPI
+from starlette.datastructures import URL
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.commands.styles import print_command_title, success
+from app.datasources.db.database import with_db_session_context
+from app.loggers.safe_logger import HttpRequestLog, HttpResponseLog
+from app.main import app
+from app.routers import default
+
+logger = logging.getLogger()
+
+
+async def _legacy_http_redirect_middleware(request: Request, call_next):
+    """
+    `BaseHTTPMiddleware` replaced by `ProxyRedirectMiddleware`, kept to compare with it
+    """
+    response = await call_next(request)
+    prefix = request.headers.get("x-forwarded-prefix", "").rstrip("/")
+    if "location" in response.headers and prefix:
+        original_url = URL(response.headers["location"])
+        host = request.headers.get("x-forwarded-host")
+        protocol = request.headers.get("x-forwarded-proto")
+        port = request.headers.get("x-forwarded-port")
+        response.headers["location"] = str(
+            original_url.replace(
+                scheme=protocol,
+                hostname=host,
+                port=port,
+                path=prefix + original_url.path,
+            )
+        )
+    return response
+
+
+async def _legacy_http_request_middleware(request: Request, call_next):
+    """
+    `BaseHTTPMiddleware` replaced by `RequestLogMiddleware`, kept to compare with it
+    """
+    start_time = datetime.datetime.now(datetime.UTC)
+    response: Response | None = None
+    try:
+        async with with_db_session_context():
+            response = await call_next(request)
+    finally:
+        # Log request
+        try:
+            end_time = datetime.datetime.now(datetime.UTC)
+            total_time = (end_time - start_time).total_seconds() * 1000  # time in ms
+            route = request.scope.get("route")
+            http_request = HttpRequestLog(
+                url=str(request.url),
+                route=route.path if route else None,
+                method=request.method,
+                startTime=start_time,
+            )
+            status_code = response.status_code if response else 500
+            http_response = HttpResponseLog(
+                status=status_code,
+                endTime=end_time,
+                totalTime=int(total_time),
+            )
+            logger.info(
+                "Http request",
+                extra={
+                    "http_response": http_response.model_dump(),
+                    "http_request": http_request.model_dump(),
+                },
+            )
+        except Exception as e:
+            logger.error(f"Validation log error {e}")
+
+    return response
+
+
+def _get_legacy_app() -> FastAPI:
+    """
+    :return: Application with the `/health` route and the previous `BaseHTTPMiddleware`
+        middlewares, in the same order
+    """
+    legacy_app = FastAPI()
+    legacy_app.include_router(default.router)
+    legacy_app.middleware("http")(_legacy_http_redirect_middleware)
+    legacy_app.middleware("http")(_legacy_http_request_middleware)
+    return legacy_app
+
+
+async def _measure(app: FastAPI, iterations: int) -> float:
+    """
+    :return: Mean microseconds per `/health` request
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+        await client.get("/health")  # Warm up
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await client.get("/health")
+    return (time.perf_counter() - start) * 1_000_000 / iterations
+
+
+async def benchmark_middlewares_command(iterations: int):
+    """
+    Measure the per request overhead of the application middlewares and of the previous
+    `BaseHTTPMiddleware` ones, comparing both against an application with the same `/health`
+    route and no middlewares. Overhead is measured with request logging enabled (`INFO`)
+    and disabled (`WARNING`).
+
+    :param iterations: Requests sent to every application
+    """
+    baseline = FastAPI()
+    baseline.include_router(default.router)
+    legacy_app = _get_legacy_app()
+
+    print_command_title(f"Benchmarking middlewares, {iterations} requests to /health")
+    root_logger = logging.getLogger()
+    previous_level = root_logger.level
+    previous_handlers = root_logger.handlers
+    # Do not measure log handlers, just the middlewares
+    root_logger.handlers = [logging.NullHandler()]
+    try:
+        for level in (logging.INFO, logging.WARNING):
+            root_logger.setLevel(level)
+            app_us = await _measure(app, iterations)
+            legacy_us = await _measure(legacy_app, iterations)
+            baseline_us = await _measure(baseline, iterations)
+            level_name = logging.getLevelName(level)
+            print(
+                f"{level_name}: application {app_us:.1f} us/request, "
+                f"previous middlewares {legacy_us:.1f} us/request, "
+                f"no middlewares {baseline_us:.1f} us/request"
+            )
+            success(
+                f"{level_name}: middlewares overhead is {app_us - baseline_us:.1f} us/request, "
+                f"previous middlewares overhead is {legacy_us - baseline_us:.1f} us/request"
+            )
+    finally:
+        root_logger.setLevel(previous_level)
+        root_logger.handlers = previous_handlers
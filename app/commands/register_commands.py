@@ -7,6 +7,8 @@ from typing import Any
 
 from typer import Typer
 
+from app.commands.benchmark_contracts import benchmark_contract_listings_command
+from app.commands.benchmark_middlewares import benchmark_middlewares_command
 from app.commands.download_contract import download_contract_command
 from app.commands.safe_contracts import (
     setup_safe_contracts,
@@ -53,3 +55,13 @@ def register_commands(app: Typer):
     @async_command
     async def download_contract(address: str, chain_id: int):
         await download_contract_command(address, chain_id)
+
+    @app.command(help="Benchmark contract listings read paths")
+    @async_command
+    async def benchmark_contract_listings(page_size: int = 100, iterations: int = 100):
+        await benchmark_contract_listings_command(page_size, iterations)
+
+    @app.command(help="Benchmark per request overhead of the HTTP middlewares")
+    @async_command
+    async def benchmark_middlewares(iterations: int = 1_000):
+        await benchmark_middlewares_command(iterations)
@@ -6,6 +6,7 @@ Base settings file for FastApi application.
 import logging.config
 import os
 import secrets
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -56,6 +57,59 @@ class Settings(BaseSettings):
         "SignMessageLib",
         "SafeMigration",
     ]
+    # Max number of `(address, chainId)` pairs for the contracts batch endpoint
+    CONTRACTS_BATCH_MAX_SIZE: int = 500
+    # Rows fetched from the database server-side cursor, and flushed to the client,
+    # at once by the contracts export endpoint
+    CONTRACTS_EXPORT_BATCH_SIZE: int = 1_000
+    # Contracts modified in the last seconds are not returned by the changes feed yet, so rows
+    # from transactions still in flight (or written by hosts with some clock drift) are not skipped
+    CONTRACTS_CHANGES_SETTLE_SECONDS: float = 5.0
+    CONTRACTS_CHANGES_MAX_PAGE_SIZE: int = 1_000
+    # Bloom filter of contract addresses with ABI, so decoder can skip database lookups
+    # for addresses without ABI (EOAs, unverified contracts...)
+    DATA_DECODER_ADDRESS_FILTER_CAPACITY: int = 1_000_000
+    DATA_DECODER_ADDRESS_FILTER_FALSE_POSITIVE_RATE: float = 0.001
+    # Contracts modified in the last seconds before the latest one added to the filter are read
+    # again on every reload, so rows from transactions committed late are not skipped
+    DATA_DECODER_ADDRESS_FILTER_SETTLE_SECONDS: float = 60.0
+    # Shared Redis cache for contract ABI selectors. Entries are invalidated when the worker updates
+    # the contract, so they can live long. Contracts without ABI are cached for a shorter time
+    DATA_DECODER_CONTRACT_CACHE_TTL: int = 24 * 60 * 60
+    DATA_DECODER_CONTRACT_CACHE_MISSING_TTL: int = 5 * 60
+    # In-memory cache for contract ABI selectors, bounded by entries and approximate size in bytes
+    DATA_DECODER_CONTRACT_LOCAL_CACHE_MAX_ENTRIES: int = 10_000
+    DATA_DECODER_CONTRACT_LOCAL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # `GET /api/v1/data-decoder` can be cached by proxies and CDNs. `data` is limited so urls fit
+    # the usual proxy limits, and responses are revalidated with their ETag after max age
+    DATA_DECODER_GET_DATA_MAX_LENGTH: int = 4_096
+    DATA_DECODER_GET_CACHE_MAX_AGE: int = 60
+    # `POST /api/v1/data-decoder/stream`: lines decoded at the same time, that also bounds the lines
+    # held in memory, and max length of a line
+    DATA_DECODER_STREAM_MAX_CONCURRENCY: int = 16
+    DATA_DECODER_STREAM_LINE_MAX_LENGTH: int = 1024 * 1024
+    # Selectors only get new candidates when new ABIs are loaded, so responses can be cached
+    # for long by clients and CDNs, and revalidated with the ETag of the ABI index generation
+    SELECTORS_CACHE_MAX_AGE: int = 24 * 60 * 60
+    SELECTORS_BATCH_MAX_SIZE: int = 100
+    # Rendered artifacts of `/api/v1/selectors/export`, kept in memory for every generation
+    SELECTORS_EXPORT_LOCAL_CACHE_MAX_ENTRIES: int = 16
+    SELECTORS_EXPORT_LOCAL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # In-process cache for `cache_response` endpoints. Values are served from memory while fresh,
+    # and stale values are served while they are refreshed in background. Set TTL to 0 to disable
+    CACHE_RESPONSE_LOCAL_TTL: float = 1.0
+    CACHE_RESPONSE_LOCAL_STALE_TTL: float = 30.0
+    CACHE_RESPONSE_LOCAL_MAX_ENTRIES: int = 1_000
+    CACHE_RESPONSE_LOCAL_MAX_BYTES: int = 32 * 1024 * 1024
+    # Compression for `cache_response` entries (`gzip`, `zstd` or `none`). Compressed entries are
+    # served as they are to clients accepting the encoding
+    CACHE_RESPONSE_COMPRESSION: Literal["gzip", "zstd", "none"] = "gzip"
+    CACHE_RESPONSE_COMPRESSION_MIN_SIZE: int = 1024
+    # Pre-rendered default page of `/api/v1/contracts/{address}`. It's rebuilt by the worker
+    # every time contract metadata is downloaded, so it can live much longer than other responses
+    CONTRACT_DEFAULT_PAGE_CACHE_TTL: int = 24 * 60 * 60
+    # Time to cache the total count of paginated listings when `count=cached` is requested
+    PAGINATION_COUNT_CACHE_TTL: int = 5 * 60
 
 
 settings = Settings()
@@ -0,0 +1,55 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import gzip
+
+import zstandard
+
+from ...config import settings
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def compress(value: bytes) -> bytes:
+    """
+    Compress `value` using the configured `CACHE_RESPONSE_COMPRESSION`. Values smaller than
+    `CACHE_RESPONSE_COMPRESSION_MIN_SIZE` are not worth compressing and are returned as they are.
+
+    :param value:
+    :return: Compressed value
+    """
+    if len(value) < settings.CACHE_RESPONSE_COMPRESSION_MIN_SIZE:
+        return value
+    match settings.CACHE_RESPONSE_COMPRESSION:
+        case "gzip":
+            return gzip.compress(value, mtime=0)
+        case "zstd":
+            return zstandard.ZstdCompressor().compress(value)
+    return value
+
+
+def get_content_encoding(value: bytes) -> str | None:
+    """
+    Detect the encoding from the magic number, so values stored with a previous
+    configuration can still be read.
+
+    :param value:
+    :return: `Content-Encoding` of the value, `None` if it's not compressed
+    """
+    if value.startswith(GZIP_MAGIC):
+        return "gzip"
+    if value.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def decompress(value: bytes) -> bytes:
+    """
+    :param value: Value returned by `compress`
+    :return: Decompressed value
+    """
+    match get_content_encoding(value):
+        case "gzip":
+            return gzip.decompress(value)
+        case "zstd":
+            return zstandard.ZstdDecompressor().decompress(value)
+    return value
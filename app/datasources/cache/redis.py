@@ -2,22 +2,60 @@
 import asyncio
 import hashlib
 import json
-from collections.abc import Callable
+import logging
+import time
+from collections.abc import Callable, Coroutine, Mapping, Sequence
+from dataclasses import dataclass
 from functools import wraps
-from typing import cast
+from typing import Any
 from weakref import WeakKeyDictionary
 
 from pydantic import BaseModel
 from redis.asyncio import Redis
+from starlette.requests import Request
+from starlette.responses import Response
 
 from ...config import settings
-from ...utils import get_proxy_aware_url
+from ...services.lru_cache import SizeBoundedLRUCache
+from ...utils import (
+    JSON_MEDIA_TYPE,
+    accepts_encoding,
+    get_accepted_media_type,
+    get_proxy_aware_url,
+    is_etag_fresh,
+    serialize_model,
+)
+from ..db.database import with_db_session_context
+from .compression import compress, decompress, get_content_encoding
+
+logger = logging.getLogger(__name__)
+
+ETAG_MARKER = b"\x00"
 
 _redis_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, Redis] = (
     WeakKeyDictionary()
 )
 
 
+@dataclass
+class LocalCachedResponse:
+    value: bytes
+    fresh_until: float
+    stale_until: float
+
+
+# In-process cache for `cache_response`, keyed by `(hash_key, field_key)`
+_local_response_cache = SizeBoundedLRUCache(
+    settings.CACHE_RESPONSE_LOCAL_MAX_ENTRIES,
+    settings.CACHE_RESPONSE_LOCAL_MAX_BYTES,
+)
+# Responses being loaded for every event loop, so concurrent requests for the same
+# `(hash_key, field_key)` wait for the same load instead of running the endpoint again
+_inflight_loads: WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str, str], asyncio.Task[bytes]]
+] = WeakKeyDictionary()
+
+
 def get_redis() -> Redis:
     loop = asyncio.get_running_loop()
     redis = _redis_clients.get(loop)
@@ -38,22 +76,131 @@ def get_key_for_contract(address: str, **kwargs) -> str:
     return f"contract:{address.lower()}"
 
 
+def get_key_for_contract_default_page(
+    address: str, request: Request, **kwargs
+) -> str | None:
+    """
+    Build the Redis cache key for the pre-rendered default page of the contracts of an address.
+
+    :param address: The contract address to use as key identifier.
+    :param request: Request, the default page is the one requested without query params.
+    :param kwargs: Optional additional arguments (ignored).
+    :return: A string cache key in the format 'contract_default_page:<address>', `None` if
+        it's not the default page.
+    """
+    if request.query_params:
+        return None
+    return f"contract_default_page:{address.lower()}"
+
+
 async def del_contract_cache(address: str):
     """
-    Delete the Redis cache entry for a specific contract by address.
+    Delete the Redis cache entries for a specific contract by address, including
+    the pre-rendered default page.
 
     :param address: The contract address used to build the cache key.
     :return: None
     """
-    await get_redis().unlink(get_key_for_contract(address))
+    hash_key = get_key_for_contract(address)
+    clear_local_response_cache(hash_key)
+    await get_redis().unlink(hash_key, f"contract_default_page:{address.lower()}")
+
+
+async def set_contract_default_page_cache(address: str, value: bytes) -> None:
+    """
+    Store the pre-rendered default page of the contracts of an address.
+
+    :param address: The contract address.
+    :param value: Response serialized with `serialize_response`.
+    :return: None
+    """
+    await get_redis().set(
+        f"contract_default_page:{address.lower()}",
+        value,
+        ex=settings.CONTRACT_DEFAULT_PAGE_CACHE_TTL,
+    )
+
+
+def get_key_for_contract_selectors(address: str, chain_id: int | None) -> str:
+    """
+    Build the Redis cache key for the function selectors of a contract ABI.
+
+    :param address: The contract address.
+    :param chain_id: The contract chain id, `None` for the contract on any chain.
+    :return: A string cache key in the format 'contract_selectors:<address>:<chain_id|any>'.
+    """
+    return f"contract_selectors:{address.lower()}:{'any' if chain_id is None else chain_id}"
+
+
+async def del_contract_selectors_cache(address: str, chain_id: int):
+    """
+    Delete the Redis cache entries for the function selectors of a contract ABI, both for
+    the provided chain and for any chain.
+
+    :param address: The contract address.
+    :param chain_id: The contract chain id.
+    :return: None
+    """
+    await get_redis().unlink(
+        get_key_for_contract_selectors(address, chain_id),
+        get_key_for_contract_selectors(address, None),
+    )
+
+
+def get_field_key_for_contract_metadata(chain_id: int) -> str:
+    """
+    Build the field, inside the contract cache key, used to store the metadata of a contract
+    on a chain. As it's stored under `get_key_for_contract`, it's invalidated with the rest of
+    the contract cached responses.
+
+    :param chain_id: The contract chain id.
+    :return: A string field key in the format 'metadata:<chain_id>'.
+    """
+    return f"metadata:{chain_id}"
+
 
+async def hget_many(keys: Sequence[tuple[str, str]]) -> list[bytes | None]:
+    """
+    Get multiple hash fields in one round trip.
 
-def get_field_key(kwargs: dict) -> str:
+    :param keys: List of `(hash_key, field_key)` tuples.
+    :return: Cached values in the same order as `keys`, `None` if not cached.
+    """
+    pipe = get_redis().pipeline(transaction=False)
+    for hash_key, field_key in keys:
+        pipe.hget(hash_key, field_key)
+    return await pipe.execute()
+
+
+async def hset_many(values: Mapping[tuple[str, str], str], expire: int = 60) -> None:
+    """
+    Set multiple hash fields in one round trip. Expiration is set for the hashes
+    just if it's not configured, like `cache_response` does.
+
+    :param values: Mapping of `(hash_key, field_key)` tuples to the value to store.
+    :param expire: Expiration time for the Redis keys in seconds (default: 60).
+    :return: None
+    """
+    if not values:
+        return None
+    hash_keys = list({hash_key for hash_key, _ in values})
+    redis = get_redis()
+    pipe = redis.pipeline(transaction=False)
+    for (hash_key, field_key), value in values.items():
+        pipe.hset(hash_key, field_key, value)
+    for hash_key in hash_keys:
+        pipe.expire(hash_key, expire, nx=True)
+    await pipe.execute()
+    return None
+
+
+def get_field_key(kwargs: dict, media_type: str = JSON_MEDIA_TYPE) -> str:
     """
     Generate a hashed cache key from the given keyword arguments,
     excluding any request-related data.
 
     :param kwargs: Dictionary of keyword arguments passed to the endpoint.
+    :param media_type: Media type of the response, so every format is cached on its own.
     :return: An MD5 hash string representing the filtered and serialized kwargs.
     """
     # Ignore request if it's part of the parameters
@@ -67,12 +214,138 @@ def get_field_key(kwargs: dict) -> str:
         k: v for k, v in kwargs.items() if k != "request" and "request" not in k.lower()
     }
     payload = {"url": url_path, **cacheable_kwargs}
+    if media_type != JSON_MEDIA_TYPE:
+        payload["media_type"] = media_type
     raw_key = json.dumps(payload, sort_keys=True, default=str)
     return hashlib.md5(raw_key.encode()).hexdigest()
 
 
+def clear_local_response_cache(hash_key: str | None = None) -> None:
+    """
+    Remove responses from the in-process cache of `cache_response`.
+
+    :param hash_key: Remove just the responses stored under this Redis key. All if not provided.
+    :return: None
+    """
+    if hash_key is None:
+        _local_response_cache.clear()
+        return None
+    for key in _local_response_cache.keys():
+        if isinstance(key, tuple) and key[0] == hash_key:
+            _local_response_cache.delete(key)
+    return None
+
+
+def _set_local_cached_response(hash_key: str, field_key: str, value: bytes) -> None:
+    if settings.CACHE_RESPONSE_LOCAL_TTL <= 0:
+        return None
+    now = time.monotonic()
+    fresh_until = now + settings.CACHE_RESPONSE_LOCAL_TTL
+    _local_response_cache.set(
+        (hash_key, field_key),
+        LocalCachedResponse(
+            value=value,
+            fresh_until=fresh_until,
+            stale_until=fresh_until + settings.CACHE_RESPONSE_LOCAL_STALE_TTL,
+        ),
+        len(value),
+    )
+    return None
+
+
+def serialize_response(
+    model: type[BaseModel],
+    response: Any,
+    etag: str | None = None,
+    media_type: str = JSON_MEDIA_TYPE,
+) -> bytes:
+    """
+    Serialize a response in the format stored by `cache_response`.
+
+    :param model: Pydantic model used to validate and serialize the response.
+    :param response: Endpoint response. If it's a `Response`, it's considered already
+        serialized and its body is stored as it is.
+    :param etag: ETag of the response, stored together with it.
+    :param media_type: `JSON_MEDIA_TYPE` or `MSGPACK_MEDIA_TYPE`
+    :return: Serialized response, compressed if `CACHE_RESPONSE_COMPRESSION` is set,
+        prefixed by the ETag if provided.
+    """
+    if isinstance(response, Response):
+        value = compress(bytes(response.body))
+    else:
+        # Force validation to trigger field validators that convert bytes
+        value = compress(serialize_model(model.model_validate(response), media_type))
+    if etag:
+        # Marker can't be the first byte of a JSON, MessagePack map, gzip or zstd value
+        return ETAG_MARKER + etag.encode() + b"\n" + value
+    return value
+
+
+def split_etag(value: bytes) -> tuple[str | None, bytes]:
+    """
+    :param value: Value generated by `serialize_response`
+    :return: Tuple with the ETag, if stored, and the serialized response
+    """
+    if value.startswith(ETAG_MARKER):
+        etag, _, value = value[len(ETAG_MARKER) :].partition(b"\n")
+        return etag.decode(), value
+    return None, value
+
+
+def _build_response(
+    request: Request | None, value: bytes, media_type: str = JSON_MEDIA_TYPE
+) -> Response:
+    """
+    :param request: Request, used to check the accepted encodings and `If-None-Match`
+    :param value: Cached value, compressed or not
+    :param media_type: Media type of the cached value
+    :return: `Response` with the cached value as it is if the client accepts its encoding,
+        decompressed otherwise. `304 Not Modified` if client copy matches the stored ETag
+    """
+    etag, value = split_etag(value)
+    headers = {"ETag": etag} if etag else {}
+    headers["Vary"] = "Accept"
+    if etag and request is not None and is_etag_fresh(request, etag):
+        return Response(status_code=304, headers=headers)
+    if (content_encoding := get_content_encoding(value)) is None:
+        return Response(value, media_type=media_type, headers=headers)
+    headers["Vary"] = "Accept, Accept-Encoding"
+    if request is not None and accepts_encoding(request, content_encoding):
+        headers["Content-Encoding"] = content_encoding
+        return Response(value, media_type=media_type, headers=headers)
+    return Response(decompress(value), media_type=media_type, headers=headers)
+
+
+def _get_or_create_load(
+    key: tuple[str, str], load: Callable[[], Coroutine[Any, Any, bytes]]
+) -> asyncio.Task[bytes]:
+    """
+    Single-flight: return the running load for `key`, or start a new one.
+
+    :param key: `(hash_key, field_key)`
+    :param load: Coroutine function to load the response
+    :return: Task loading the response
+    """
+    loop = asyncio.get_running_loop()
+    inflight = _inflight_loads.setdefault(loop, {})
+    if (task := inflight.get(key)) is None:
+        task = loop.create_task(load())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    return task
+
+
+def _log_refresh_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and (exception := task.exception()):
+        logger.warning("Error refreshing cached response: %s", exception)
+
+
 def cache_response(
-    key_builder: Callable[..., str], model: type[BaseModel], expire: int = 60
+    key_builder: Callable[..., str],
+    model: type[BaseModel],
+    expire: int = 60,
+    prerendered_key_builder: Callable[..., str | None] | None = None,
+    etag_builder: Callable[..., str | None] | None = None,
 ):
     """
     Cache the response of an endpoint in Redis using a hash structure.
@@ -82,10 +355,33 @@ def cache_response(
     returned directly. Otherwise, the decorated function is called, and its response is
     validated and cached.
 
+    Cached responses are stored already serialized, and returned as a `Response` with
+    those bytes, so no validation nor serialization is done when they are served. Responses
+    are serialized as MessagePack if the client requests it, and cached on their own. They are
+    compressed using `CACHE_RESPONSE_COMPRESSION`, and served compressed with the matching
+    `Content-Encoding` if the client accepts it.
+
+    Responses are also kept in an in-process cache for `CACHE_RESPONSE_LOCAL_TTL` seconds.
+    After that, they are served stale for `CACHE_RESPONSE_LOCAL_STALE_TTL` seconds while they
+    are refreshed in background. Only one load per key runs at the same time, concurrent
+    requests wait for it.
+
+    Some responses can be pre-rendered by other processes (e.g. the worker after updating
+    a contract) under the key built by `prerendered_key_builder`. Those are checked first,
+    and are stored if missing, unless they have a `next` page, as its url depends on the request.
+    Responses stored here expire after `expire` seconds like the rest of the cache, only the
+    process pre-rendering them, which knows when they change, can store them for longer.
+    Pre-rendered responses are JSON, so they are not used for other media types.
+
     :param key_builder: Function that builds the Redis key from kwargs.
     :param model: Pydantic model used to validate and serialize the response.
     :param expire: Expiration time for the Redis key in seconds (default: 60).
-    :return: The original or cached response.
+    :param prerendered_key_builder: Function that builds the Redis key for the pre-rendered
+        response from kwargs, `None` if the response is not pre-rendered.
+    :param etag_builder: Function that builds the ETag from the endpoint response and kwargs.
+        The ETag is stored with the cached response, so `If-None-Match` requests are answered
+        with `304 Not Modified` without calling the endpoint.
+    :return: `Response` with the serialized original or cached response.
     """
 
     def decorator(func):
@@ -93,29 +389,72 @@ def cache_response(
         async def wrapper(*args, **kwargs):
             # Serialize arguments to create a cache key
             hash_key = key_builder(**kwargs)
-            field_key = get_field_key(kwargs)
-
-            # Try to fetch from Redis cache
-            redis = get_redis()
-            cached_response = await redis.hget(hash_key, field_key)  # type: ignore[misc]
-            if cached_response:
-                # Return cached response if it exists
-                return json.loads(cast(str, cached_response))
-
-            # Call the original endpoint if no cache
-            response = await func(*args, **kwargs)
-
-            # Store the response in cache for later
-            # Force validation to trigger field validators that convert bytes
-            validated_response = model.model_validate(response)
-            await redis.hset(  # type: ignore[misc]
-                hash_key, field_key, validated_response.model_dump_json(by_alias=True)
+            request = kwargs.get("request")
+            media_type = get_accepted_media_type(request)
+            field_key = get_field_key(kwargs, media_type)
+            key = (hash_key, field_key)
+            prerendered_key = (
+                prerendered_key_builder(**kwargs)
+                if prerendered_key_builder and media_type == JSON_MEDIA_TYPE
+                else None
             )
-            # Set expiration just if is not configured
-            if await redis.ttl(hash_key) == -1:
-                await redis.expire(hash_key, expire)
 
-            return response
+            async def load_response() -> bytes:
+                # Try to fetch from Redis cache
+                redis = get_redis()
+                pipe = redis.pipeline(transaction=False)
+                pipe.hget(hash_key, field_key)
+                if prerendered_key:
+                    pipe.get(prerendered_key)
+                results = await pipe.execute()
+                # Pre-rendered response, if requested, is the last one and takes priority
+                if cached_response := results[-1] or results[0]:
+                    _set_local_cached_response(hash_key, field_key, cached_response)
+                    return cached_response
+
+                # Call the original endpoint if no cache
+                response = await func(*args, **kwargs)
+
+                # Store the response in cache for later
+                value = serialize_response(
+                    model,
+                    response,
+                    etag_builder(response, **kwargs) if etag_builder else None,
+                    media_type,
+                )
+                pipe = redis.pipeline(transaction=False)
+                pipe.hset(hash_key, field_key, value)  # type: ignore[arg-type]
+                # Set expiration just if is not configured
+                pipe.expire(hash_key, expire, nx=True)
+                if prerendered_key and getattr(response, "next", None) is None:
+                    # Don't overwrite a response pre-rendered meanwhile, it could be newer
+                    pipe.set(prerendered_key, value, ex=expire, nx=True)
+                await pipe.execute()
+
+                _set_local_cached_response(hash_key, field_key, value)
+                return value
+
+            async def load() -> bytes:
+                # Load is shared with other requests and can outlive the one starting it,
+                # so it must not use the database session of that request
+                async with with_db_session_context():
+                    return await load_response()
+
+            local_cached_response = _local_response_cache.get(key)
+            if local_cached_response is not None:
+                now = time.monotonic()
+                if now < local_cached_response.fresh_until:
+                    return _build_response(
+                        request, local_cached_response.value, media_type
+                    )
+                if now < local_cached_response.stale_until:
+                    _get_or_create_load(key, load).add_done_callback(_log_refresh_error)
+                    return _build_response(
+                        request, local_cached_response.value, media_type
+                    )
+
+            value = await asyncio.shield(_get_or_create_load(key, load))
+            return _build_response(request, value, media_type)
 
         return wrapper
 
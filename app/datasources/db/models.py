@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 import datetime
 import json
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 from typing import Self, cast
 
 from eth_typing import ABI
@@ -9,16 +9,26 @@ from sqlalchemy import (
     BigInteger,
     Computed,
     DateTime,
+    Index,
     LargeBinary,
     Text,
+    any_,
+    bindparam,
+    case,
     func,
     literal,
+    or_,
+    text,
+    tuple_,
     update,
 )
 from sqlalchemy import cast as sa_cast
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.engine import CursorResult
+from sqlalchemy import select as sa_select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.engine import CursorResult, Row
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql import Select
 from sqlmodel import (
     JSON,
     Column,
@@ -205,6 +215,16 @@ class Abi(SqlQueryBase, TimeStampedSQLModel, table=True):
         result = await db_session.execute(query)
         return result.scalars().first()
 
+    @classmethod
+    async def get_abi_by_hash(cls, abi_hash: bytes) -> "Abi | None":
+        """
+        :param abi_hash: `abi_hash` generated column value
+        :return: The Abi object if it exists, or None if it doesn't.
+        """
+        query = select(cls).where(cls.abi_hash == abi_hash).limit(1)
+        result = await db_session.execute(query)
+        return result.scalars().first()
+
     @classmethod
     async def get_or_create_abi(
         cls,
@@ -242,9 +262,29 @@ class Project(SqlQueryBase, SQLModel, table=True):
     contracts: list["Contract"] = Relationship(back_populates="project")
 
 
+# Contract columns returned by `Contract.get_contract_rows_query`
+CONTRACT_ROW_COLUMNS = (
+    "address",
+    "name",
+    "display_name",
+    "chain_id",
+    "modified",
+    "trusted_for_delegate_call",
+    "fetch_retries",
+)
+
+
 class Contract(SqlQueryBase, TimeStampedSQLModel, table=True):
     __table_args__ = (
         UniqueConstraint("address", "chain_id", name="address_chain_unique"),
+        Index("ix_contract_modified", "modified"),
+        Index(
+            "ix_contract_implementation",
+            "implementation",
+            postgresql_where=text("implementation IS NOT NULL"),
+        ),
+        # `gin_trgm_ops` indexes for `name` and `display_name` are only created by migration
+        # `d7e1f4a2b9c3`, as they require `pg_trgm` extension
     )
 
     id: int | None = Field(default=None, primary_key=True)
@@ -302,6 +342,216 @@ class Contract(SqlQueryBase, TimeStampedSQLModel, table=True):
         query = query.order_by(col(cls.address), col(cls.chain_id))
         return query
 
+    @classmethod
+    def get_contract_rows_query(
+        cls,
+        address: bytes | None = None,
+        chain_ids: list[int] | None = None,
+        trusted_for_delegate_call: bool | None = None,
+        fields: set[str] | None = None,
+    ) -> Select:
+        """
+        Same as `get_contracts_query`, but selecting just the public columns using SQLAlchemy Core.
+        Rows are returned as they are, without building `Contract`, `Abi` and `Project` instances,
+        so they are much cheaper to read for listings.
+
+        ABI columns are labeled `abi_hash`, `abi_json` and `abi_modified`, and project
+        columns `project_description` and `project_logo_file`.
+
+        :param address:
+        :param chain_ids: list of chain_ids, `None` for all chains
+        :param trusted_for_delegate_call: only return contracts trusted for delegate call
+        :param fields: only select these attributes, `None` for all of them. `address`,
+            `chain_id` and `modified` are always selected. `abi` and `project` are not joined
+            if not requested
+        :return:
+        """
+        contract_table = cls.__table__  # type: ignore[attr-defined]
+        abi_table = Abi.__table__  # type: ignore[attr-defined]
+        project_table = Project.__table__  # type: ignore[attr-defined]
+        column_names = [
+            column_name
+            for column_name in CONTRACT_ROW_COLUMNS
+            if fields is None
+            or column_name in fields
+            or column_name in ("address", "chain_id", "modified")
+        ]
+        columns = [contract_table.c[column_name] for column_name in column_names]
+        from_clause = contract_table
+        if fields is None or "abi" in fields:
+            columns += [
+                contract_table.c.abi_id,
+                abi_table.c.abi_hash,
+                abi_table.c.abi_json,
+                abi_table.c.modified.label("abi_modified"),
+            ]
+            from_clause = from_clause.outerjoin(
+                abi_table, abi_table.c.id == contract_table.c.abi_id
+            )
+        if fields is None or "project" in fields:
+            columns += [
+                contract_table.c.project_id,
+                project_table.c.description.label("project_description"),
+                project_table.c.logo_file.label("project_logo_file"),
+            ]
+            from_clause = from_clause.outerjoin(
+                project_table, project_table.c.id == contract_table.c.project_id
+            )
+
+        query = sa_select(*columns).select_from(from_clause)
+        if address:  # Filter by the provided address
+            query = query.where(contract_table.c.address == address)
+        if trusted_for_delegate_call is not None:
+            query = query.where(
+                contract_table.c.trusted_for_delegate_call == trusted_for_delegate_call
+            )
+        if chain_ids:
+            query = query.where(contract_table.c.chain_id.in_(chain_ids))
+
+        # Sort by address
+        return query.order_by(contract_table.c.address, contract_table.c.chain_id)
+
+    @classmethod
+    def get_contracts_search_query(
+        cls,
+        search: str,
+        chain_ids: list[int] | None = None,
+        fields: set[str] | None = None,
+    ) -> Select:
+        """
+        Return a statement to search contracts by `name` or `display_name`. Contracts whose name
+        starts with `search` or contains a word similar to it, using `pg_trgm` word similarity,
+        are returned. Prefix matches are returned first, then the most similar ones. Both
+        filters are backed by the `gin_trgm_ops` indexes created on migration `d7e1f4a2b9c3`,
+        so only matching rows are read and sorted.
+
+        :param search: text to search, `%` and `_` are matched literally
+        :param chain_ids: list of chain_ids, `None` for all chains
+        :param fields: only select these attributes, `None` for all of them
+        :return: Same rows as `get_contract_rows_query`
+        """
+        name = col(cls.name)
+        display_name = col(cls.display_name)
+        prefix_match = or_(
+            name.istartswith(search, autoescape=True),
+            display_name.istartswith(search, autoescape=True),
+        )
+        # `text %> search` is `word_similarity(search, text)` over `pg_trgm.word_similarity_threshold`
+        similar_match = or_(name.op("%>")(search), display_name.op("%>")(search))
+        # `greatest` ignores `NULL`, contracts can miss `name` or `display_name`
+        similarity = func.greatest(
+            func.word_similarity(search, name),
+            func.word_similarity(search, display_name),
+        )
+        return (
+            cls.get_contract_rows_query(chain_ids=chain_ids, fields=fields)
+            .where(or_(prefix_match, similar_match))
+            .order_by(None)
+            .order_by(
+                case((prefix_match, 0), else_=1),
+                similarity.desc(),
+                func.coalesce(display_name, name),
+                col(cls.address),
+                col(cls.chain_id),
+            )
+        )
+
+    @classmethod
+    async def stream_contracts(
+        cls,
+        chain_ids: list[int] | None = None,
+        trusted_for_delegate_call: bool | None = None,
+        fields: set[str] | None = None,
+        batch_size: int = 1_000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream contracts using a server-side cursor, so memory usage is bounded by `batch_size`
+        no matter how many contracts are returned.
+
+        :param chain_ids: list of chain_ids, `None` for all chains
+        :param trusted_for_delegate_call: only return contracts trusted for delegate call
+        :param fields: only select these attributes, `None` for all of them
+        :param batch_size: number of contracts fetched from the cursor at once
+        :return: batches of rows, as returned by `get_contract_rows_query`, sorted by
+            `address` and `chain_id`
+        """
+        query = cls.get_contract_rows_query(
+            chain_ids=chain_ids,
+            trusted_for_delegate_call=trusted_for_delegate_call,
+            fields=fields,
+        ).execution_options(yield_per=batch_size)
+        result = await db_session.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+    @classmethod
+    async def get_contracts_modified_after(
+        cls,
+        modified_before: datetime.datetime,
+        cursor: tuple[datetime.datetime, bytes, int] | None = None,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """
+        Get contracts sorted by `modified`, starting after `cursor`. `address` and `chain_id` are
+        used to break ties, so contracts sharing the same `modified` are never skipped. The leading
+        `modified >=` filter allows Postgres to use `ix_contract_modified` for the seek.
+
+        :param modified_before: only return contracts modified on or before this datetime
+        :param cursor: `(modified, address, chain_id)` of the last contract already returned,
+            `None` to start from the beginning
+        :param limit: max number of contracts to return
+        :return: rows, as returned by `get_contract_rows_query`, sorted by `modified`,
+            `address` and `chain_id`
+        """
+        query = (
+            cls.get_contract_rows_query()
+            .where(col(cls.modified) <= modified_before)
+            .order_by(None)
+        )
+        if cursor is not None:
+            query = query.where(col(cls.modified) >= cursor[0]).where(
+                tuple_(col(cls.modified), col(cls.address), col(cls.chain_id)) > cursor
+            )
+        query = query.order_by(
+            col(cls.modified), col(cls.address), col(cls.chain_id)
+        ).limit(limit)
+        result = await db_session.execute(query)
+        return result.all()
+
+    @classmethod
+    async def get_contracts_by_address_and_chain_id(
+        cls, address_chain_ids: list[tuple[bytes, int]]
+    ) -> list["Contract"]:
+        """
+        Get contracts for the provided `(address, chain_id)` pairs in one query. ABI is not loaded.
+
+        :param address_chain_ids: list of `(address, chain_id)` tuples
+        :return: contracts found, not sorted
+        """
+        if not address_chain_ids:
+            return []
+        addresses = list({address for address, _ in address_chain_ids})
+        chain_ids = list({chain_id for _, chain_id in address_chain_ids})
+        query = (
+            select(cls)
+            .options(raiseload(cls.abi))  # type: ignore
+            .where(
+                cls.address
+                == any_(bindparam("addresses", addresses, type_=ARRAY(LargeBinary)))
+            )
+            .where(
+                cls.chain_id
+                == any_(bindparam("chain_ids", chain_ids, type_=ARRAY(BigInteger)))
+            )
+        )
+        results = await db_session.execute(query)
+        requested = set(address_chain_ids)
+        return [
+            contract
+            for contract in results.scalars().all()
+            if (contract.address, contract.chain_id) in requested
+        ]
+
     @classmethod
     async def get_contract(cls, address: bytes, chain_id: int):
         query = (
@@ -368,6 +618,73 @@ class Contract(SqlQueryBase, TimeStampedSQLModel, table=True):
             return cast(ABI, result)
         return None
 
+    @classmethod
+    async def get_abi_and_implementation_by_contract_address(
+        cls, address: bytes, chain_id: int | None
+    ) -> tuple[ABI, bytes | None, int] | None:
+        """
+        :return: Json ABI, proxy implementation address and `chain_id` given the contract `address`
+            and `chain_id`. If `chain_id` is not given, sort the contracts by `chain_id` and return
+            the first one. `None` if contract with ABI is not found.
+        """
+        query = (
+            select(Abi.abi_json, cls.implementation, cls.chain_id)
+            .join(cls)
+            .where(cls.address == address)
+            .where(cls.abi_id == Abi.id)
+        )
+        if chain_id is not None:
+            query = query.where(cls.chain_id == chain_id)
+        else:
+            query = query.order_by(col(cls.chain_id))
+
+        results = await db_session.execute(query.limit(1))
+        if result := results.first():
+            abi_json, implementation, contract_chain_id = result
+            return cast(ABI, abi_json), implementation, contract_chain_id
+        return None
+
+    @classmethod
+    async def get_last_modified_and_implementations_by_addresses(
+        cls, addresses: list[bytes]
+    ) -> tuple[datetime.datetime | None, set[bytes]]:
+        """
+        :param addresses: Contract addresses
+        :return: Latest `modified` of the contracts with any of the `addresses` on any chain,
+            `None` if there are none, and the implementations of the proxies among them
+        """
+        query = select(cls.modified, cls.implementation).where(
+            col(cls.address).in_(addresses)
+        )
+        last_modified: datetime.datetime | None = None
+        implementations: set[bytes] = set()
+        for modified, implementation in await db_session.execute(query):
+            if last_modified is None or modified > last_modified:
+                last_modified = modified
+            if implementation is not None:
+                implementations.add(implementation)
+        return last_modified, implementations
+
+    @classmethod
+    async def get_addresses_with_abi(
+        cls, modified_from: datetime.datetime | None = None
+    ) -> AsyncIterator[tuple[bytes, datetime.datetime]]:
+        """
+        Stream the addresses of the contracts with ABI. Same address can be returned more than
+        once if it's deployed on multiple chains.
+
+        :param modified_from: only return contracts modified on or after it
+        :return: tuples of `address` and `modified` datetime
+        """
+        query = select(cls.address, cls.modified).where(
+            cls.abi_id.isnot(None)  # type: ignore
+        )
+        if modified_from is not None:
+            query = query.where(col(cls.modified) >= modified_from)
+        result = await db_session.stream(query)
+        async for address, modified in result:
+            yield address, modified
+
     @classmethod
     async def get_contracts_without_abi(
         cls, max_retries: int = 0
@@ -390,6 +707,20 @@ class Contract(SqlQueryBase, TimeStampedSQLModel, table=True):
         async for (contract,) in result:
             yield contract
 
+    @classmethod
+    async def get_proxy_addresses_by_implementations(
+        cls, implementations: list[bytes], chain_id: int
+    ) -> list[bytes]:
+        """
+        :param implementations: Implementation addresses
+        :param chain_id:
+        :return: Addresses of the proxy contracts on the chain using any of the implementations
+        """
+        query = select(cls.address).where(
+            col(cls.implementation).in_(implementations), cls.chain_id == chain_id
+        )
+        return list((await db_session.execute(query)).scalars().all())
+
     @classmethod
     async def get_proxy_contracts(cls) -> AsyncIterator[Self]:
         """
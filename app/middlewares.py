@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import datetime
+import logging
+
+from starlette.datastructures import URL, Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .datasources.db.database import with_db_session_context
+from .loggers.safe_logger import HttpRequestLog, HttpResponseLog
+
+logger = logging.getLogger()
+
+
+class ProxyRedirectMiddleware:
+    """
+    Intercepts HTTP response redirects and updates the Location header when behind a proxy.
+
+    This middleware handles cases where the application is deployed behind a reverse proxy
+    that forwards requests with custom headers. When a redirect response is generated,
+    it ensures the Location header reflects the correct external URL by incorporating
+    proxy forwarding headers.
+
+    Proxy Headers Used:
+        - x-forwarded-prefix: Path prefix to prepend to the redirect location
+        - x-forwarded-host: External hostname visible to clients
+        - x-forwarded-proto: External protocol (http/https)
+        - x-forwarded-port: External port number
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        prefix = request_headers.get("x-forwarded-prefix", "").rstrip("/")
+        if not prefix:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                if "location" in response_headers:
+                    original_url = URL(response_headers["location"])
+                    response_headers["location"] = str(
+                        original_url.replace(
+                            scheme=request_headers.get("x-forwarded-proto"),
+                            hostname=request_headers.get("x-forwarded-host"),
+                            port=request_headers.get("x-forwarded-port"),
+                            path=prefix + original_url.path,
+                        )
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class RequestLogMiddleware:
+    """
+    Intercepts request and do some actions:
+     - Set the database session context for the current request, so the same database session is used across the whole request.
+     - Log requests calls. Log models are only built if `INFO` level is enabled.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = datetime.datetime.now(datetime.UTC)
+        status_code: int | None = None
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            async with with_db_session_context():
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            if logger.isEnabledFor(logging.INFO):
+                self.log_request(scope, start_time, status_code)
+
+    @staticmethod
+    def log_request(
+        scope: Scope, start_time: datetime.datetime, status_code: int | None
+    ):
+        """
+        :param scope:
+        :param start_time:
+        :param status_code: `None` if no response was sent, logged as `500`
+        """
+        try:
+            end_time = datetime.datetime.now(datetime.UTC)
+            total_time = (end_time - start_time).total_seconds() * 1000  # time in ms
+            route = scope.get("route")
+            http_request = HttpRequestLog(
+                url=str(Request(scope).url),
+                route=route.path if route else None,
+                method=scope["method"],
+                startTime=start_time,
+            )
+            http_response = HttpResponseLog(
+                status=status_code or 500,
+                endTime=end_time,
+                totalTime=int(total_time),
+            )
+            logger.info(
+                "Http request",
+                extra={
+                    "http_response": http_response.model_dump(),
+                    "http_request": http_request.model_dump(),
+                },
+            )
+        except Exception as e:
+            logger.error(f"Validation log error {e}")
@@ -0,0 +1,63 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Path, Request, Response
+
+from ..datasources.db.models import Abi
+from ..utils import is_etag_fresh
+from .models import AbiJsonPublic
+
+router = APIRouter(
+    prefix="/abis",
+    tags=["abis"],
+)
+
+# ABIs are content-addressed, so the response for a hash never changes
+ABI_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get(
+    "/{abi_hash}",
+    response_model=AbiJsonPublic,
+    summary="Get an ABI by its hash",
+    response_description="ABI matching the provided hash",
+    description="""
+    Return the ABI JSON for the provided `abi_hash`, as returned in `abiHash` by the contracts endpoints.
+
+    **Parameters:**
+    - `abi_hash`: `0x` prefixed sha256 hash of the ABI.
+
+    **Notes**
+    - Responses are immutable, they are returned with `Cache-Control: immutable` and a strong `ETag`.
+      `If-None-Match` is supported and `304 Not Modified` is returned if the ETag matches.
+    """,
+)
+async def get_abi(
+    request: Request,
+    abi_hash: Annotated[
+        str,
+        Path(
+            pattern=r"^0x[0-9a-fA-F]{64}$",
+            description="0x-prefixed sha256 hash of the ABI.",
+        ),
+    ],
+) -> Response:
+    """
+    Return the ABI JSON for the provided `abi_hash`.
+
+    :param request:
+    :param abi_hash: `0x` prefixed sha256 hash of the ABI.
+    :return: ABI with immutable caching headers, `304` if the client copy is up to date.
+    """
+    abi_hash_bytes = bytes.fromhex(abi_hash[2:])
+    headers = {"Cache-Control": ABI_CACHE_CONTROL, "ETag": f'"{abi_hash_bytes.hex()}"'}
+    if is_etag_fresh(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    abi = await Abi.get_abi_by_hash(abi_hash_bytes)
+    if abi is None:
+        raise HTTPException(status_code=404, detail="ABI not found")
+    return Response(
+        AbiJsonPublic.model_validate(abi).model_dump_json(by_alias=True),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
 from .. import VERSION
-from .models import AboutPublic
+from ..services.data_decoder import get_data_decoder_service
+from .models import AboutPublic, CacheStatsPublic
 
 router = APIRouter(
     prefix="/about",
@@ -12,3 +13,20 @@ router = APIRouter(
 @router.get("", response_model=AboutPublic)
 async def about() -> AboutPublic:
     return AboutPublic(version=VERSION)
+
+
+@router.get(
+    "/data-decoder-cache",
+    response_model=CacheStatsPublic,
+    summary="Data decoder contract cache stats",
+    response_description="Stats of the in-memory contract ABI cache of this process",
+)
+async def about_data_decoder_cache() -> CacheStatsPublic:
+    """
+    Return hits, misses, evictions and size of the in-memory cache used by the data decoder
+    for the contract ABIs. Stats are per process.
+    """
+    data_decoder_service = await get_data_decoder_service()
+    return CacheStatsPublic.model_validate(
+        data_decoder_service.get_contract_selectors_cache_stats()
+    )
@@ -1,24 +1,221 @@
-from typing import Annotated
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, cast
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from hexbytes import HexBytes
 from safe_eth.eth.utils import fast_is_checksum_address
+from sqlalchemy.orm import InstrumentedAttribute
 
-from ..datasources.cache.redis import cache_response, get_key_for_contract
-from ..services.contract import ContractService
+from ..config import settings
+from ..datasources.cache.redis import (
+    cache_response,
+    get_field_key_for_contract_metadata,
+    get_key_for_contract,
+    get_key_for_contract_default_page,
+    hget_many,
+    hset_many,
+)
+from ..datasources.db.database import with_db_session_context
+from ..datasources.db.models import Contract
+from ..services.contract import (
+    ContractService,
+    get_contracts_etag,
+    get_contracts_public,
+    get_paginated_contracts_etag,
+)
 from ..services.pagination import (
     GenericPagination,
     PaginatedResponse,
     PaginationQueryParams,
+    get_pagination,
+)
+from ..utils import (
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    encode_content,
+    get_accepted_media_type,
+    get_proxy_aware_url,
+    is_etag_fresh,
+    serialize_model,
+)
+from .models import (
+    ContractChangesPublic,
+    ContractMetadataPublic,
+    ContractsBatchInput,
+    ContractsFieldsPublic,
+    ContractsPublic,
 )
-from ..utils import get_proxy_aware_url
-from .models import ContractsPublic
 
 router = APIRouter(
     prefix="/contracts",
     tags=["contracts"],
 )
 
+# Contracts are sorted by `(address, chain_id)`, unique together and indexed
+CONTRACTS_CURSOR_KEY_COLUMNS = (
+    cast(InstrumentedAttribute, Contract.address),
+    cast(InstrumentedAttribute, Contract.chain_id),
+)
+
+
+# Fields that can be requested using `fields` query param, mapped to the attribute names
+CONTRACTS_PUBLIC_FIELDS = {
+    field.alias or name: name for name, field in ContractsPublic.model_fields.items()
+} | {"logoUrl": "logo_url"}
+
+
+def parse_contracts_fields(fields: str | None) -> set[str] | None:
+    """
+    :param fields: Comma separated list of `ContractsPublic` fields
+    :return: Attribute names for the requested fields, `None` to return all of them
+    :raises HTTPException: If any of the fields is not valid
+    """
+    if not fields:
+        return None
+    requested_fields = {field.strip() for field in fields.split(",") if field.strip()}
+    if invalid_fields := requested_fields - CONTRACTS_PUBLIC_FIELDS.keys():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields: {', '.join(sorted(invalid_fields))}",
+        )
+    return {CONTRACTS_PUBLIC_FIELDS[field] for field in requested_fields}
+
+
+def get_contracts_fields_public(
+    contracts: list[dict[str, Any]], fields: set[str], abi_hash_only: bool
+) -> list[dict]:
+    """
+    :param contracts: Contracts with, at least, the requested `fields` selected
+    :param fields: Attribute names to serialize
+    :param abi_hash_only: Remove `abi_json` from the ABIs, just keeping `abi_hash`
+    :return: Contracts serialized with just the requested fields
+    """
+    contracts_fields_public = []
+    for contract in contracts:
+        contract_fields_public = ContractsFieldsPublic.model_validate(
+            {
+                field: contract.get(field)
+                for field in fields | {"address"}
+                if field in ContractsFieldsPublic.model_fields
+            }
+        )
+        if abi_hash_only and contract_fields_public.abi:
+            contract_fields_public.abi.abi_json = None
+        contracts_fields_public.append(
+            contract_fields_public.model_dump(
+                mode="json", by_alias=True, include=fields
+            )
+        )
+    return contracts_fields_public
+
+
+def get_contracts_page_etag(
+    response: PaginatedResponse[ContractsPublic] | Response, request: Request, **kwargs
+) -> str | None:
+    """
+    :param response: Response of a contracts endpoint
+    :param request:
+    :param kwargs: Endpoint arguments (ignored)
+    :return: ETag of the response
+    """
+    if isinstance(response, Response):
+        return response.headers.get("etag")
+    return get_paginated_contracts_etag(
+        response, request.url.query, get_accepted_media_type(request)
+    )
+
+
+def serialize_contracts_page(
+    request: Request,
+    pagination: GenericPagination,
+    contracts: list[dict[str, Any]],
+    count: int | None,
+    fields: set[str] | None,
+    abi_hash_only: bool,
+) -> PaginatedResponse[ContractsPublic] | Response:
+    """
+    :param request:
+    :param pagination:
+    :param contracts: Contracts in the page
+    :param count: Total number of contracts
+    :param fields: Attribute names to serialize, `None` for all of them
+    :param abi_hash_only: Remove `abi_json` from the ABIs, just keeping `abi_hash`
+    :return: Paginated response. If just some fields are requested, it's returned already
+        serialized in the negotiated media type with its ETag, as it doesn't match the
+        `ContractsPublic` schema
+    """
+    url = get_proxy_aware_url(request)
+    if fields is None:
+        return pagination.serialize(
+            url, get_contracts_public(contracts, abi_hash_only), count
+        )
+    modified = [contract["modified"] for contract in contracts] + [
+        contract["abi"]["modified"]
+        for contract in contracts
+        if "abi" in fields and contract["abi"]
+    ]
+    media_type = get_accepted_media_type(request)
+    return Response(
+        serialize_model(
+            pagination.serialize(
+                url,
+                get_contracts_fields_public(contracts, fields, abi_hash_only),
+                count,
+            ),
+            media_type,
+        ),
+        media_type=media_type,
+        headers={
+            "ETag": get_contracts_etag(request.url.query, count, modified, media_type),
+            "Vary": "Accept",
+        },
+    )
+
+
+def build_contracts_page_response(
+    request: Request,
+    pagination: GenericPagination,
+    contracts: list[dict[str, Any]],
+    count: int | None,
+    fields: set[str] | None,
+    abi_hash_only: bool,
+) -> Response:
+    """
+    Serialize a page of contracts for endpoints not using `cache_response`
+
+    :param request:
+    :param pagination:
+    :param contracts: Contracts in the page
+    :param count: Total number of contracts
+    :param fields: Attribute names to serialize, `None` for all of them
+    :param abi_hash_only: Remove `abi_json` from the ABIs, just keeping `abi_hash`
+    :return: Response in the negotiated media type with its ETag, `304 Not Modified`
+        if client copy matches it
+    """
+    response = serialize_contracts_page(
+        request, pagination, contracts, count, fields, abi_hash_only
+    )
+    etag = get_contracts_page_etag(response, request)
+    headers = {"ETag": etag} if etag else {}
+    headers["Vary"] = "Accept"
+    if etag and is_etag_fresh(request, etag):
+        return Response(status_code=304, headers=headers)
+    if isinstance(response, Response):
+        return response
+    media_type = get_accepted_media_type(request)
+    return Response(
+        serialize_model(
+            PaginatedResponse[ContractsPublic].model_validate(response), media_type
+        ),
+        media_type=media_type,
+        headers=headers,
+    )
+
 
 @router.get(
     "",
@@ -37,7 +234,16 @@ router = APIRouter(
 
     **Notes**
     - Pagination is controlled by `PaginationQueryParams` (`limit`, `offset`).
+    - Cursor pagination can be enabled sending an empty `cursor`. Pages are sought using the
+      `(address, chain_id)` of the last returned contract, so deep pages are as fast as the first one.
+    - `count` sets how the total number of contracts is calculated: `exact` (default), `estimated`
+      by the database planner, `cached` for a few minutes, or `none` to skip it and return `null`.
+    - `abi_hash_only=true` returns `abiJson` as `null`. ABIs can be retrieved using their `abiHash`
+      from `/api/v1/abis/{abi_hash}`, which is immutable and can be cached by clients and CDNs.
+    - `fields` returns just the requested fields for every contract (e.g. `fields=address,chainId,name`).
+      ABIs and projects are not loaded from database if they are not requested.
     - When `chain_ids` is provided, only contracts deployed on those chains are returned.
+    - Responses are returned as MessagePack, with the same schema, if requested with `Accept: application/msgpack`.
     """,
 )
 async def list_all_contracts(
@@ -56,26 +262,446 @@ async def list_all_contracts(
             "If false, only return those not trusted. Omit to return all.",
         ),
     ] = None,
-) -> PaginatedResponse[ContractsPublic]:
+    fields: Annotated[
+        str | None,
+        Query(
+            description="Comma separated list of fields to return for every contract, "
+            "e.g. `address,chainId,name,logoUrl`. Omit to return all of them.",
+        ),
+    ] = None,
+    abi_hash_only: Annotated[
+        bool,
+        Query(
+            description="If true, `abiJson` is not returned. Use `abiHash` to get the ABI "
+            "from `/api/v1/abis/{abi_hash}`, which can be cached forever.",
+        ),
+    ] = False,
+) -> PaginatedResponse[ContractsPublic] | Response:
     """
     Returns a paginated list of contracts, optionally filtered by `chain_ids` and
     `trusted_for_delegate_call`.
 
-    Pagination is controlled by `PaginationQueryParams` (`limit`, `offset`).
+    Pagination is controlled by `PaginationQueryParams` (`limit`, `offset` or `cursor`).
     When `chain_ids` is provided, only contracts deployed on those chains are returned.
 
     :param request:
     :param pagination_params: Pagination parameters.
     :param chain_ids: Filter contracts by specific chain IDs.
     :param trusted_for_delegate_call: Filter contracts by trusted delegate call flag.
+    :param fields: Comma separated list of fields to return.
+    :param abi_hash_only: Return `abiHash` without `abiJson`.
     :return: Paginated list of contracts matching the criteria.
     """
-    pagination = GenericPagination(pagination_params.limit, pagination_params.offset)
+    pagination = get_pagination(
+        pagination_params, key_columns=CONTRACTS_CURSOR_KEY_COLUMNS
+    )
     contracts_service = ContractService(pagination=pagination)
+    contract_fields = parse_contracts_fields(fields)
     contracts_page, count = await contracts_service.get_contracts(
-        chain_ids=chain_ids, trusted_for_delegate_call=trusted_for_delegate_call
+        chain_ids=chain_ids,
+        trusted_for_delegate_call=trusted_for_delegate_call,
+        fields=contract_fields,
+    )
+    return build_contracts_page_response(
+        request, pagination, contracts_page, count, contract_fields, abi_hash_only
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=list[ContractMetadataPublic],
+    summary="Get metadata for multiple contracts",
+    response_description="Metadata of the contracts found",
+    description="""
+    Return the metadata (name, logo, project and trusted flag) for a list of `(address, chainId)` pairs.
+
+    **Request body:**
+    - `contracts`: List of `{"address", "chainId"}` objects. Addresses must be **EIP-55 checksummed**.
+
+    **Returns:**
+    - List of contracts found, in the same order they were requested. Contracts not found are omitted.
+
+    **Notes**
+    - ABIs are not returned, use `/api/v1/contracts/{address}` for that.
+    - Responses are returned as MessagePack, with the same schema, if requested with `Accept: application/msgpack`.
+    """,
+)
+async def get_contracts_batch(
+    request: Request,
+    response: Response,
+    contracts_batch: ContractsBatchInput,
+) -> list[dict] | Response:
+    """
+    Return the metadata for the provided `(address, chainId)` pairs. Cached metadata is returned
+    from Redis, and the missing contracts are retrieved from database in a single query.
+
+    :param request:
+    :param response:
+    :param contracts_batch: `(address, chainId)` pairs
+    :return: List of contracts found, in the requested order
+    """
+    address_chain_ids = list(
+        dict.fromkeys(
+            (contract.address, contract.chain_id)
+            for contract in contracts_batch.contracts
+        )
+    )
+    cache_keys = [
+        (get_key_for_contract(address), get_field_key_for_contract_metadata(chain_id))
+        for address, chain_id in address_chain_ids
+    ]
+    cached_values = await hget_many(cache_keys)
+
+    contracts_metadata: dict[tuple[str, int], dict | None] = {}
+    missing: list[tuple[str, int]] = []
+    for address_chain_id, cached_value in zip(
+        address_chain_ids, cached_values, strict=True
+    ):
+        if cached_value is None:
+            missing.append(address_chain_id)
+        else:
+            # Empty value is cached for contracts not found
+            contracts_metadata[address_chain_id] = (
+                json.loads(cached_value) if cached_value else None
+            )
+
+    if missing:
+        contracts = await ContractService.get_contracts_by_address_and_chain_id(
+            [(HexBytes(address), chain_id) for address, chain_id in missing]
+        )
+        for contract in contracts:
+            contract_metadata = ContractMetadataPublic.model_validate(contract)
+            contracts_metadata[
+                (contract_metadata.address, contract_metadata.chain_id)
+            ] = contract_metadata.model_dump(mode="json", by_alias=True)
+
+        values_to_cache: dict[tuple[str, str], str] = {}
+        for address, chain_id in missing:
+            metadata = contracts_metadata.setdefault((address, chain_id), None)
+            values_to_cache[
+                (
+                    get_key_for_contract(address),
+                    get_field_key_for_contract_metadata(chain_id),
+                )
+            ] = json.dumps(metadata) if metadata else ""
+        await hset_many(values_to_cache)
+
+    contracts_found = [
+        contract_data
+        for address_chain_id in address_chain_ids
+        if (contract_data := contracts_metadata[address_chain_id]) is not None
+    ]
+    response.headers["Vary"] = "Accept"
+    if (media_type := get_accepted_media_type(request)) != JSON_MEDIA_TYPE:
+        # Metadata is already serialized in JSON mode, with the public schema
+        return Response(
+            encode_content(contracts_found, media_type),
+            media_type=media_type,
+            headers={"Vary": "Accept"},
+        )
+    return contracts_found
+
+
+def serialize_contracts_ndjson(
+    contracts: list[dict[str, Any]], fields: set[str] | None, abi_hash_only: bool
+) -> bytes:
+    """
+    :param contracts:
+    :param fields: Attribute names to serialize, `None` for all of them
+    :param abi_hash_only: Remove `abi_json` from the ABIs, just keeping `abi_hash`
+    :return: Contracts serialized as JSON, one per line
+    """
+    if fields is None:
+        lines = [
+            contract_public.model_dump_json(by_alias=True).encode()
+            for contract_public in get_contracts_public(contracts, abi_hash_only)
+        ]
+    else:
+        lines = [
+            json.dumps(contract_fields_public, separators=(",", ":")).encode()
+            for contract_fields_public in get_contracts_fields_public(
+                contracts, fields, abi_hash_only
+            )
+        ]
+    return b"".join(line + b"\n" for line in lines)
+
+
+async def stream_contracts_ndjson(
+    chain_ids: list[int] | None,
+    trusted_for_delegate_call: bool | None,
+    fields: set[str] | None,
+    abi_hash_only: bool,
+) -> AsyncIterator[bytes]:
+    """
+    Streaming happens after the endpoint returns, while the request database session context is
+    still open. A dedicated session scope is used, so the export gets its own connection and
+    releases it as soon as the last batch is read.
+
+    :param chain_ids:
+    :param trusted_for_delegate_call:
+    :param fields:
+    :param abi_hash_only:
+    :return: Chunks of NDJSON, one per batch of contracts
+    """
+    async with with_db_session_context():
+        async for contracts in ContractService.stream_contracts(
+            chain_ids=chain_ids,
+            trusted_for_delegate_call=trusted_for_delegate_call,
+            fields=fields,
+            batch_size=settings.CONTRACTS_EXPORT_BATCH_SIZE,
+        ):
+            yield serialize_contracts_ndjson(contracts, fields, abi_hash_only)
+
+
+@router.get(
+    "/export",
+    summary="Export contracts",
+    response_description="Contracts as NDJSON, one JSON object per line",
+    response_class=StreamingResponse,
+    description="""
+    Stream **all** the contracts as NDJSON (`application/x-ndjson`), one contract per line, optionally
+    filtered by `chain_ids` and the `trusted_for_delegate_call` flag.
+
+    **Notes**
+    - Contracts are sorted by `address` and `chainId` and have the same format as `/api/v1/contracts`.
+    - Results are read from a database cursor and sent in chunks as they are fetched, so a full chain
+      can be exported in one request instead of paginating `/api/v1/contracts`.
+    - `fields` and `abi_hash_only` work as in `/api/v1/contracts`.
+    """,
+)
+async def export_contracts(
+    chain_ids: Annotated[
+        list[int] | None,
+        Query(
+            description="Filter by chain IDs. Repeat to pass multiple values.",
+        ),
+    ] = None,
+    trusted_for_delegate_call: Annotated[
+        bool | None,
+        Query(
+            description="If true, only return contracts trusted for delegate calls. "
+            "If false, only return those not trusted. Omit to return all.",
+        ),
+    ] = None,
+    fields: Annotated[
+        str | None,
+        Query(
+            description="Comma separated list of fields to return for every contract, "
+            "e.g. `address,chainId,name,logoUrl`. Omit to return all of them.",
+        ),
+    ] = None,
+    abi_hash_only: Annotated[
+        bool,
+        Query(
+            description="If true, `abiJson` is not returned. Use `abiHash` to get the ABI "
+            "from `/api/v1/abis/{abi_hash}`, which can be cached forever.",
+        ),
+    ] = False,
+) -> StreamingResponse:
+    """
+    Stream the contracts as NDJSON, optionally filtered by `chain_ids` and
+    `trusted_for_delegate_call`.
+
+    :param chain_ids: Filter contracts by specific chain IDs.
+    :param trusted_for_delegate_call: Filter contracts by trusted delegate call flag.
+    :param fields: Comma separated list of fields to return.
+    :param abi_hash_only: Return `abiHash` without `abiJson`.
+    :return: Streaming response with a contract per line.
+    """
+    # Validate fields before the response starts
+    contract_fields = parse_contracts_fields(fields)
+    return StreamingResponse(
+        stream_contracts_ndjson(
+            chain_ids, trusted_for_delegate_call, contract_fields, abi_hash_only
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=PaginatedResponse[ContractsPublic],
+    summary="Search contracts by name",
+    response_description="Paginated list of contracts matching the search",
+    description="""
+    Return a **paginated** list of contracts whose `name` or `displayName` starts with the provided text
+    or contains a word similar to it (trigram similarity), case insensitive. Contracts whose name starts
+    with the text are returned first, then the most similar ones.
+
+    **Parameters:**
+    - `q`: Text to search, at least 3 characters.
+    - `chain_ids`: Filter contracts by specific chain IDs. Repeat the param to filter by multiple chains.
+
+    **Notes**
+    - Pagination is controlled by `PaginationQueryParams` (`limit`, `offset`). Cursor pagination
+      is also supported, but results are then sorted by `address` and `chainId`.
+    - `count`, `fields` and `abi_hash_only` work as in `/api/v1/contracts`.
+    - Responses are returned as MessagePack, with the same schema, if requested with `Accept: application/msgpack`.
+    """,
+)
+async def search_contracts(
+    request: Request,
+    q: Annotated[
+        str,
+        Query(
+            min_length=3,
+            max_length=100,
+            description="Text to search in contracts `name` and `displayName`.",
+        ),
+    ],
+    pagination_params: PaginationQueryParams = Depends(),
+    chain_ids: Annotated[
+        list[int] | None,
+        Query(
+            description="Filter by chain IDs. Repeat to pass multiple values.",
+        ),
+    ] = None,
+    fields: Annotated[
+        str | None,
+        Query(
+            description="Comma separated list of fields to return for every contract, "
+            "e.g. `address,chainId,name,logoUrl`. Omit to return all of them.",
+        ),
+    ] = None,
+    abi_hash_only: Annotated[
+        bool,
+        Query(
+            description="If true, `abiJson` is not returned. Use `abiHash` to get the ABI "
+            "from `/api/v1/abis/{abi_hash}`, which can be cached forever.",
+        ),
+    ] = False,
+) -> PaginatedResponse[ContractsPublic] | Response:
+    """
+    Returns a paginated list of contracts whose name or display name contains `q`.
+
+    :param request:
+    :param q: Text to search.
+    :param pagination_params: Pagination parameters.
+    :param chain_ids: Filter contracts by specific chain IDs.
+    :param fields: Comma separated list of fields to return.
+    :param abi_hash_only: Return `abiHash` without `abiJson`.
+    :return: Paginated list of contracts matching the search.
+    """
+    pagination = get_pagination(
+        pagination_params, key_columns=CONTRACTS_CURSOR_KEY_COLUMNS
+    )
+    contracts_service = ContractService(pagination=pagination)
+    contract_fields = parse_contracts_fields(fields)
+    contracts_page, count = await contracts_service.search_contracts(
+        q.strip(), chain_ids=chain_ids, fields=contract_fields
+    )
+    return build_contracts_page_response(
+        request, pagination, contracts_page, count, contract_fields, abi_hash_only
+    )
+
+
+def encode_changes_cursor(contract: dict[str, Any]) -> str:
+    """
+    :param contract: Last contract returned by the changes feed
+    :return: Opaque cursor with the `(modified, address, chain_id)` of the contract
+    """
+    payload = [
+        contract["modified"].isoformat(),
+        "0x" + contract["address"].hex(),
+        contract["chain_id"],
+    ]
+    return (
+        base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        .decode()
+        .rstrip("=")
     )
-    return pagination.serialize(get_proxy_aware_url(request), contracts_page, count)
+
+
+def decode_changes_cursor(cursor: str) -> tuple[datetime.datetime, bytes, int]:
+    """
+    :param cursor: Cursor generated by `encode_changes_cursor`
+    :return: `(modified, address, chain_id)` of the last contract returned
+    :raises HTTPException: If cursor is not valid
+    """
+    try:
+        modified, address, chain_id = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        modified_datetime = datetime.datetime.fromisoformat(modified)
+        if modified_datetime.tzinfo is None or not isinstance(chain_id, int):
+            raise ValueError("Invalid cursor")
+        return modified_datetime, bytes(HexBytes(address)), chain_id
+    except (ValueError, TypeError, binascii.Error) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+@router.get(
+    "/changes",
+    response_model=ContractChangesPublic,
+    summary="Get contracts changes",
+    response_description="Contracts modified after the provided cursor",
+    description="""
+    Return the contracts created or modified after the `since` cursor, sorted by modification date.
+    It allows keeping a copy of the contracts in sync without reading all of them again.
+
+    **Parameters:**
+    - `since`: Cursor returned by the previous call. Omit it to start from the beginning.
+    - `limit`: Max number of contracts to return.
+
+    **Notes**
+    - Store the returned `since` and use it for the next call. If `hasMore` is `true`,
+      there are more changes that can be requested right away.
+    - Changes done in the last seconds are returned on the next calls, once they are settled.
+    - `abi_hash_only=true` returns `abiJson` as `null`, use `/api/v1/abis/{abi_hash}` to get the ABI.
+    - Responses are returned as MessagePack, with the same schema, if requested with `Accept: application/msgpack`.
+    """,
+)
+async def get_contracts_changes(
+    request: Request,
+    response: Response,
+    since: Annotated[
+        str | None,
+        Query(description="Cursor returned by the previous call."),
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=settings.CONTRACTS_CHANGES_MAX_PAGE_SIZE,
+            description="Max number of contracts to return.",
+        ),
+    ] = 100,
+    abi_hash_only: Annotated[
+        bool,
+        Query(
+            description="If true, `abiJson` is not returned. Use `abiHash` to get the ABI "
+            "from `/api/v1/abis/{abi_hash}`, which can be cached forever.",
+        ),
+    ] = False,
+) -> ContractChangesPublic | Response:
+    """
+    Return the contracts modified after the `since` cursor.
+
+    :param request:
+    :param response:
+    :param since: Cursor returned by the previous call, `None` to start from the beginning.
+    :param limit: Max number of contracts to return.
+    :param abi_hash_only: Return `abiHash` without `abiJson`.
+    :return: Contracts modified and the cursor for the next call.
+    """
+    cursor = decode_changes_cursor(since) if since else None
+    # Fetch an extra contract to know if there are more changes
+    contracts = list(await ContractService.get_contracts_changes(cursor, limit + 1))
+    has_more = len(contracts) > limit
+    contracts = contracts[:limit]
+    changes = ContractChangesPublic(
+        results=get_contracts_public(contracts, abi_hash_only),
+        since=encode_changes_cursor(contracts[-1]) if contracts else since,
+        has_more=has_more,
+    )
+    response.headers["Vary"] = "Accept"
+    if (media_type := get_accepted_media_type(request)) != JSON_MEDIA_TYPE:
+        return Response(
+            serialize_model(changes, media_type),
+            media_type=media_type,
+            headers={"Vary": "Accept"},
+        )
+    return changes
 
 
 @router.get(
@@ -92,9 +718,21 @@ async def list_all_contracts(
 
     **Returns:**
     - Paginated response containing contracts matching the address.
+
+    **Notes**
+    - Pagination is controlled by `PaginationQueryParams` (`limit`, `offset`), or `cursor` for cursor pagination.
+    - `count` can be `exact` (default), `estimated`, `cached` or `none` to skip counting.
+    - `abi_hash_only=true` returns `abiJson` as `null`, use `/api/v1/abis/{abi_hash}` to get the ABI.
+    - `fields` returns just the requested fields for every contract (e.g. `fields=address,chainId,name`).
+    - Responses are returned as MessagePack, with the same schema, if requested with `Accept: application/msgpack`.
     """,
 )
-@cache_response(get_key_for_contract, PaginatedResponse[ContractsPublic])
+@cache_response(
+    get_key_for_contract,
+    PaginatedResponse[ContractsPublic],
+    prerendered_key_builder=get_key_for_contract_default_page,
+    etag_builder=get_contracts_page_etag,
+)
 async def list_contracts(
     request: Request,
     address: Annotated[
@@ -108,7 +746,21 @@ async def list_contracts(
             description="Filter by chain IDs. Repeat to pass multiple values.",
         ),
     ] = None,
-) -> PaginatedResponse[ContractsPublic]:
+    fields: Annotated[
+        str | None,
+        Query(
+            description="Comma separated list of fields to return for every contract, "
+            "e.g. `address,chainId,name,logoUrl`. Omit to return all of them.",
+        ),
+    ] = None,
+    abi_hash_only: Annotated[
+        bool,
+        Query(
+            description="If true, `abiJson` is not returned. Use `abiHash` to get the ABI "
+            "from `/api/v1/abis/{abi_hash}`, which can be cached forever.",
+        ),
+    ] = False,
+) -> PaginatedResponse[ContractsPublic] | Response:
     """
     Return a paginated list of contracts that match the provided EIP-55 checksummed address.
 
@@ -116,14 +768,21 @@ async def list_contracts(
     :param address: Contract address in checksum format. (Required)
     :param pagination_params: Pagination query parameters.
     :param chain_ids: List of chain IDs to filter contracts. (Optional)
+    :param fields: Comma separated list of fields to return. (Optional)
+    :param abi_hash_only: Return `abiHash` without `abiJson`. (Optional)
     :return: Paginated response containing contracts matching the address.
     """
     if not fast_is_checksum_address(address):
         raise HTTPException(status_code=400, detail="Address is not checksummed")
 
-    pagination = GenericPagination(pagination_params.limit, pagination_params.offset)
+    pagination = get_pagination(
+        pagination_params, key_columns=CONTRACTS_CURSOR_KEY_COLUMNS
+    )
     contracts_service = ContractService(pagination=pagination)
+    contract_fields = parse_contracts_fields(fields)
     contracts_page, count = await contracts_service.get_contracts(
-        address=HexBytes(address), chain_ids=chain_ids
+        address=HexBytes(address), chain_ids=chain_ids, fields=contract_fields
+    )
+    return serialize_contracts_page(
+        request, pagination, contracts_page, count, contract_fields, abi_hash_only
     )
-    return pagination.serialize(get_proxy_aware_url(request), contracts_page, count)
@@ -1,14 +1,37 @@
-from typing import cast
+import asyncio
+import datetime
+import hashlib
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, cast
 
+import orjson
 from eth_typing import Address
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
 
-from app.routers.models import (
-    DataDecodedPublic,
-    DataDecoderInput,
-    ParameterDecodedPublic,
+from app.config import settings
+from app.datasources.db.database import with_db_session_context
+from app.datasources.db.models import Abi
+from app.routers.models import DataDecodedPublic, DataDecoderInput, DataDecoderQuery
+from app.services.data_decoder import (
+    DataDecoded,
+    DataDecoderService,
+    DecodingAccuracyEnum,
+    MultisendDecoded,
+    ParameterDecoded,
+    get_data_decoder_service,
+)
+from app.utils import (
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    encode_content,
+    get_accepted_media_type,
+    is_etag_fresh,
 )
-from app.services.data_decoder import get_data_decoder_service
 
 router = APIRouter(
     prefix="/data-decoder",
@@ -16,27 +39,129 @@ router = APIRouter(
 )
 
 
-@router.post(
-    "",
-    response_model=DataDecodedPublic,
-    summary="Decode provided data",
-    response_description="Decoded data if it can be decoded",
-)
-async def data_decoder(input_data: DataDecoderInput) -> DataDecodedPublic:
+def get_multisend_decoded_public(multisend_decoded: MultisendDecoded) -> dict[str, Any]:
     """
-    Decode provided data if there's a matching ABI on the database. Accuracy of the decoding
-    can be:
+    :param multisend_decoded:
+    :return: `MultisendDecodedPublic` shaped dictionary, with camelCase keys
+    """
+    data_decoded = multisend_decoded["data_decoded"]
+    return {
+        "operation": multisend_decoded["operation"],
+        "to": multisend_decoded["to"],
+        "value": multisend_decoded["value"],
+        "data": multisend_decoded["data"],
+        "dataDecoded": (
+            get_data_decoded_public(data_decoded) if data_decoded is not None else None
+        ),
+    }
 
-    - *FULL_MATCH*: Matched contract address and chain id.
-    - *PARTIAL_MATCH* Matched contract address, but not chain id.
-    - *ONLY_FUNCTION_MATCH*: Matched function from another contract.
-    - *NO_MATCH*: Selector cannot be decoded.
+
+def get_parameter_decoded_public(parameter: ParameterDecoded) -> dict[str, Any]:
+    """
+    :param parameter:
+    :return: `ParameterDecodedPublic` shaped dictionary, with camelCase keys
+    """
+    value_decoded = parameter.get("value_decoded")
+    value_decoded_public: list[dict[str, Any]] | dict[str, Any] | None
+    if isinstance(value_decoded, list):
+        value_decoded_public = [
+            get_multisend_decoded_public(multisend_decoded)
+            for multisend_decoded in value_decoded
+        ]
+    elif value_decoded is not None:
+        value_decoded_public = get_data_decoded_public(value_decoded)
+    else:
+        value_decoded_public = None
+    return {
+        "name": parameter["name"],
+        "type": parameter["type"],
+        "value": parameter["value"],
+        "valueDecoded": value_decoded_public,
+    }
+
+
+def get_data_decoded_public(data_decoded: DataDecoded) -> dict[str, Any]:
+    """
+    :param data_decoded:
+    :return: `BaseDataDecodedPublic` shaped dictionary, with camelCase keys
+    """
+    return {
+        "method": data_decoded["method"],
+        "parameters": [
+            get_parameter_decoded_public(parameter)
+            for parameter in data_decoded["parameters"]
+        ],
+    }
+
+
+def serialize_data_decoded(
+    data_decoded: DataDecoded,
+    accuracy: DecodingAccuracyEnum,
+    media_type: str = JSON_MEDIA_TYPE,
+) -> bytes:
+    """
+    Serialize the decoded data built by `DataDecoderService` straight to JSON, without
+    validating it again with `DataDecodedPublic`. Output is the same as serializing
+    `DataDecodedPublic`.
+
+    :param data_decoded:
+    :param accuracy:
+    :param media_type: `JSON_MEDIA_TYPE` or `MSGPACK_MEDIA_TYPE`
+    :return: `DataDecodedPublic` serialized
+    """
+    return encode_content(
+        {**get_data_decoded_public(data_decoded), "accuracy": accuracy.value},
+        media_type,
+    )
+
+
+def get_data_decoded_etag(
+    abi_index_generation: int | None,
+    contract_modified: datetime.datetime | None,
+    media_type: str,
+) -> str:
+    """
+    Build a weak ETag for a decoded data. ETags only need to be unique for the same url,
+    and the same data decodes the same way until new ABIs are loaded or the ABI of the
+    contract, or of its implementations if it's a proxy, changes.
+
+    :param abi_index_generation: Generation of the ABIs stored on the database, the last ABI id
+    :param contract_modified: Latest `modified` of the `to` contract and its implementations, if any
+    :param media_type: Media type of the response, every format has its own ETag
+    :return: Weak ETag
+    """
+    last_modified = contract_modified.isoformat() if contract_modified else ""
+    raw_etag = f"{abi_index_generation}|{last_modified}|{media_type}"
+    return f'W/"{hashlib.md5(raw_etag.encode()).hexdigest()}"'
+
+
+async def load_data_decoder_service() -> DataDecoderService:
+    """
+    :return: Data decoder service with the ABIs stored on the database loaded
     """
     data_decoder_service = await get_data_decoder_service()
 
     # Load new ABIs from the database (runs before decoding to ensure fresh ABIs)
     await data_decoder_service.load_new_abis()
+    # Track contracts with ABI stored after the decoder was started
+    await data_decoder_service.load_new_contract_addresses()
+    return data_decoder_service
+
 
+async def build_data_decoded_response(
+    data_decoder_service: DataDecoderService,
+    input_data: DataDecoderInput,
+    media_type: str,
+    headers: dict[str, str],
+) -> Response:
+    """
+    :param data_decoder_service:
+    :param input_data:
+    :param media_type: `JSON_MEDIA_TYPE` or `MSGPACK_MEDIA_TYPE`
+    :param headers: Headers for the response
+    :return: Response with the decoded data
+    :raises HTTPException: if data cannot be decoded
+    """
     data_decoded = await data_decoder_service.get_data_decoded(
         input_data.data,
         address=cast(Address, input_data.to),
@@ -52,8 +177,278 @@ async def data_decoder(input_data: DataDecoderInput) -> DataDecodedPublic:
         address=cast(Address, input_data.to),
         chain_id=input_data.chain_id,
     )
-    return DataDecodedPublic(
-        method=data_decoded["method"],
-        parameters=cast(list[ParameterDecodedPublic], data_decoded["parameters"]),
-        accuracy=decoding_accuracy,
+    return Response(
+        content=serialize_data_decoded(data_decoded, decoding_accuracy, media_type),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+DATA_DECODER_DESCRIPTION = """
+    Decode provided data if there's a matching ABI on the database. Accuracy of the decoding
+    can be:
+
+    - *FULL_MATCH*: Matched contract address and chain id.
+    - *PARTIAL_MATCH* Matched contract address, but not chain id.
+    - *ONLY_FUNCTION_MATCH*: Matched function from another contract.
+    - *NO_MATCH*: Selector cannot be decoded.
+
+    Response is returned as MessagePack, with the same schema, if requested with
+    `Accept: application/msgpack`.
+"""
+
+
+@router.get(
+    "",
+    response_model=DataDecodedPublic,
+    summary="Decode provided data, cacheable",
+    response_description="Decoded data if it can be decoded",
+    description=DATA_DECODER_DESCRIPTION
+    + f"""
+    Same as `POST /api/v1/data-decoder`, but it can be cached by proxies and CDNs. `data` is
+    limited to {settings.DATA_DECODER_GET_DATA_MAX_LENGTH} characters. Responses have an `ETag`
+    that only changes when new ABIs are loaded or the ABI of the `to` contract changes, so
+    they can be revalidated with `If-None-Match`.
+""",
+)
+async def data_decoder_get(
+    request: Request, input_data: Annotated[DataDecoderQuery, Query()]
+) -> Response:
+    """
+    Decode provided data, returning a response that can be cached.
+
+    :param request:
+    :param input_data: `data`, `to` and `chainId` query params
+    :return: Decoded data with `ETag` and `Cache-Control` headers,
+        `304 Not Modified` if client copy is up to date
+    """
+    data_decoder_service = await load_data_decoder_service()
+    media_type = get_accepted_media_type(request)
+    # Generation is read from the database, so every process builds the same ETag
+    abi_generation = await Abi.get_last_inserted_id()
+    if abi_generation is not None and (
+        data_decoder_service.abi_index_generation is None
+        or data_decoder_service.abi_index_generation < abi_generation
+    ):
+        # Latest ABIs are still being loaded by another request, don't cache the response
+        return await build_data_decoded_response(
+            data_decoder_service,
+            input_data,
+            media_type,
+            {"Cache-Control": "no-store", "Vary": "Accept"},
+        )
+    contract_modified = (
+        await data_decoder_service.get_contract_last_modified(
+            cast(Address, input_data.to)
+        )
+        if input_data.to
+        else None
+    )
+    etag = get_data_decoded_etag(abi_generation, contract_modified, media_type)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.DATA_DECODER_GET_CACHE_MAX_AGE}",
+        "Vary": "Accept",
+    }
+    if is_etag_fresh(request, etag):
+        return Response(status_code=304, headers=headers)
+    return await build_data_decoded_response(
+        data_decoder_service, input_data, media_type, headers
+    )
+
+
+@router.post(
+    "",
+    response_model=DataDecodedPublic,
+    summary="Decode provided data",
+    response_description="Decoded data if it can be decoded",
+    description=DATA_DECODER_DESCRIPTION,
+)
+async def data_decoder(request: Request, input_data: DataDecoderInput) -> Response:
+    """
+    Decode provided data if there's a matching ABI on the database.
+
+    :param request:
+    :param input_data: `data`, `to` and `chainId`
+    :return: Decoded data
+    """
+    data_decoder_service = await load_data_decoder_service()
+    return await build_data_decoded_response(
+        data_decoder_service,
+        input_data,
+        get_accepted_media_type(request),
+        {"Vary": "Accept"},
+    )
+
+
+class RequestBodyStreamingResponse(StreamingResponse):
+    """
+    Streaming response for a content that reads the request body while it's sent.
+    `StreamingResponse` listens for the client disconnection reading the request messages,
+    so the body would be consumed by it. Disconnection is detected instead when reading the
+    body or sending the response.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect() from None
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_length: int
+) -> AsyncIterator[bytes | None]:
+    """
+    Split a stream of chunks into lines, holding at most one line in memory.
+    Blank lines are skipped.
+
+    :param chunks: Chunks of the request body
+    :param max_length: Max length of a line
+    :return: Lines without the line break, `None` for lines longer than `max_length`,
+        that are discarded
+    """
+    buffer = b""
+    discarding = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if discarding:
+                # Rest of a line that was too long
+                discarding = False
+            elif len(line) > max_length:
+                yield None
+            elif line.strip():
+                yield line
+        if len(buffer) > max_length:
+            if not discarding:
+                yield None
+                discarding = True
+            buffer = b""
+    if buffer.strip() and not discarding:
+        yield buffer
+
+
+async def decode_ndjson_line(
+    data_decoder_service: DataDecoderService, line: bytes | None
+) -> bytes:
+    """
+    :param data_decoder_service:
+    :param line: `DataDecoderInput` as JSON, `None` if line was too long
+    :return: `DataDecodedPublic` as JSON, or `{"error": ...}` if line cannot be decoded
+    """
+    if line is None:
+        return orjson.dumps({"error": "Line is too long"})
+    try:
+        input_data = DataDecoderInput.model_validate_json(line)
+    except ValidationError as e:
+        return orjson.dumps(
+            {
+                "error": "Invalid input",
+                "details": e.errors(
+                    include_url=False, include_context=False, include_input=False
+                ),
+            }
+        )
+
+    address = cast(Address, input_data.to)
+    # Lines are decoded concurrently, every one needs its own database session
+    async with with_db_session_context():
+        data_decoded = await data_decoder_service.get_data_decoded(
+            input_data.data, address=address, chain_id=input_data.chain_id
+        )
+        if data_decoded is None:
+            return orjson.dumps(
+                {"error": "Cannot find function selector to decode data"}
+            )
+        decoding_accuracy = await data_decoder_service.get_decoding_accuracy(
+            input_data.data, address=address, chain_id=input_data.chain_id
+        )
+    return serialize_data_decoded(data_decoded, decoding_accuracy)
+
+
+async def decode_ndjson_stream(
+    data_decoder_service: DataDecoderService,
+    lines: AsyncIterator[bytes | None],
+    max_concurrency: int,
+) -> AsyncIterator[bytes]:
+    """
+    Decode lines concurrently, keeping the input order. Only `max_concurrency` lines are
+    decoded or waiting to be sent at the same time, so no more input is read until the
+    client reads the output.
+
+    :param data_decoder_service:
+    :param lines: Lines returned by `iter_ndjson_lines`
+    :param max_concurrency: Max number of lines decoded at the same time
+    :return: NDJSON lines, one for every input line
+    """
+    pending: deque[asyncio.Task[bytes]] = deque()
+    try:
+        async for line in lines:
+            if len(pending) >= max_concurrency:
+                yield await pending.popleft() + b"\n"
+            pending.append(
+                asyncio.create_task(decode_ndjson_line(data_decoder_service, line))
+            )
+        while pending:
+            yield await pending.popleft() + b"\n"
+    finally:
+        # Client disconnected or decoding failed
+        for task in pending:
+            task.cancel()
+
+
+@router.post(
+    "/stream",
+    summary="Decode a stream of data",
+    response_description="Decoded data for every line, as NDJSON",
+    description=f"""
+    Decode every line of a NDJSON request body, returning the results as a NDJSON stream.
+    It's intended for bulk decoding, as neither the request nor the response are fully
+    held in memory.
+
+    - Every input line is a `POST /api/v1/data-decoder` body: `data`, `to` and `chainId`.
+      Lines are limited to {settings.DATA_DECODER_STREAM_LINE_MAX_LENGTH} bytes, and blank
+      lines are ignored.
+    - Every output line is the decoded data, with the same schema as
+      `POST /api/v1/data-decoder`, or `{{"error": ...}}` if the line cannot be decoded.
+      Output lines are in the same order as the input lines.
+    - Up to {settings.DATA_DECODER_STREAM_MAX_CONCURRENCY} lines are decoded at the same time,
+      input is not read faster than the output is consumed.
+    """,
+    response_class=RequestBodyStreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"$ref": "#/components/schemas/DataDecoderInput"}
+                }
+            },
+        }
+    },
+)
+async def data_decoder_stream(request: Request) -> RequestBodyStreamingResponse:
+    """
+    Decode every line of the NDJSON body, streaming the results.
+
+    :param request:
+    :return: Decoded data as NDJSON, one line for every input line
+    """
+    # Stream can be sent for a long time, so the ABIs are loaded on their own database
+    # session and no connection is held by the request while it's sent
+    async with with_db_session_context():
+        data_decoder_service = await load_data_decoder_service()
+    return RequestBodyStreamingResponse(
+        decode_ndjson_stream(
+            data_decoder_service,
+            iter_ndjson_lines(
+                request.stream(), settings.DATA_DECODER_STREAM_LINE_MAX_LENGTH
+            ),
+            settings.DATA_DECODER_STREAM_MAX_CONCURRENCY,
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
     )
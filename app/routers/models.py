@@ -19,6 +19,18 @@ class AboutPublic(CamelModel):
     version: str
 
 
+class CacheStatsPublic(CamelModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_entries: int
+    max_size_bytes: int
+
+
 class ProjectPublic(CamelModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -26,6 +38,18 @@ class ProjectPublic(CamelModel):
     logo_file: str
 
 
+def bytes_to_hex(v: bytes | str | None) -> str | None:
+    """
+    Convert bytes to 0x-prefixed hexadecimal string
+
+    :param v:
+    :return:
+    """
+    if isinstance(v, bytes):
+        return "0x" + v.hex()
+    return v
+
+
 class AbiPublic(CamelModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -33,12 +57,28 @@ class AbiPublic(CamelModel):
     abi_json: list[dict] | dict | None
     modified: datetime
 
-    @field_validator("abi_hash", mode="before")
-    @classmethod
-    def bytes_to_hex(cls, v: bytes | str | None) -> str | None:
-        if isinstance(v, bytes):
-            return "0x" + v.hex()
-        return v
+    bytes_to_hex = field_validator("abi_hash", mode="before")(bytes_to_hex)
+
+
+class AbiJsonPublic(CamelModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    abi_hash: str
+    abi_json: list[dict] | dict
+
+    bytes_to_hex = field_validator("abi_hash", mode="before")(bytes_to_hex)
+
+
+def bytes_to_checksum_address(address: bytes | str | None) -> str | None:
+    """
+    Convert bytes address to checksum address
+
+    :param address:
+    :return:
+    """
+    if isinstance(address, bytes):
+        return fast_to_checksum_address(address)
+    return address
 
 
 class ContractsPublic(CamelModel):
@@ -54,24 +94,101 @@ class ContractsPublic(CamelModel):
     trusted_for_delegate_call: bool
     fetch_retries: int
 
-    @field_validator("address", mode="before")
-    @classmethod
-    def convert_to_checksum_address(cls, address: bytes):
-        """
-        Convert bytes address to checksum address
+    convert_to_checksum_address = field_validator("address", mode="before")(
+        bytes_to_checksum_address
+    )
 
-        :param address:
-        :return:
-        """
-        if isinstance(address, bytes):
-            return fast_to_checksum_address(address)
-        return address
+    @computed_field(return_type=str | None)
+    def logo_url(self) -> str | None:
+        return f"{settings.CONTRACT_LOGO_BASE_URL}/{self.address}.png"
+
+
+class ContractsFieldsPublic(CamelModel):
+    """
+    Same fields as `ContractsPublic`, but optional, used to serialize just a subset of fields
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    address: ChecksumAddress | None = None
+    name: str | None = None
+    display_name: str | None = None
+    chain_id: int | None = None
+    project: ProjectPublic | None = None
+    abi: AbiPublic | None = None
+    modified: datetime | None = None
+    trusted_for_delegate_call: bool | None = None
+    fetch_retries: int | None = None
+
+    convert_to_checksum_address = field_validator("address", mode="before")(
+        bytes_to_checksum_address
+    )
+
+    @computed_field(return_type=str | None)
+    def logo_url(self) -> str | None:
+        if self.address is None:
+            return None
+        return f"{settings.CONTRACT_LOGO_BASE_URL}/{self.address}.png"
+
+
+class ContractChangesPublic(CamelModel):
+    results: list[ContractsPublic]
+    since: str | None = Field(
+        description="Cursor to pass as `since` to get the next changes"
+    )
+    has_more: bool = Field(
+        description="`true` if there are more changes available right away"
+    )
+
+
+class ContractMetadataPublic(CamelModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    address: ChecksumAddress
+    name: str | None
+    display_name: str | None
+    chain_id: int
+    project: ProjectPublic | None
+    modified: datetime
+    trusted_for_delegate_call: bool
+
+    convert_to_checksum_address = field_validator("address", mode="before")(
+        bytes_to_checksum_address
+    )
 
     @computed_field(return_type=str | None)
     def logo_url(self) -> str | None:
         return f"{settings.CONTRACT_LOGO_BASE_URL}/{self.address}.png"
 
 
+class ContractBatchItemInput(CamelModel):
+    address: ChecksumAddress = Field(
+        pattern=r"^0x[0-9a-fA-F]{40}$",
+        description="Contract address",
+        examples=["0x5aFE3855358E112B5647B952709E6165e1c1eEEe"],
+    )
+    chain_id: int = Field(
+        gt=0,
+        description="Chain ID as a positive integer",
+        examples=[1],
+    )
+
+    @field_validator("address")
+    @classmethod
+    def validate_checksum_address(cls, value):
+        if not fast_is_checksum_address(value):
+            raise ValueError("Address is not checksummed")
+        return value
+
+
+class ContractsBatchInput(CamelModel):
+    contracts: list[ContractBatchItemInput] = Field(
+        min_length=1,
+        max_length=settings.CONTRACTS_BATCH_MAX_SIZE,
+        description="`(address, chainId)` pairs to get the metadata for",
+    )
+
+
 class DataDecoderInput(CamelModel):
     data: str = Field(
         pattern=r"^0x[0-9a-fA-F]*$",
@@ -116,6 +233,31 @@ class DataDecoderInput(CamelModel):
         return data
 
 
+class DataDecoderQuery(DataDecoderInput):
+    data: str = Field(
+        pattern=r"^0x[0-9a-fA-F]*$",
+        max_length=settings.DATA_DECODER_GET_DATA_MAX_LENGTH,
+        description="0x-prefixed hexadecimal string, up to "
+        f"{settings.DATA_DECODER_GET_DATA_MAX_LENGTH} characters",
+        examples=[
+            "0xa9059cbb0000000000000000000000005afe3855358e112b5647b952709e6165e1c1eeee00000000000000000000000000000000000000000000001e1de1d2517bae38ac"
+        ],
+    )
+
+
+class SelectorCandidatePublic(CamelModel):
+    name: str
+    signature: str = Field(examples=["transfer(address,uint256)"])
+    abi: dict[str, Any] = Field(description="Function ABI")
+
+
+class SelectorPublic(CamelModel):
+    selector: str = Field(examples=["0xa9059cbb"])
+    candidates: list[SelectorCandidatePublic] = Field(
+        description="Functions matching the selector, the one used for decoding first"
+    )
+
+
 class ParameterDecodedPublic(CamelModel):
     name: str
     type: str
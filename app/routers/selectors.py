@@ -0,0 +1,310 @@
+import asyncio
+import hashlib
+from typing import Annotated, Any
+
+import orjson
+from eth_typing import ABIFunction
+from eth_utils import abi_to_signature
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from hexbytes import HexBytes
+
+from ..config import settings
+from ..datasources.cache.compression import compress, decompress, get_content_encoding
+from ..services.data_decoder import DataDecoderService, get_data_decoder_service
+from ..services.lru_cache import SizeBoundedLRUCache
+from ..utils import JSON_MEDIA_TYPE, accepts_encoding, is_etag_fresh
+from .models import SelectorCandidatePublic, SelectorPublic
+
+router = APIRouter(
+    prefix="/selectors",
+    tags=["selectors"],
+)
+
+SELECTOR_PATTERN = r"^0x[0-9a-fA-F]{8}$"
+# Version of the export artifact format, increased on breaking changes
+SELECTORS_EXPORT_VERSION = 1
+
+# Rendered export artifacts, keyed by `(generation, since)`, as `(etag, compressed artifact)`
+_selectors_export_cache = SizeBoundedLRUCache(
+    settings.SELECTORS_EXPORT_LOCAL_CACHE_MAX_ENTRIES,
+    settings.SELECTORS_EXPORT_LOCAL_CACHE_MAX_BYTES,
+)
+
+
+async def load_data_decoder_service() -> DataDecoderService:
+    """
+    :return: Data decoder service with the ABIs stored on the database loaded, so every
+        process returns the same selectors
+    """
+    data_decoder_service = await get_data_decoder_service()
+    await data_decoder_service.load_new_abis()
+    return data_decoder_service
+
+
+def get_selectors_etag(data_decoder_service: DataDecoderService) -> str:
+    """
+    Build a weak ETag for the selectors. They only change when new ABIs are loaded
+    on the decoder index.
+
+    :param data_decoder_service:
+    :return: Weak ETag
+    """
+    raw_etag = f"{data_decoder_service.abi_index_generation}"
+    return f'W/"{hashlib.md5(raw_etag.encode()).hexdigest()}"'
+
+
+def get_selector_public(
+    data_decoder_service: DataDecoderService, selector: str
+) -> SelectorPublic | None:
+    """
+    :param data_decoder_service:
+    :param selector: 0x-prefixed 4 bytes hexadecimal selector
+    :return: Functions matching the selector, `None` if it's not known
+    """
+    candidates = data_decoder_service.get_selector_candidates(bytes(HexBytes(selector)))
+    if not candidates:
+        return None
+    return SelectorPublic(
+        selector=selector.lower(),
+        candidates=[
+            SelectorCandidatePublic(
+                name=candidate["name"],
+                signature=abi_to_signature(candidate),
+                abi=dict(candidate),
+            )
+            for candidate in candidates
+        ],
+    )
+
+
+def get_selectors_headers(etag: str) -> dict[str, str]:
+    """
+    :param etag:
+    :return: Headers so responses are cached by clients and CDNs
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.SELECTORS_CACHE_MAX_AGE}",
+    }
+
+
+def get_selectors_candidates(
+    data_decoder_service: DataDecoderService, fn_selectors: list[bytes]
+) -> list[tuple[bytes, list[ABIFunction]]]:
+    """
+    Copy the candidates of the selectors from the decoder index. It must be called from the
+    event loop, as the index is updated there when new ABIs are loaded.
+
+    :param data_decoder_service:
+    :param fn_selectors: Selectors to copy, sorted
+    :return: Known selectors with their candidates, the one used for decoding first
+    """
+    return [
+        (fn_selector, candidates)
+        for fn_selector in fn_selectors
+        if (candidates := data_decoder_service.get_selector_candidates(fn_selector))
+    ]
+
+
+def render_selectors_export(
+    selectors_candidates: list[tuple[bytes, list[ABIFunction]]],
+    generation: int | None,
+    since: int | None,
+) -> bytes:
+    """
+    :param selectors_candidates: Selectors to export with their candidates, as returned
+        by `get_selectors_candidates`
+    :param generation: ABI index generation of the artifact
+    :param since: Generation the changes are exported from, `None` for every selector
+    :return: JSON artifact. Every selector is mapped to its candidates as
+        `[signature, [input names]]`, the one used for decoding first
+    """
+    selectors: dict[str, list[list[Any]]] = {}
+    for fn_selector, candidates in selectors_candidates:
+        selectors["0x" + fn_selector.hex()] = [
+            [
+                abi_to_signature(candidate),
+                [fn_input.get("name", "") for fn_input in candidate.get("inputs", [])],
+            ]
+            for candidate in candidates
+        ]
+    return orjson.dumps(
+        {
+            "version": SELECTORS_EXPORT_VERSION,
+            "generation": generation,
+            "since": since,
+            "selectors": selectors,
+        }
+    )
+
+
+@router.get(
+    "/export",
+    summary="Export the selectors for client-side decoding",
+    response_description="Versioned artifact with the selectors and their signatures",
+    description="""
+    Return every selector known by the decoder with the signatures and input names of its
+    candidate functions, so clients can decode locally.
+
+    **Parameters:**
+    - `since`: `generation` of the last artifact downloaded, to just download the changes.
+
+    **Returns:**
+    - `version`: Version of the artifact format.
+    - `generation`: Generation of the decoder ABI index. Use it as `since` to get the next changes.
+    - `since`: Generation the changes are relative to. `null` if every selector is returned, as
+      changes are not available for the requested generation, and then local selectors must be replaced.
+    - `selectors`: Selectors mapped to their candidates as `[signature, [input names]]`, the one
+      used for decoding first. Candidates of a changed selector are returned complete.
+
+    **Notes**
+    - Responses have a strong `ETag`, use `If-None-Match` to refresh cheaply.
+    - Artifact is compressed if the client accepts it.
+    """,
+)
+async def export_selectors(
+    request: Request,
+    since: Annotated[
+        int | None,
+        Query(ge=0, description="Generation of the last artifact downloaded."),
+    ] = None,
+) -> Response:
+    """
+    Export the selectors of the decoder index, or the changes after a generation.
+
+    :param request:
+    :param since: Generation of the last artifact downloaded
+    :return: JSON artifact with a strong ETag, `304 Not Modified` if client copy is up to date
+    """
+    data_decoder_service = await load_data_decoder_service()
+    generation = data_decoder_service.abi_index_generation
+    fn_selectors = data_decoder_service.get_selectors_changed_after(since)
+    if fn_selectors is None:
+        since = None
+    key = (generation, since)
+    if (cached := _selectors_export_cache.get(key)) is None:
+        if fn_selectors is None:
+            fn_selectors = sorted(data_decoder_service.fn_selectors_with_abis)
+        # Index can be updated by new ABIs while the artifact is rendered, so the candidates
+        # are copied without awaiting since `generation` was read
+        selectors_candidates = get_selectors_candidates(
+            data_decoder_service, fn_selectors
+        )
+        # Signatures are built for every selector, don't block the event loop
+        artifact = await asyncio.to_thread(
+            render_selectors_export, selectors_candidates, generation, since
+        )
+        etag = f'"{hashlib.sha256(artifact).hexdigest()}"'
+        value = compress(artifact)
+        cached = (etag, value)
+        _selectors_export_cache.set(key, cached, len(value))
+
+    etag, value = cached
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    if is_etag_fresh(request, etag):
+        return Response(status_code=304, headers=headers)
+    if (content_encoding := get_content_encoding(value)) is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if accepts_encoding(request, content_encoding):
+            headers["Content-Encoding"] = content_encoding
+        else:
+            value = decompress(value)
+    return Response(value, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+@router.get(
+    "",
+    response_model=list[SelectorPublic],
+    summary="Get the functions for multiple selectors",
+    response_description="Functions for the selectors found",
+    description="""
+    Return the functions known for a list of 4 bytes function selectors.
+
+    **Parameters:**
+    - `selectors`: Function selectors, e.g. `0xa9059cbb`. Repeat the param to pass multiple values.
+
+    **Returns:**
+    - List of selectors found with their candidate functions, in the same order they were requested.
+      Selectors not found are omitted.
+
+    **Notes**
+    - Functions are retrieved from the in-memory index of the decoder, database is not queried.
+    - Responses can be cached, `ETag` only changes when new ABIs are loaded by the decoder.
+    """,
+)
+async def get_selectors(
+    request: Request,
+    response: Response,
+    selectors: Annotated[
+        list[Annotated[str, Query(pattern=SELECTOR_PATTERN)]],
+        Query(
+            min_length=1,
+            max_length=settings.SELECTORS_BATCH_MAX_SIZE,
+            description="Function selectors. Repeat to pass multiple values.",
+        ),
+    ],
+) -> list[SelectorPublic] | Response:
+    """
+    Return the functions for the provided selectors from the decoder index.
+
+    :param request:
+    :param response:
+    :param selectors: 0x-prefixed 4 bytes hexadecimal selectors
+    :return: Selectors found with their functions, in the requested order.
+        `304 Not Modified` if client copy is up to date
+    """
+    data_decoder_service = await load_data_decoder_service()
+    headers = get_selectors_headers(get_selectors_etag(data_decoder_service))
+    if is_etag_fresh(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return [
+        selector_public
+        for selector in dict.fromkeys(selector.lower() for selector in selectors)
+        if (selector_public := get_selector_public(data_decoder_service, selector))
+    ]
+
+
+@router.get(
+    "/{selector}",
+    response_model=SelectorPublic,
+    summary="Get the functions for a selector",
+    response_description="Functions for the selector",
+    description="""
+    Return the functions known for a 4 bytes function selector, including every function
+    with a different signature colliding on the same selector.
+
+    **Notes**
+    - The function used by the decoder is returned first.
+    - Functions are retrieved from the in-memory index of the decoder, database is not queried.
+    - Responses can be cached, `ETag` only changes when new ABIs are loaded by the decoder.
+    """,
+)
+async def get_selector(
+    request: Request,
+    response: Response,
+    selector: Annotated[
+        str,
+        Path(
+            pattern=SELECTOR_PATTERN,
+            description="Function selector, e.g. `0xa9059cbb`",
+        ),
+    ],
+) -> SelectorPublic | Response:
+    """
+    Return the functions for the provided selector from the decoder index.
+
+    :param request:
+    :param response:
+    :param selector: 0x-prefixed 4 bytes hexadecimal selector
+    :return: Functions for the selector, `304 Not Modified` if client copy is up to date
+    """
+    data_decoder_service = await load_data_decoder_service()
+    headers = get_selectors_headers(get_selectors_etag(data_decoder_service))
+    if is_etag_fresh(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    selector_public = get_selector_public(data_decoder_service, selector)
+    if selector_public is None:
+        raise HTTPException(status_code=404, detail="Selector not found")
+    response.headers.update(headers)
+    return selector_public
@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import hashlib
+import math
+
+
+class AddressBloomFilter:
+    """
+    Compact probabilistic set of contract addresses.
+
+    Membership checks can return false positives (bounded by `false_positive_rate`
+    while the number of added addresses stays under `capacity`), but never false
+    negatives, so an address not in the filter definitely was never added.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = max(capacity, 1)
+        self.false_positive_rate = false_positive_rate
+        self.size = max(
+            8,
+            math.ceil(
+                -self.capacity * math.log(false_positive_rate) / (math.log(2) ** 2)
+            ),
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.size / 8))
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _get_positions(self, address: bytes) -> list[int]:
+        """
+        Use double hashing over a single `blake2b` digest to derive `hash_count` positions
+
+        :param address:
+        :return: bit positions for the address
+        """
+        digest = hashlib.blake2b(address, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, address: bytes) -> bool:
+        """
+        Add the address, only counting it if it wasn't in the filter yet, so adding the
+        same address again doesn't saturate the filter
+
+        :param address:
+        :return: `True` if address was not in the filter, `False` if it might be already
+        """
+        added = False
+        for position in self._get_positions(address):
+            byte_index, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte_index] & mask:
+                self.bits[byte_index] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, address: bytes) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(address)
+        )
+
+    def is_saturated(self) -> bool:
+        """
+        :return: `True` if more distinct addresses than `capacity` were added, so false positive rate
+            is higher than configured and the filter should be rebuilt
+        """
+        return self.count > self.capacity
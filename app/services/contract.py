@@ -1,5 +1,115 @@
-from app.datasources.db.models import Contract
-from app.services.pagination import GenericPagination
+import datetime
+import hashlib
+from collections.abc import AsyncIterator
+from typing import Any
+
+from hexbytes import HexBytes
+from sqlalchemy.engine import Row
+from starlette.datastructures import URL
+
+from app.config import settings
+from app.datasources.cache.redis import serialize_response
+from app.datasources.db.models import CONTRACT_ROW_COLUMNS, Contract
+from app.routers.models import ContractsPublic
+from app.services.pagination import GenericPagination, PaginatedResponse
+from app.utils import JSON_MEDIA_TYPE
+
+
+def get_contract_dict(row: Row) -> dict[str, Any]:
+    """
+    Map a row returned by `Contract.get_contract_rows_query` to the shape of the public
+    contract, nesting `abi` and `project`. Only the selected columns are returned.
+
+    :param row:
+    :return: Contract attributes
+    """
+    mapping = row._mapping
+    contract = {
+        column_name: mapping[column_name]
+        for column_name in CONTRACT_ROW_COLUMNS
+        if column_name in mapping
+    }
+    if "abi_id" in mapping:
+        contract["abi"] = (
+            None
+            if mapping["abi_id"] is None
+            else {
+                "abi_hash": mapping["abi_hash"],
+                "abi_json": mapping["abi_json"],
+                "modified": mapping["abi_modified"],
+            }
+        )
+    if "project_id" in mapping:
+        contract["project"] = (
+            None
+            if mapping["project_id"] is None
+            else {
+                "description": mapping["project_description"],
+                "logo_file": mapping["project_logo_file"],
+            }
+        )
+    return contract
+
+
+def get_contracts_public(
+    contracts: list[dict[str, Any]], abi_hash_only: bool
+) -> list[ContractsPublic]:
+    """
+    :param contracts:
+    :param abi_hash_only: Remove `abi_json` from the ABIs, just keeping `abi_hash`
+    :return: Contracts serialized
+    """
+    contracts_public = [
+        ContractsPublic.model_validate(contract) for contract in contracts
+    ]
+    if abi_hash_only:
+        for contract_public in contracts_public:
+            if contract_public.abi:
+                contract_public.abi.abi_json = None
+    return contracts_public
+
+
+def get_contracts_etag(
+    query: str,
+    count: int | None,
+    modified: list[datetime.datetime],
+    media_type: str = JSON_MEDIA_TYPE,
+) -> str:
+    """
+    Build a weak ETag for a page of contracts. ETags only need to be unique for the same url,
+    so the query params, the count and the latest `modified` of the contracts and ABIs
+    returned are enough to detect changes.
+
+    :param query: Query string of the request
+    :param count: Total number of contracts
+    :param modified: `modified` of the contracts and ABIs in the page
+    :param media_type: Media type of the response, every format has its own ETag
+    :return: Weak ETag
+    """
+    last_modified = max(modified).isoformat() if modified else ""
+    raw_etag = f"{query}|{count}|{len(modified)}|{last_modified}"
+    if media_type != JSON_MEDIA_TYPE:
+        raw_etag += f"|{media_type}"
+    return f'W/"{hashlib.md5(raw_etag.encode()).hexdigest()}"'
+
+
+def get_paginated_contracts_etag(
+    response: PaginatedResponse[ContractsPublic],
+    query: str,
+    media_type: str = JSON_MEDIA_TYPE,
+) -> str:
+    """
+    :param response: Page of contracts
+    :param query: Query string of the request
+    :param media_type: Media type of the response
+    :return: ETag of the page
+    """
+    modified = []
+    for contract in response.results:
+        modified.append(contract.modified)
+        if contract.abi:
+            modified.append(contract.abi.modified)
+    return get_contracts_etag(query, response.count, modified, media_type)
 
 
 class ContractService:
@@ -11,21 +121,130 @@ class ContractService:
         address: bytes | None = None,
         chain_ids: list[int] | None = None,
         trusted_for_delegate_call: bool | None = None,
-    ) -> tuple[list[Contract], int]:
+        fields: set[str] | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None]:
         """
-        Get the contract by address and/or chain_ids
+        Get the contract by address and/or chain_ids. Rows are mapped straight to dictionaries,
+        `Contract` instances are not built.
 
         :param address: contract address
         :param chain_ids: list of filtered chains
         :param trusted_for_delegate_call: whether to return only contracts trusted for delegate
-        :return: Paginated tuple of contracts with total number of contracts
+        :param fields: only select these contract attributes, `None` for all of them
+        :return: Paginated tuple of contracts, as returned by `get_contract_dict`, with total
+            number of contracts, calculated using the pagination `count_strategy`
         """
-        query = Contract.get_contracts_query(
+        query = Contract.get_contract_rows_query(
             address=address,
             chain_ids=chain_ids,
             trusted_for_delegate_call=trusted_for_delegate_call,
+            fields=fields,
+        )
+        rows, count = await self.pagination.get_page_and_count(query)
+        return [get_contract_dict(row) for row in rows], count
+
+    async def search_contracts(
+        self,
+        search: str,
+        chain_ids: list[int] | None = None,
+        fields: set[str] | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """
+        Search contracts by name or display name
+
+        :param search: text to search
+        :param chain_ids: list of filtered chains
+        :param fields: only select these contract attributes, `None` for all of them
+        :return: Paginated tuple of contracts, as returned by `get_contract_dict`, with total
+            number of contracts, calculated using the pagination `count_strategy`
+        """
+        query = Contract.get_contracts_search_query(
+            search, chain_ids=chain_ids, fields=fields
+        )
+        rows, count = await self.pagination.get_page_and_count(query)
+        return [get_contract_dict(row) for row in rows], count
+
+    @staticmethod
+    async def get_contracts_by_address_and_chain_id(
+        address_chain_ids: list[tuple[bytes, int]],
+    ) -> list[Contract]:
+        """
+        Get the contracts for the provided `(address, chain_id)` pairs
+
+        :param address_chain_ids: list of `(address, chain_id)` tuples
+        :return: contracts found, not sorted
+        """
+        return await Contract.get_contracts_by_address_and_chain_id(address_chain_ids)
+
+    @staticmethod
+    async def stream_contracts(
+        chain_ids: list[int] | None = None,
+        trusted_for_delegate_call: bool | None = None,
+        fields: set[str] | None = None,
+        batch_size: int = 1_000,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Stream all the contracts, optionally filtered by chain_ids
+
+        :param chain_ids: list of filtered chains
+        :param trusted_for_delegate_call: whether to return only contracts trusted for delegate
+        :param fields: only select these contract attributes, `None` for all of them
+        :param batch_size: number of contracts returned at once
+        :return: batches of contracts, as returned by `get_contract_dict`, sorted by
+            `address` and `chain_id`
+        """
+        async for rows in Contract.stream_contracts(
+            chain_ids=chain_ids,
+            trusted_for_delegate_call=trusted_for_delegate_call,
+            fields=fields,
+            batch_size=batch_size,
+        ):
+            yield [get_contract_dict(row) for row in rows]
+
+    @staticmethod
+    async def get_contracts_changes(
+        cursor: tuple[datetime.datetime, bytes, int] | None, limit: int
+    ) -> list[dict[str, Any]]:
+        """
+        Get the contracts modified after `cursor`. Contracts modified in the last
+        `CONTRACTS_CHANGES_SETTLE_SECONDS` are left for the next call.
+
+        :param cursor: `(modified, address, chain_id)` of the last contract already returned,
+            `None` to start from the beginning
+        :param limit: max number of contracts to return
+        :return: contracts, as returned by `get_contract_dict`, sorted by `modified`,
+            `address` and `chain_id`
+        """
+        modified_before = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+            seconds=settings.CONTRACTS_CHANGES_SETTLE_SECONDS
+        )
+        rows = await Contract.get_contracts_modified_after(
+            modified_before, cursor=cursor, limit=limit
         )
-        page = await self.pagination.get_page(query)
-        count = await self.pagination.get_count(query)
+        return [get_contract_dict(row) for row in rows]
+
+
+async def render_contracts_default_page(address: str) -> bytes | None:
+    """
+    Render the response of `list_contracts` for the address without query params,
+    so it can be pre-rendered when contracts are updated.
 
-        return page, count
+    :param address: Contract address
+    :return: Response serialized as it's stored by `cache_response`, `None` if contracts
+        don't fit in one page, as `next` url depends on the request.
+    """
+    pagination = GenericPagination(limit=None, offset=None)
+    contracts_service = ContractService(pagination=pagination)
+    contracts_page, count = await contracts_service.get_contracts(
+        address=HexBytes(address)
+    )
+    if pagination.has_next:
+        return None
+    response = pagination.serialize(
+        URL(), get_contracts_public(contracts_page, abi_hash_only=False), count
+    )
+    return serialize_response(
+        PaginatedResponse[ContractsPublic],
+        response,
+        get_paginated_contracts_etag(response, query=""),
+    )
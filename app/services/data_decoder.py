@@ -1,5 +1,7 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 import asyncio
+import datetime
+import json
 import logging
 from collections.abc import AsyncIterator
 from enum import Enum
@@ -9,7 +11,7 @@ from async_lru import alru_cache
 from eth_abi import decode as decode_abi
 from eth_abi.exceptions import DecodingError
 from eth_typing import ABI, ABIFunction, Address, ChecksumAddress, HexStr, TypeStr
-from eth_utils import function_abi_to_4byte_selector
+from eth_utils import abi_to_signature, function_abi_to_4byte_selector
 from hexbytes import HexBytes
 from safe_eth.eth.contracts import get_multi_send_contract
 from safe_eth.eth.utils import fast_to_checksum_address
@@ -19,10 +21,21 @@ from web3 import Web3
 from web3._utils.abi import get_abi_input_names, get_abi_input_types, map_abi_data
 from web3._utils.normalizers import implicitly_identity
 
+from ..config import settings
+from ..datasources.cache.redis import (
+    del_contract_selectors_cache,
+    get_key_for_contract_selectors,
+    get_redis,
+)
 from ..datasources.db.models import Abi, Contract
+from .bloom_filter import AddressBloomFilter
+from .lru_cache import CacheStats, SizeBoundedLRUCache
 
 logger = logging.getLogger(__name__)
 
+# Sentinel to differentiate contracts not cached from contracts cached without ABI
+_NOT_CACHED = object()
+
 
 class DataDecoderException(Exception):
     pass
@@ -72,6 +85,34 @@ async def get_data_decoder_service() -> "DataDecoderService":
     return data_decoder_service
 
 
+async def del_contract_and_proxies_selectors_cache(address: str, chain_id: int) -> None:
+    """
+    Delete the cached function selectors of a contract and of the proxies using it as
+    implementation, as the selectors of a proxy are merged with the implementation ones.
+    Proxies of proxies are followed up to `PROXY_IMPLEMENTATION_MAX_DEPTH` levels.
+
+    :param address: Contract address
+    :param chain_id: Contract chain id
+    """
+    await del_contract_selectors_cache(address, chain_id)
+    implementations = [bytes(HexBytes(address))]
+    visited_addresses = set(implementations)
+    for _ in range(DataDecoderService.PROXY_IMPLEMENTATION_MAX_DEPTH):
+        proxies = [
+            proxy
+            for proxy in await Contract.get_proxy_addresses_by_implementations(
+                implementations, chain_id
+            )
+            if proxy not in visited_addresses
+        ]
+        if not proxies:
+            break
+        visited_addresses.update(proxies)
+        for proxy in proxies:
+            await del_contract_selectors_cache(to_0x_hex_str(proxy), chain_id)
+        implementations = proxies
+
+
 @implicitly_identity
 def addresses_checksummed_normalizer(
     type_str: TypeStr, data: Any
@@ -90,13 +131,22 @@ def addresses_checksummed_normalizer(
 
 class DataDecoderService:
     EXEC_TRANSACTION_SELECTOR = HexBytes("0x6a761202")
+    # Maximum number of proxy implementations followed when building contract selectors
+    PROXY_IMPLEMENTATION_MAX_DEPTH = 3
 
     dummy_w3 = Web3()
 
     fn_selectors_with_abis: dict[bytes, ABIFunction]
+    fn_selectors_collisions: dict[bytes, dict[str, ABIFunction]]
+    fn_selectors_base_generation: int | None
+    fn_selectors_generations: dict[bytes, int]
     multisend_abis: list[ABI]
     multisend_fn_selectors_with_abis: dict[bytes, ABIFunction]
     last_abi_id: int | None
+    abi_index_generation: int | None
+    contract_addresses_filter: AddressBloomFilter
+    last_contract_modified: datetime.datetime | None
+    contract_selectors_cache: SizeBoundedLRUCache
 
     async def init(self) -> None:
         """
@@ -112,11 +162,21 @@ class DataDecoderService:
             self.__class__.__name__,
             self.last_abi_id,
         )
+        # Functions with a different signature sharing a selector, by signature. Only
+        # the one on `fn_selectors_with_abis` is used for decoding
+        self.fn_selectors_collisions = {}
         self.fn_selectors_with_abis: dict[
             bytes, ABIFunction
         ] = await self._generate_selectors_with_abis_from_abis(
             await self.get_supported_abis()
         )
+        # Generation of the selectors index, only updated once new ABIs are loaded. As it's the
+        # last ABI id loaded, it's the same for every process with the same ABIs
+        self.abi_index_generation = self.last_abi_id
+        # Selectors added or with new candidates after the index was built, with the generation
+        # they were added on, so changes since a generation can be exported
+        self.fn_selectors_base_generation = self.last_abi_id
+        self.fn_selectors_generations = {}
         logger.info(
             "%s: Contract ABIs for decoding were loaded", self.__class__.__name__
         )
@@ -126,8 +186,113 @@ class DataDecoderService:
             self.multisend_fn_selectors_with_abis.update(
                 await self._generate_selectors_with_abis_from_abi(abi)
             )
+        await self._build_contract_addresses_filter()
+        self.contract_selectors_cache = SizeBoundedLRUCache(
+            settings.DATA_DECODER_CONTRACT_LOCAL_CACHE_MAX_ENTRIES,
+            settings.DATA_DECODER_CONTRACT_LOCAL_CACHE_MAX_BYTES,
+        )
         # lock_load_new_abis will avoid concurrent calls to load_new_abis
         self.lock_load_new_abis = asyncio.Lock()
+        # lock_load_new_contract_addresses will avoid concurrent calls to load_new_contract_addresses
+        self.lock_load_new_contract_addresses = asyncio.Lock()
+
+    @staticmethod
+    async def _add_contract_addresses_to_filter(
+        contract_addresses_filter: AddressBloomFilter,
+        modified_from: datetime.datetime | None,
+    ) -> tuple[int, datetime.datetime | None]:
+        """
+        Add to the filter the addresses of the contracts with ABI modified on or after
+        `modified_from`.
+
+        :param contract_addresses_filter:
+        :param modified_from: `None` to add every contract with ABI
+        :return: Number of new addresses added and the latest `modified` read, `modified_from`
+            if no contracts were read
+        """
+        added = 0
+        last_modified = modified_from
+        async for address, modified in Contract.get_addresses_with_abi(
+            modified_from=modified_from
+        ):
+            if contract_addresses_filter.add(address):
+                added += 1
+            if last_modified is None or modified > last_modified:
+                last_modified = modified
+        return added, last_modified
+
+    async def _build_contract_addresses_filter(self) -> None:
+        """
+        Build the bloom filter with the addresses of every contract with ABI on the database,
+        so contract ABI lookups can be skipped for the addresses that definitely don't have one.
+        Filter is only replaced once it's fully built, so concurrent decodings keep using the
+        previous one meanwhile.
+        """
+        contract_addresses_filter = AddressBloomFilter(
+            settings.DATA_DECODER_ADDRESS_FILTER_CAPACITY,
+            settings.DATA_DECODER_ADDRESS_FILTER_FALSE_POSITIVE_RATE,
+        )
+        added, last_modified = await self._add_contract_addresses_to_filter(
+            contract_addresses_filter, None
+        )
+        if contract_addresses_filter.is_saturated():
+            # Capacity was exceeded, resize the filter to keep false positive rate low
+            contract_addresses_filter = AddressBloomFilter(
+                added * 2,
+                settings.DATA_DECODER_ADDRESS_FILTER_FALSE_POSITIVE_RATE,
+            )
+            _, last_modified = await self._add_contract_addresses_to_filter(
+                contract_addresses_filter, None
+            )
+        self.contract_addresses_filter = contract_addresses_filter
+        self.last_contract_modified = last_modified
+        logger.info(
+            "%s: Loaded %d contract addresses with ABI",
+            self.__class__.__name__,
+            len(self.contract_addresses_filter),
+        )
+
+    async def get_contract_last_modified(
+        self, address: Address
+    ) -> datetime.datetime | None:
+        """
+        Proxies are decoded merging the selectors of their implementations, so the
+        implementations are followed up to `PROXY_IMPLEMENTATION_MAX_DEPTH` levels.
+
+        :param address: Contract address
+        :return: Latest `modified` of the contract, or of its implementations if it's a proxy,
+            on any chain, so changes on the ABIs used to decode it can be detected. `None` if
+            contract definitely has no ABI, without querying the database
+        """
+        if not self.may_have_contract_abi(address):
+            return None
+        addresses = [bytes(HexBytes(address))]
+        visited_addresses = set(addresses)
+        last_modified: datetime.datetime | None = None
+        for _ in range(self.PROXY_IMPLEMENTATION_MAX_DEPTH + 1):
+            (
+                modified,
+                implementations,
+            ) = await Contract.get_last_modified_and_implementations_by_addresses(
+                addresses
+            )
+            if modified is not None and (
+                last_modified is None or modified > last_modified
+            ):
+                last_modified = modified
+            addresses = sorted(implementations - visited_addresses)
+            if not addresses:
+                break
+            visited_addresses.update(addresses)
+        return last_modified
+
+    def may_have_contract_abi(self, address: Address) -> bool:
+        """
+        :param address: Contract address
+        :return: `False` if the contract definitely has no ABI stored on the database,
+            `True` if it might have it
+        """
+        return bytes(HexBytes(address)) in self.contract_addresses_filter
 
     async def _generate_selectors_with_abis_from_abi(
         self, abi: ABI
@@ -156,13 +321,82 @@ class DataDecoderService:
         selector
         :return: Dictionary with function selector as bytes and the function abi
         """
-        return {
-            fn_selector: fn_abi
-            async for supported_abi in abis
+        selectors_with_abis: dict[bytes, ABIFunction] = {}
+        async for supported_abi in abis:
             for fn_selector, fn_abi in (
                 await self._generate_selectors_with_abis_from_abi(supported_abi)
-            ).items()
-        }
+            ).items():
+                if (
+                    previous_fn_abi := selectors_with_abis.get(fn_selector)
+                ) is not None:
+                    self._add_selector_collision(fn_selector, previous_fn_abi, fn_abi)
+                selectors_with_abis[fn_selector] = fn_abi
+        return selectors_with_abis
+
+    def _add_selector_collision(
+        self, fn_selector: bytes, fn_abi: ABIFunction, other_fn_abi: ABIFunction
+    ) -> bool:
+        """
+        Store both functions as candidates for the selector if they are different functions.
+        Same function is usually found on many ABIs, and a different signature with the same
+        name and selector is not realistic, so signatures are only built if names differ.
+
+        :param fn_selector:
+        :param fn_abi: Function already stored for the selector
+        :param other_fn_abi: Function found for the same selector
+        :return: `True` if a new candidate was stored, `False` otherwise
+        """
+        if fn_abi.get("name") == other_fn_abi.get("name"):
+            return False
+        candidates = self.fn_selectors_collisions.setdefault(fn_selector, {})
+        previous_candidates = len(candidates)
+        for candidate in (fn_abi, other_fn_abi):
+            candidates.setdefault(abi_to_signature(candidate), candidate)
+        return len(candidates) > previous_candidates
+
+    def get_selectors_changed_after(self, generation: int | None) -> list[bytes] | None:
+        """
+        :param generation: ABI index generation already known
+        :return: Selectors added, or with new candidates, after the provided generation.
+            `None` if changes cannot be known, as the index was built after that generation
+            or the generation is not known yet, so every selector must be exported
+        """
+        if generation is None or (
+            self.fn_selectors_base_generation is not None
+            and generation < self.fn_selectors_base_generation
+        ):
+            return None
+        if self.abi_index_generation is None or generation > self.abi_index_generation:
+            return None
+        return sorted(
+            fn_selector
+            for fn_selector, fn_selector_generation in list(
+                self.fn_selectors_generations.items()
+            )
+            if fn_selector_generation > generation
+        )
+
+    def get_selector_candidates(self, fn_selector: bytes) -> list[ABIFunction]:
+        """
+        Get the functions matching a selector from the in-memory index, without querying
+        the database.
+
+        :param fn_selector: 4 bytes function selector
+        :return: Every function known for the selector, the one used for decoding first.
+            Empty if selector is not known
+        """
+        fn_abi = self.fn_selectors_with_abis.get(fn_selector)
+        if fn_abi is None:
+            return []
+        collisions = self.fn_selectors_collisions.get(fn_selector)
+        if not collisions:
+            return [fn_abi]
+        fn_signature = abi_to_signature(fn_abi)
+        return [fn_abi] + [
+            candidate
+            for signature, candidate in collisions.items()
+            if signature != fn_signature
+        ]
 
     async def get_supported_abis(self) -> AsyncIterator[ABI]:
         """
@@ -173,22 +407,139 @@ class DataDecoderService:
     async def get_multisend_abis(self) -> AsyncIterator[ABI]:
         yield get_multi_send_contract(self.dummy_w3).abi
 
-    @alru_cache(maxsize=2048)
-    async def get_contract_abi(
-        self,
-        address: Address,
-        chain_id: int | None,
-    ) -> ABI | None:
+    @staticmethod
+    def _serialize_selectors_with_abis(
+        selectors_with_abis: dict[bytes, ABIFunction] | None,
+    ) -> str:
+        """
+        :param selectors_with_abis:
+        :return: JSON with hex function selectors as keys, empty string if `None`
+        """
+        if selectors_with_abis is None:
+            return ""
+        return json.dumps(
+            {
+                to_0x_hex_str(selector): fn_abi
+                for selector, fn_abi in selectors_with_abis.items()
+            }
+        )
+
+    @staticmethod
+    def _deserialize_selectors_with_abis(
+        value: bytes,
+    ) -> dict[bytes, ABIFunction] | None:
+        """
+        :param value: Value serialized with `_serialize_selectors_with_abis`
+        :return: Dictionary of function selectors with `ABIFunction`, `None` for an empty value
+        """
+        if not value:
+            return None
+        return {
+            bytes.fromhex(selector[2:]): fn_abi
+            for selector, fn_abi in json.loads(value).items()
+        }
+
+    async def _get_contract_abi_selectors_from_database(
+        self, address: Address, chain_id: int | None
+    ) -> tuple[dict[bytes, ABIFunction] | None, bool]:
         """
-        Retrieves the ABI for the contract at the given address.
+        Build the function selectors for the ABI of the contract. If the contract is a proxy,
+        the selectors of its implementation ABI are merged, following the implementation
+        chain up to `PROXY_IMPLEMENTATION_MAX_DEPTH` levels.
+        Selectors of the proxy have preference over the implementation ones.
 
         :param address: Contract address
-        :param chain_id: Chain id for the contract
-        :return: List of ABI data if found, `None` otherwise.
+        :param chain_id: Chain id for the contract, `None` to get it from any chain
+        :return: Tuple with the dictionary of function selectors with `ABIFunction` (`None` if contract
+            has no ABI) and `True` if every implementation on the chain was found, `False` otherwise
         """
-        return await Contract.get_abi_by_contract_address(HexBytes(address), chain_id)
+        result = await Contract.get_abi_and_implementation_by_contract_address(
+            HexBytes(address), chain_id
+        )
+        if result is None:
+            return None, True
+
+        abi, implementation, contract_chain_id = result
+        selectors_with_abis = await self._generate_selectors_with_abis_from_abi(abi)
+        visited_addresses = {bytes(HexBytes(address))}
+        for _ in range(self.PROXY_IMPLEMENTATION_MAX_DEPTH):
+            if implementation is None or implementation in visited_addresses:
+                break
+            visited_addresses.add(implementation)
+            result = await Contract.get_abi_and_implementation_by_contract_address(
+                implementation, contract_chain_id
+            )
+            if result is None:
+                # Implementation ABI is not available yet
+                return selectors_with_abis, False
+            implementation_abi, implementation, _ = result
+            selectors_with_abis = (
+                await self._generate_selectors_with_abis_from_abi(implementation_abi)
+                | selectors_with_abis
+            )
+        return selectors_with_abis, True
+
+    async def get_contract_abi_selectors(
+        self, address: Address, chain_id: int | None
+    ) -> dict[bytes, ABIFunction] | None:
+        """
+        Retrieves the function selectors for the ABI of the contract at the given address,
+        including the selectors of the implementation ABI for proxy contracts.
+        They are cached in memory, bounded by number of entries and size, and on the shared
+        Redis cache, so database load doesn't grow with the number of running processes.
+        Contracts without ABI, or proxies whose implementation ABI is not available yet,
+        are cached with a shorter expiration. Entries in memory expire with the Redis ones.
+
+        :param address: Contract address
+        :param chain_id: Chain id for the contract, `None` to get it from any chain
+        :return: Dictionary of function selectors with `ABIFunction` if found, `None` otherwise
+        """
+        address_bytes = bytes(HexBytes(address))
+        local_cache_key = (address_bytes, chain_id)
+        selectors_with_abis = self.contract_selectors_cache.get(
+            local_cache_key, _NOT_CACHED
+        )
+        if selectors_with_abis is not _NOT_CACHED:
+            return selectors_with_abis
+
+        redis = get_redis()
+        cache_key = get_key_for_contract_selectors(
+            to_0x_hex_str(address_bytes), chain_id
+        )
+        pipe = redis.pipeline(transaction=False)
+        pipe.get(cache_key)
+        pipe.ttl(cache_key)
+        cached_value, cached_ttl = await pipe.execute()
+        if cached_value is not None:
+            selectors_with_abis = self._deserialize_selectors_with_abis(cached_value)
+            self.contract_selectors_cache.set(
+                local_cache_key,
+                selectors_with_abis,
+                len(cached_value),
+                ttl=(
+                    cached_ttl
+                    if cached_ttl >= 0
+                    else settings.DATA_DECODER_CONTRACT_CACHE_MISSING_TTL
+                ),
+            )
+            return selectors_with_abis
+
+        (
+            selectors_with_abis,
+            implementations_found,
+        ) = await self._get_contract_abi_selectors_from_database(address, chain_id)
+        value = self._serialize_selectors_with_abis(selectors_with_abis)
+        ttl = (
+            settings.DATA_DECODER_CONTRACT_CACHE_TTL
+            if selectors_with_abis is not None and implementations_found
+            else settings.DATA_DECODER_CONTRACT_CACHE_MISSING_TTL
+        )
+        await redis.set(cache_key, value, ex=ttl)
+        self.contract_selectors_cache.set(
+            local_cache_key, selectors_with_abis, len(value), ttl=ttl
+        )
+        return selectors_with_abis
 
-    @alru_cache(maxsize=2048)
     async def get_contract_abi_selectors_with_functions(
         self, address: Address, chain_id: int | None
     ) -> dict[bytes, ABIFunction] | None:
@@ -198,13 +549,17 @@ class DataDecoderService:
         :return: Dictionary of function selects with `ABIFunction` if found, `None` otherwise
             If contract is not found for the chain, return the first one that matches in other chain.
         """
-        abi = await self.get_contract_abi(address, chain_id)
-        if not abi and chain_id is not None:
+        selectors_with_abis = await self.get_contract_abi_selectors(address, chain_id)
+        if selectors_with_abis is None and chain_id is not None:
             # Try to find an ABI in other network
-            abi = await self.get_contract_abi(address, None)
-        if abi:
-            return await self._generate_selectors_with_abis_from_abi(abi)
-        return None
+            selectors_with_abis = await self.get_contract_abi_selectors(address, None)
+        return selectors_with_abis
+
+    def get_contract_selectors_cache_stats(self) -> CacheStats:
+        """
+        :return: Hits, misses, evictions and size of the in-memory contract selectors cache
+        """
+        return self.contract_selectors_cache.get_stats()
 
     async def get_abi_function(
         self, data: bytes, address: Address | None = None, chain_id: int | None = None
@@ -218,8 +573,8 @@ class DataDecoderService:
         selector = data[:4]
         # Check first that selector is supported on our database
         if selector in self.fn_selectors_with_abis:
-            # Try to use specific ABI if address provided
-            if address:
+            # Try to use specific ABI if address provided and contract might have one
+            if address and self.may_have_contract_abi(address):
                 contract_selectors_with_abis = (
                     await self.get_contract_abi_selectors_with_functions(
                         address, chain_id
@@ -487,12 +842,13 @@ class DataDecoderService:
         selector = HexBytes(data)[:4]
         if selector not in self.fn_selectors_with_abis:
             return DecodingAccuracyEnum.NO_MATCH
-        if address is not None:
-            if chain_id is not None and await self.get_contract_abi(
-                address, chain_id=chain_id
+        if address is not None and self.may_have_contract_abi(address):
+            if (
+                chain_id is not None
+                and await self.get_contract_abi_selectors(address, chain_id) is not None
             ):
                 return DecodingAccuracyEnum.FULL_MATCH
-            if await self.get_contract_abi(address, None):
+            if await self.get_contract_abi_selectors(address, None) is not None:
                 return DecodingAccuracyEnum.PARTIAL_MATCH
         return DecodingAccuracyEnum.ONLY_FUNCTION_MATCH
 
@@ -506,9 +862,13 @@ class DataDecoderService:
         for selector, new_abi in (
             await self._generate_selectors_with_abis_from_abi(abi)
         ).items():
-            if selector not in self.fn_selectors_with_abis:
+            if (fn_abi := self.fn_selectors_with_abis.get(selector)) is None:
                 self.fn_selectors_with_abis[selector] = new_abi
                 updated = True
+            elif not self._add_selector_collision(selector, fn_abi, new_abi):
+                continue
+            if self.last_abi_id is not None:
+                self.fn_selectors_generations[selector] = self.last_abi_id
         return updated
 
     async def load_new_abis(self) -> int:
@@ -550,6 +910,7 @@ class DataDecoderService:
             async for abi in abis:
                 if await self.add_abi(abi):
                     loaded_abis += 1
+            self.abi_index_generation = self.last_abi_id
             logger.debug(
                 "%s: Loaded new %d contract ABIs",
                 self.__class__.__name__,
@@ -565,3 +926,60 @@ class DataDecoderService:
         finally:
             if acquired:
                 self.lock_load_new_abis.release()
+
+    async def load_new_contract_addresses(self) -> int:
+        """
+        Add to the contract addresses filter the contracts with ABI modified after the
+        filter was last updated. If the filter is saturated it's rebuilt from scratch.
+
+        `modified` is set when the contract is flushed, not when it's committed, so a contract
+        can be committed after newer ones were already read. Contracts modified in the last
+        `DATA_DECODER_ADDRESS_FILTER_SETTLE_SECONDS` before the latest one read are read
+        again, adding an address twice has no effect.
+
+        :return: Number of contract addresses loaded
+        """
+        acquired = False
+        try:
+            await asyncio.wait_for(
+                self.lock_load_new_contract_addresses.acquire(), timeout=0.01
+            )
+            acquired = True
+            if self.contract_addresses_filter.is_saturated():
+                await self._build_contract_addresses_filter()
+                return len(self.contract_addresses_filter)
+
+            modified_from = (
+                self.last_contract_modified
+                - datetime.timedelta(
+                    seconds=settings.DATA_DECODER_ADDRESS_FILTER_SETTLE_SECONDS
+                )
+                if self.last_contract_modified
+                else None
+            )
+            (
+                loaded_addresses,
+                last_modified,
+            ) = await self._add_contract_addresses_to_filter(
+                self.contract_addresses_filter, modified_from
+            )
+            if last_modified is not None and (
+                self.last_contract_modified is None
+                or last_modified > self.last_contract_modified
+            ):
+                self.last_contract_modified = last_modified
+            logger.debug(
+                "%s: Loaded %d contract addresses with ABI",
+                self.__class__.__name__,
+                loaded_addresses,
+            )
+            return loaded_addresses
+        except TimeoutError:
+            logger.debug(
+                "%s: Reloading of contract addresses in progress by another request, not doing anything",
+                self.__class__.__name__,
+            )
+            return 0
+        finally:
+            if acquired:
+                self.lock_load_new_contract_addresses.release()
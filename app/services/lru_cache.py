@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_entries: int
+    max_size_bytes: int
+
+
+class SizeBoundedLRUCache:
+    """
+    In-memory LRU cache bounded both by number of entries and by the approximate size
+    in bytes of the stored values, so memory usage doesn't depend on how large the
+    cached values happen to be. Entries can also expire after a time to live.
+    """
+
+    def __init__(self, max_entries: int, max_size_bytes: int):
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        # Values with their size and their expiration `time.monotonic()`, if any
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float | None]] = (
+            OrderedDict()
+        )
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._is_expired(entry)
+
+    @staticmethod
+    def _is_expired(entry: tuple[Any, int, float | None]) -> bool:
+        expires_at = entry[2]
+        return expires_at is not None and expires_at <= time.monotonic()
+
+    def keys(self) -> list[Hashable]:
+        """
+        :return: Cached keys, from least to most recently used
+        """
+        return list(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        :param key:
+        :param default: Value returned if `key` is not cached
+        :return: Cached value for `key`, `default` if not cached or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._is_expired(entry):
+            if entry is not None:
+                self.delete(key)
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(
+        self, key: Hashable, value: Any, size_bytes: int, ttl: float | None = None
+    ) -> None:
+        """
+        Store `value`, evicting the least recently used entries until the cache fits
+        the configured limits. Values bigger than `max_size_bytes` are not stored.
+
+        :param key:
+        :param value:
+        :param size_bytes: Approximate size of the value in bytes
+        :param ttl: Seconds until the entry expires, `None` to never expire
+        """
+        self.delete(key)
+        if size_bytes > self.max_size_bytes or self.max_entries <= 0:
+            return
+
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (value, size_bytes, expires_at)
+        self.size_bytes += size_bytes
+        while (
+            len(self._entries) > self.max_entries
+            or self.size_bytes > self.max_size_bytes
+        ):
+            _, (_, evicted_size_bytes, _) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted_size_bytes
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            self.size_bytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entries=len(self._entries),
+            size_bytes=self.size_bytes,
+            max_entries=self.max_entries,
+            max_size_bytes=self.max_size_bytes,
+        )
@@ -1,18 +1,36 @@
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Sequence
+from enum import Enum
 from typing import Any, TypeVar
 
-from fastapi import Query
+from fastapi import HTTPException, Query
+from hexbytes import HexBytes
 from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlmodel import select
 from starlette.datastructures import URL
 
+from app.config import settings
+from app.datasources.cache.redis import get_redis
 from app.datasources.db.database import db_session
 
 T = TypeVar("T")
 
 
+class CountStrategyEnum(Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
 class PaginatedResponse[T](BaseModel):
-    count: int
+    count: int | None
     next: str | None
     previous: str | None
     results: list[T]
@@ -21,6 +39,16 @@ class PaginatedResponse[T](BaseModel):
 class PaginationQueryParams(BaseModel):
     limit: int | None = Query(None, ge=1)
     offset: int | None = Query(0, ge=0)
+    cursor: str | None = Query(
+        None,
+        description="Opt-in cursor pagination. Send it empty to get the first page, "
+        "then follow the `next`/`previous` links. `offset` is ignored when provided.",
+    )
+    count: CountStrategyEnum = Query(
+        CountStrategyEnum.EXACT,
+        description="How to calculate `count`: `exact` (default), `estimated` using the "
+        "database planner, `cached` exact count for a short period of time or `none` to skip it.",
+    )
 
 
 class GenericPagination:
@@ -30,12 +58,15 @@ class GenericPagination:
         offset: int | None,
         default_page_size: int = 10,
         max_page_size: int = 100,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
     ):
         self.max_page_size = max_page_size
         self.limit = min(limit, max_page_size) if limit else default_page_size
         self.offset = offset if offset else 0
+        self.count_strategy = count_strategy
+        self.has_next = False
 
-    def get_next_page(self, url: URL, count: int) -> str | None:
+    def get_next_page(self, url: URL, count: int | None) -> str | None:
         """
         Calculates the next page of results. If there are no more pages return None
 
@@ -43,7 +74,7 @@ class GenericPagination:
         :param count:
         :return:
         """
-        if self.offset + self.limit < count:
+        if self.has_next:
             next_offset = self.offset + self.limit
             return str(url.include_query_params(limit=self.limit, offset=next_offset))
         return None
@@ -60,6 +91,18 @@ class GenericPagination:
             return str(url.include_query_params(limit=self.limit, offset=prev_offset))
         return None
 
+    @staticmethod
+    def get_results(query, rows: Sequence[Row]) -> list[Any]:
+        """
+        :param query: Query used to get the rows
+        :param rows:
+        :return: Entities (or values) for queries selecting just one element, so ORM models
+            can be paginated, and the rows as they are for queries selecting columns
+        """
+        if len(query.column_descriptions) == 1:
+            return [row[0] for row in rows]
+        return list(rows)
+
     async def get_page(self, query) -> list[Any]:
         """
         Get from database the requested page
@@ -67,8 +110,13 @@ class GenericPagination:
         :param query:
         :return:
         """
-        queryset = await db_session.execute(query.offset(self.offset).limit(self.limit))
-        return list(queryset.scalars().all())
+        # Get an extra row to know if there are more rows after the page
+        queryset = await db_session.execute(
+            query.offset(self.offset).limit(self.limit + 1)
+        )
+        results = self.get_results(query, queryset.all())
+        self.has_next = len(results) > self.limit
+        return results[: self.limit]
 
     async def get_count(self, query) -> int:
         """
@@ -84,7 +132,88 @@ class GenericPagination:
         )
         return count_query.scalars().one()
 
-    def serialize(self, url: URL, results: list[T], count: int) -> PaginatedResponse:
+    async def get_estimated_count(self, query) -> int:
+        """
+        Get the number of rows that fit the query estimated by the database planner, without
+        scanning the table
+
+        :param query:
+        :return:
+        """
+        connection = await db_session.connection()
+        compiled = query.order_by(None).compile(
+            connection.sync_connection,
+            compile_kwargs={"render_postcompile": True},
+        )
+        params = tuple(compiled.params[key] for key in compiled.positiontup or ())
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", params
+        )
+        return int(result.scalar_one()[0]["Plan"]["Plan Rows"])
+
+    async def get_cached_count(self, query) -> int:
+        """
+        Get the count of rows that fit the query, caching it on Redis for
+        `PAGINATION_COUNT_CACHE_TTL` seconds
+
+        :param query:
+        :return:
+        """
+        compiled = query.order_by(None).compile()
+        raw_key = json.dumps(
+            [str(compiled), compiled.params], sort_keys=True, default=str
+        )
+        key = f"pagination_count:{hashlib.md5(raw_key.encode()).hexdigest()}"
+        redis = get_redis()
+        if (cached_count := await redis.get(key)) is not None:
+            return int(cached_count)
+        count = await self.get_count(query)
+        await redis.set(key, count, ex=settings.PAGINATION_COUNT_CACHE_TTL)
+        return count
+
+    async def get_page_and_count(self, query) -> tuple[list[Any], int | None]:
+        """
+        Get from database the requested page and the count of rows that fit the query,
+        using the configured `count_strategy`
+
+        :param query:
+        :return: Tuple with the page and the count, `None` if `count_strategy` is `NONE`
+        """
+        match self.count_strategy:
+            case CountStrategyEnum.EXACT:
+                return await self.get_page_with_exact_count(query)
+            case CountStrategyEnum.ESTIMATED:
+                return await self.get_page(query), await self.get_estimated_count(query)
+            case CountStrategyEnum.CACHED:
+                return await self.get_page(query), await self.get_cached_count(query)
+        return await self.get_page(query), None
+
+    async def get_page_with_exact_count(self, query) -> tuple[list[Any], int]:
+        """
+        Get from database the requested page and the count of rows that fit the query
+        in one round trip, using a `count(*) OVER ()` window
+
+        :param query:
+        :return:
+        """
+        queryset = await db_session.execute(
+            query.add_columns(func.count().over().label("total_count"))
+            .offset(self.offset)
+            .limit(self.limit)
+        )
+        rows = queryset.all()
+        if not rows:
+            # Window is empty when offset is out of range, count must be queried apart
+            count = await self.get_count(query) if self.offset else 0
+            self.has_next = False
+            return [], count
+        count = rows[0].total_count
+        self.has_next = self.offset + self.limit < count
+        return self.get_results(query, rows), count
+
+    def serialize(
+        self, url: URL, results: list[T], count: int | None
+    ) -> PaginatedResponse:
         """
         Get serialized page of results.
 
@@ -100,3 +229,179 @@ class GenericPagination:
             results=results,
         )
         return paginated_response
+
+
+class CursorPagination(GenericPagination):
+    """
+    Keyset pagination. Instead of using `OFFSET`, pages are sought using the values of the
+    sorting columns of the first/last returned row, so deep pages are as fast as the first one.
+
+    Sorting columns must be unique together and should be indexed.
+    """
+
+    def __init__(
+        self,
+        limit: int | None,
+        cursor: str | None,
+        key_columns: Sequence[InstrumentedAttribute],
+        default_page_size: int = 10,
+        max_page_size: int = 100,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ):
+        super().__init__(
+            limit,
+            0,
+            default_page_size=default_page_size,
+            max_page_size=max_page_size,
+            count_strategy=count_strategy,
+        )
+        self.key_columns = key_columns
+        self.reverse = False
+        self.cursor_values: tuple | None = None
+        if cursor:
+            self.reverse, self.cursor_values = self.decode_cursor(cursor)
+        self.has_previous = False
+        self.first_values: tuple | None = None
+        self.last_values: tuple | None = None
+
+    def encode_cursor(self, reverse: bool, values: tuple) -> str:
+        """
+        :param reverse: `True` to get the rows before `values`, `False` to get the rows after them
+        :param values: Values for the `key_columns`
+        :return: Opaque cursor
+        """
+        payload = [
+            reverse,
+            [
+                "0x" + value.hex() if isinstance(value, bytes) else value
+                for value in values
+            ],
+        ]
+        return (
+            base64.urlsafe_b64encode(
+                json.dumps(payload, separators=(",", ":")).encode()
+            )
+            .decode()
+            .rstrip("=")
+        )
+
+    def decode_cursor(self, cursor: str) -> tuple[bool, tuple]:
+        """
+        :param cursor: Cursor generated by `encode_cursor`
+        :return: Tuple with reverse flag and the values for the `key_columns`
+        :raises HTTPException: If cursor is not valid
+        """
+        try:
+            reverse, values = json.loads(
+                base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            )
+            if not isinstance(reverse, bool) or len(values) != len(self.key_columns):
+                raise ValueError("Invalid cursor")
+            return reverse, tuple(
+                (
+                    bytes(HexBytes(value))
+                    if column.type.python_type is bytes
+                    else column.type.python_type(value)
+                )
+                for column, value in zip(self.key_columns, values, strict=True)
+            )
+        except (ValueError, TypeError, binascii.Error) as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    def _get_row_values(self, row: Any) -> tuple:
+        return tuple(getattr(row, column.key) for column in self.key_columns)
+
+    def get_next_page(self, url: URL, count: int | None) -> str | None:
+        """
+        :param url:
+        :param count:
+        :return: Url for the rows after the current page, `None` if there are no more rows
+        """
+        if self.has_next and self.last_values is not None:
+            return str(
+                url.remove_query_params("offset").include_query_params(
+                    limit=self.limit,
+                    cursor=self.encode_cursor(False, self.last_values),
+                )
+            )
+        return None
+
+    def get_previous_page(self, url: URL) -> str | None:
+        """
+        :param url:
+        :return: Url for the rows before the current page, `None` if there are no previous rows
+        """
+        if self.has_previous and self.first_values is not None:
+            return str(
+                url.remove_query_params("offset").include_query_params(
+                    limit=self.limit,
+                    cursor=self.encode_cursor(True, self.first_values),
+                )
+            )
+        return None
+
+    async def get_page(self, query) -> list[Any]:
+        """
+        Get from database the requested page, seeking from the cursor values
+
+        :param query:
+        :return:
+        """
+        key = tuple_(*self.key_columns)
+        if self.cursor_values is not None:
+            cursor_key = tuple_(*self.cursor_values)
+            query = query.where(key < cursor_key if self.reverse else key > cursor_key)
+        query = query.order_by(None).order_by(
+            *(
+                column.desc() if self.reverse else column.asc()
+                for column in self.key_columns
+            )
+        )
+        # Get an extra row to know if there are more rows after the page
+        queryset = await db_session.execute(query.limit(self.limit + 1))
+        results = self.get_results(query, queryset.all())
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+        if self.reverse:
+            results.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor_values is not None
+        if results:
+            self.first_values = self._get_row_values(results[0])
+            self.last_values = self._get_row_values(results[-1])
+        return results
+
+    async def get_page_with_exact_count(self, query) -> tuple[list[Any], int]:
+        """
+        Cursor filter is applied to the page query, so the count cannot be taken from it
+
+        :param query:
+        :return:
+        """
+        return await self.get_page(query), await self.get_count(query)
+
+
+def get_pagination(
+    pagination_params: PaginationQueryParams,
+    key_columns: Sequence[InstrumentedAttribute],
+) -> GenericPagination:
+    """
+    :param pagination_params:
+    :param key_columns: Columns used for cursor pagination
+    :return: `CursorPagination` if `cursor` is provided, `GenericPagination` otherwise
+    """
+    if pagination_params.cursor is not None:
+        return CursorPagination(
+            pagination_params.limit,
+            pagination_params.cursor,
+            key_columns,
+            count_strategy=pagination_params.count,
+        )
+    return GenericPagination(
+        pagination_params.limit,
+        pagination_params.offset,
+        count_strategy=pagination_params.count,
+    )
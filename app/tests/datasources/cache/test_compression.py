@@ -0,0 +1,48 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import json
+import unittest
+from unittest import mock
+
+from app.config import settings
+from app.datasources.cache.compression import (
+    compress,
+    decompress,
+    get_content_encoding,
+)
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.value = json.dumps([{"name": "transfer"}] * 200).encode()
+
+    def test_compress_gzip(self):
+        with mock.patch.object(settings, "CACHE_RESPONSE_COMPRESSION", "gzip"):
+            compressed = compress(self.value)
+        self.assertLess(len(compressed), len(self.value))
+        self.assertEqual(get_content_encoding(compressed), "gzip")
+        self.assertEqual(decompress(compressed), self.value)
+
+        # Small values are not compressed
+        small_value = b'{"count":0}'
+        self.assertEqual(compress(small_value), small_value)
+        self.assertIsNone(get_content_encoding(small_value))
+        self.assertEqual(decompress(small_value), small_value)
+
+    def test_compress_none(self):
+        with mock.patch.object(settings, "CACHE_RESPONSE_COMPRESSION", "none"):
+            self.assertEqual(compress(self.value), self.value)
+        # Values compressed with a previous configuration can still be read
+        with mock.patch.object(settings, "CACHE_RESPONSE_COMPRESSION", "gzip"):
+            compressed = compress(self.value)
+        with mock.patch.object(settings, "CACHE_RESPONSE_COMPRESSION", "none"):
+            self.assertEqual(decompress(compressed), self.value)
+
+    def test_compress_zstd(self):
+        with mock.patch.object(settings, "CACHE_RESPONSE_COMPRESSION", "zstd"):
+            compressed = compress(self.value)
+        self.assertLess(len(compressed), len(self.value))
+        self.assertEqual(get_content_encoding(compressed), "zstd")
+        self.assertEqual(decompress(compressed), self.value)
+        # Values compressed with `zstd` can be read with other configurations
+        with mock.patch.object(settings, "CACHE_RESPONSE_COMPRESSION", "gzip"):
+            self.assertEqual(decompress(compressed), self.value)
@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.datasources.cache.redis import (
+    cache_response,
+    clear_local_response_cache,
+    get_redis,
+)
+from app.datasources.db.database import (
+    _get_database_session_context,
+    with_db_session_context,
+)
+
+HASH_KEY = "test_cache_response"
+
+
+class ResponseModel(BaseModel):
+    value: int
+
+
+class TestCacheResponse(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await get_redis().flushdb()
+        clear_local_response_cache()
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+        @cache_response(lambda **kwargs: HASH_KEY, ResponseModel)
+        async def endpoint(value: int) -> ResponseModel:
+            self.calls += 1
+            await self.release.wait()
+            return ResponseModel(value=value + self.calls)
+
+        self.endpoint = endpoint
+
+    async def call_endpoint(self, value: int) -> dict:
+        response = await self.endpoint(value=value)
+        self.assertEqual(response.media_type, "application/json")
+        return json.loads(response.body)
+
+    async def test_cache_response(self):
+        self.assertEqual(await self.call_endpoint(value=1), {"value": 2})
+        self.assertEqual(await self.call_endpoint(value=1), {"value": 2})
+        self.assertEqual(self.calls, 1)
+        # Different params are cached on a different field of the same hash
+        self.assertEqual(await self.call_endpoint(value=10), {"value": 12})
+        redis = get_redis()
+        self.assertEqual(await redis.hlen(HASH_KEY), 2)  # type: ignore[misc]
+        ttl = await redis.ttl(HASH_KEY)
+        self.assertGreater(ttl, 0)
+        self.assertLessEqual(ttl, 60)
+
+        # Value is served from the in-process cache
+        await redis.unlink(HASH_KEY)
+        self.assertEqual(await self.call_endpoint(value=1), {"value": 2})
+        self.assertEqual(self.calls, 2)
+
+        # And from Redis if it's not in the in-process cache
+        await self.call_endpoint(value=5)
+        clear_local_response_cache(HASH_KEY)
+        self.assertEqual(await self.call_endpoint(value=5), {"value": 8})
+        self.assertEqual(self.calls, 3)
+
+    async def test_cache_response_single_flight(self):
+        self.release.clear()
+        tasks = [asyncio.create_task(self.call_endpoint(value=1)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        self.release.set()
+        self.assertEqual(await asyncio.gather(*tasks), [{"value": 2}] * 5)
+        self.assertEqual(self.calls, 1)
+
+    async def test_cache_response_load_db_session(self):
+        session_ids = []
+        release = asyncio.Event()
+
+        @cache_response(lambda **kwargs: HASH_KEY, ResponseModel)
+        async def endpoint(value: int) -> ResponseModel:
+            session_ids.append(_get_database_session_context())
+            await release.wait()
+            return ResponseModel(value=value)
+
+        async def request(value: int):
+            async with with_db_session_context("request"):
+                return await endpoint(value=value)
+
+        first = asyncio.create_task(request(1))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(request(1))
+        await asyncio.sleep(0.01)
+        # Request starting the load is cancelled and its database session removed,
+        # load shared with the other request is not affected
+        first.cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+        response = await second
+        self.assertEqual(json.loads(response.body), {"value": 1})
+        self.assertEqual(len(session_ids), 1)
+        self.assertNotEqual(session_ids[0], "request")
+
+    async def test_cache_response_stale_while_revalidate(self):
+        with mock.patch.object(settings, "CACHE_RESPONSE_LOCAL_TTL", 0.01):
+            self.assertEqual(await self.call_endpoint(value=1), {"value": 2})
+            await get_redis().unlink(HASH_KEY)
+            await asyncio.sleep(0.02)
+
+            # Stale value is returned while it's refreshed in background
+            self.assertEqual(await self.call_endpoint(value=1), {"value": 2})
+            for _ in range(100):
+                if self.calls == 2:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(self.calls, 2)
+            await asyncio.sleep(0.01)
+            self.assertEqual(await self.call_endpoint(value=1), {"value": 3})
+
+        # Without in-process cache every call goes to Redis
+        with mock.patch.object(settings, "CACHE_RESPONSE_LOCAL_TTL", 0):
+            clear_local_response_cache()
+            await get_redis().unlink(HASH_KEY)
+            self.assertEqual(await self.call_endpoint(value=1), {"value": 4})
+            await get_redis().unlink(HASH_KEY)
+            self.assertEqual(await self.call_endpoint(value=1), {"value": 5})
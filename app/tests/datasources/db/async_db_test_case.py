@@ -1,7 +1,9 @@
 import unittest
 
+from sqlalchemy import text
 from sqlmodel import SQLModel
 
+from app.datasources.cache.redis import clear_local_response_cache, get_redis
 from app.datasources.db.database import get_engine
 
 
@@ -12,3 +14,13 @@ class AsyncDbTestCase(unittest.IsolatedAsyncioTestCase):
         async with self.engine.begin() as conn:
             await conn.run_sync(SQLModel.metadata.drop_all)
             await conn.run_sync(SQLModel.metadata.create_all)
+        # Remove cached data from previous tests
+        await get_redis().flushdb()
+        clear_local_response_cache()
+
+    async def create_pg_trgm_extension(self):
+        """
+        `pg_trgm` is created by the migrations, needed for contracts search
+        """
+        async with self.engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
@@ -96,6 +96,72 @@ class TestModels(AsyncDbTestCase):
         # Check address not matching
         self.assertIsNone(await contract.get_abi_by_contract_address(b"b", None))
 
+    @db_session_context
+    async def test_contract_get_abi_and_implementation_by_contract_address(self):
+        abi_json = {"name": "A Test Project with relevance 10"}
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi = Abi(abi_json=abi_json, relevance=10, source_id=source.id)
+        await abi.create()
+        await Contract(
+            address=b"a", name="Proxy", chain_id=5, abi=abi, implementation=b"b"
+        ).create()
+        await Contract(address=b"a", name="No proxy", chain_id=10, abi=abi).create()
+        await Contract(address=b"c", name="Without ABI", chain_id=1).create()
+
+        self.assertEqual(
+            await Contract.get_abi_and_implementation_by_contract_address(b"a", 5),
+            (abi_json, b"b", 5),
+        )
+        self.assertEqual(
+            await Contract.get_abi_and_implementation_by_contract_address(b"a", 10),
+            (abi_json, None, 10),
+        )
+        # Ignoring chain_id, lowest one is returned
+        self.assertEqual(
+            await Contract.get_abi_and_implementation_by_contract_address(b"a", None),
+            (abi_json, b"b", 5),
+        )
+        self.assertIsNone(
+            await Contract.get_abi_and_implementation_by_contract_address(b"a", 1)
+        )
+        self.assertIsNone(
+            await Contract.get_abi_and_implementation_by_contract_address(b"c", None)
+        )
+
+    @db_session_context
+    async def test_contract_get_contracts_by_address_and_chain_id(self):
+        await Contract(address=b"a", name="A", chain_id=1).create()
+        await Contract(address=b"a", name="A", chain_id=5).create()
+        await Contract(address=b"b", name="B", chain_id=5).create()
+        await Contract(address=b"b", name="B", chain_id=1).create()
+
+        self.assertEqual(await Contract.get_contracts_by_address_and_chain_id([]), [])
+        contracts = await Contract.get_contracts_by_address_and_chain_id(
+            [(b"a", 1), (b"b", 5), (b"c", 1)]
+        )
+        self.assertEqual(
+            sorted((contract.address, contract.chain_id) for contract in contracts),
+            [(b"a", 1), (b"b", 5)],
+        )
+
+    @db_session_context
+    async def test_contract_stream_contracts(self):
+        for address in (b"c", b"a", b"b"):
+            await Contract(address=address, name="A", chain_id=1).create()
+        await Contract(address=b"a", name="A", chain_id=5).create()
+
+        batches = [
+            [(row.address, row.chain_id) for row in rows]
+            async for rows in Contract.stream_contracts(batch_size=2)
+        ]
+        self.assertEqual(batches, [[(b"a", 1), (b"a", 5)], [(b"b", 1), (b"c", 1)]])
+        addresses = [
+            [row.address for row in rows]
+            async for rows in Contract.stream_contracts(chain_ids=[5])
+        ]
+        self.assertEqual(addresses, [[b"a"]])
+
     @db_session_context
     async def test_project(self):
         project = Project(
@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+from fastapi.testclient import TestClient
+
+from ...datasources.db.database import db_session_context
+from ...datasources.db.models import Abi, AbiSource
+from ...main import app
+from ..datasources.db.async_db_test_case import AsyncDbTestCase
+from ..mocks.abi_mock import mock_abi_json
+
+
+class TestRouterAbis(AsyncDbTestCase):
+    client: TestClient
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    @db_session_context
+    async def test_view_abi(self):
+        source = AbiSource(name="Etherscan", url="https://api.etherscan.io/api")
+        await source.create()
+        abi = Abi(abi_json=mock_abi_json, source_id=source.id)
+        await abi.create()
+        assert abi.abi_hash is not None
+        abi_hash = "0x" + abi.abi_hash.hex()
+
+        response = self.client.get(f"/api/v1/abis/{abi_hash}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"abiHash": abi_hash, "abiJson": mock_abi_json}
+        )
+        self.assertEqual(
+            response.headers["cache-control"], "public, max-age=31536000, immutable"
+        )
+        etag = response.headers["etag"]
+        self.assertEqual(etag, f'"{abi.abi_hash.hex()}"')
+
+        response = self.client.get(
+            f"/api/v1/abis/{abi_hash}", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], etag)
+        self.assertEqual(response.content, b"")
+        response = self.client.get(
+            f"/api/v1/abis/{abi_hash}", headers={"If-None-Match": '"other", W/' + etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            f"/api/v1/abis/{abi_hash}", headers={"If-None-Match": '"other"'}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(f"/api/v1/abis/0x{'0' * 64}")
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get("/api/v1/abis/0x1234")
+        self.assertEqual(response.status_code, 422)
@@ -3,7 +3,9 @@ import unittest
 from fastapi.testclient import TestClient
 
 from ... import VERSION
+from ...config import settings
 from ...main import app
+from ...services.data_decoder import get_data_decoder_service
 
 
 class TestRouterAbout(unittest.TestCase):
@@ -17,3 +19,21 @@ class TestRouterAbout(unittest.TestCase):
         response = self.client.get("/api/v1/about")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"version": VERSION})
+
+    def test_view_about_data_decoder_cache(self):
+        get_data_decoder_service.cache_clear()
+        response = self.client.get("/api/v1/about/data-decoder-cache")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+                "entries": 0,
+                "sizeBytes": 0,
+                "maxEntries": settings.DATA_DECODER_CONTRACT_LOCAL_CACHE_MAX_ENTRIES,
+                "maxSizeBytes": settings.DATA_DECODER_CONTRACT_LOCAL_CACHE_MAX_BYTES,
+            },
+        )
+        get_data_decoder_service.cache_clear()
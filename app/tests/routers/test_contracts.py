@@ -1,12 +1,24 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
+import json
+from unittest import mock
+
+import msgpack
 from fastapi.testclient import TestClient
 from hexbytes import HexBytes
+from safe_eth.eth.utils import fast_to_checksum_address
 
 from ...config import settings
-from ...datasources.cache.redis import del_contract_cache
+from ...datasources.cache.redis import (
+    clear_local_response_cache,
+    del_contract_cache,
+    get_key_for_contract,
+    get_redis,
+    split_etag,
+)
 from ...datasources.db.database import db_session_context
 from ...datasources.db.models import Abi, AbiSource, Contract
 from ...main import app
+from ...services.contract import ContractService, render_contracts_default_page
 from ...utils import datetime_to_str
 from ..datasources.db.async_db_test_case import AsyncDbTestCase
 from ..datasources.db.factory import contract_factory
@@ -43,6 +55,17 @@ class TestRouterContract(AsyncDbTestCase):
         self.assertEqual(response.status_code, 200)
         response_json = response.json()
         self.assertEqual(response_json["count"], 0)
+        # Cached response is returned as stored
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertEqual(
+            [(response.headers["etag"], response.content)],
+            [
+                split_etag(value)
+                for value in await get_redis().hvals(  # type: ignore[misc]
+                    get_key_for_contract(address_expected)
+                )
+            ],
+        )
 
         # Invalidate cache
         await del_contract_cache(address_expected)
@@ -91,6 +114,35 @@ class TestRouterContract(AsyncDbTestCase):
             results[0]["logoUrl"],
             f"{settings.CONTRACT_LOGO_BASE_URL}/{address_expected}.png",
         )
+        # Cached response with ABI is big enough to be stored compressed, it's returned
+        # as it is to clients accepting the encoding and decompressed for the rest
+        response = self.client.get(
+            f"/api/v1/contracts/{address_expected}",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept, Accept-Encoding")
+        self.assertEqual(response.json(), response_json)
+        response = self.client.get(
+            f"/api/v1/contracts/{address_expected}",
+            headers={"Accept-Encoding": "gzip;q=0, identity"},
+        )
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(response.json(), response_json)
+        with mock.patch.object(settings, "CACHE_RESPONSE_COMPRESSION", "zstd"):
+            await del_contract_cache(address_expected)
+            response = self.client.get(
+                f"/api/v1/contracts/{address_expected}",
+                headers={"Accept-Encoding": "zstd"},
+            )
+            self.assertEqual(response.headers["content-encoding"], "zstd")
+            self.assertEqual(response.json(), response_json)
+            response = self.client.get(
+                f"/api/v1/contracts/{address_expected}",
+                headers={"Accept-Encoding": "gzip"},
+            )
+            self.assertNotIn("content-encoding", response.headers)
+            self.assertEqual(response.json(), response_json)
         # Test filter by chain_id
         contract = Contract(
             address=address, name="A Test Contracts", chain_id=5, abi=abi
@@ -172,6 +224,565 @@ class TestRouterContract(AsyncDbTestCase):
         )
         self.assertEqual(len(results), 5)
 
+    @db_session_context
+    async def test_contracts_default_page_prerendered(self):
+        address = "0x6eEF70Da339a98102a642969B3956DEa71A1096e"
+        default_page_key = f"contract_default_page:{address.lower()}"
+        redis = get_redis()
+        await contract_factory(address=address, chain_id=1)
+
+        response = self.client.get(f"/api/v1/contracts/{address}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(
+            split_etag(await redis.get(default_page_key)),
+            (response.headers["etag"], response.content),
+        )
+        # Only the worker, which invalidates it when the contract changes, stores it for long
+        ttl = await redis.ttl(default_page_key)
+        self.assertGreater(ttl, 0)
+        self.assertLessEqual(ttl, 60)
+
+        # Pre-rendered page is used even if the rest of the cache expired
+        await redis.unlink(get_key_for_contract(address))
+        clear_local_response_cache()
+        await contract_factory(address=address, chain_id=5)
+        response = self.client.get(f"/api/v1/contracts/{address}")
+        self.assertEqual(response.json()["count"], 1)
+        # But not for other pages
+        response = self.client.get(f"/api/v1/contracts/{address}?limit=5")
+        self.assertEqual(response.json()["count"], 2)
+
+        # Pages with more results are not pre-rendered, as `next` url depends on the request
+        await del_contract_cache(address)
+        for chain_id in range(10, 20):
+            await contract_factory(address=address, chain_id=chain_id)
+        response = self.client.get(f"/api/v1/contracts/{address}")
+        self.assertEqual(response.json()["count"], 12)
+        self.assertIsNone(await redis.get(default_page_key))
+        self.assertIsNone(await render_contracts_default_page(address))
+        self.assertIsNotNone(
+            await render_contracts_default_page(
+                "0xD1a2a63a9766673940B4D2d7cB16259876Aca8a2"
+            )
+        )
+
+    @db_session_context
+    async def test_contracts_abi_hash_only(self):
+        source = AbiSource(name="Etherscan", url="https://api.etherscan.io/api")
+        await source.create()
+        abi = Abi(abi_json=mock_abi_json, source_id=source.id)
+        await abi.create()
+        assert abi.abi_hash is not None
+        address = "0x6eEF70Da339a98102a642969B3956DEa71A1096e"
+        await Contract(address=HexBytes(address), chain_id=1, abi=abi).create()
+
+        for url in (
+            f"/api/v1/contracts/{address}",
+            "/api/v1/contracts?chain_ids=1",
+        ):
+            response = self.client.get(url)
+            self.assertEqual(
+                response.json()["results"][0]["abi"]["abiJson"], mock_abi_json
+            )
+            response = self.client.get(url, params={"abi_hash_only": True})
+            self.assertEqual(response.status_code, 200)
+            result_abi = response.json()["results"][0]["abi"]
+            self.assertIsNone(result_abi["abiJson"])
+            self.assertEqual(result_abi["abiHash"], "0x" + abi.abi_hash.hex())
+
+    @db_session_context
+    async def test_contracts_fields(self):
+        source = AbiSource(name="Etherscan", url="https://api.etherscan.io/api")
+        await source.create()
+        abi = Abi(abi_json=mock_abi_json, source_id=source.id)
+        await abi.create()
+        assert abi.abi_hash is not None
+        address = "0x6eEF70Da339a98102a642969B3956DEa71A1096e"
+        await Contract(
+            address=HexBytes(address), name="Test", chain_id=1, abi=abi
+        ).create()
+
+        for url in (f"/api/v1/contracts/{address}", "/api/v1/contracts"):
+            response = self.client.get(url, params={"fields": "name,chainId,logoUrl"})
+            self.assertEqual(response.status_code, 200)
+            response_json = response.json()
+            self.assertEqual(response_json["count"], 1)
+            self.assertEqual(
+                response_json["results"],
+                [
+                    {
+                        "name": "Test",
+                        "chainId": 1,
+                        "logoUrl": f"{settings.CONTRACT_LOGO_BASE_URL}/{address}.png",
+                    }
+                ],
+            )
+
+            response = self.client.get(
+                url, params={"fields": "address,abi", "abi_hash_only": True}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.json()["results"],
+                [
+                    {
+                        "address": address,
+                        "abi": {
+                            "abiHash": "0x" + abi.abi_hash.hex(),
+                            "abiJson": None,
+                            "modified": datetime_to_str(abi.modified),
+                        },
+                    }
+                ],
+            )
+
+            response = self.client.get(url, params={"fields": "name,invalid,other"})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(
+                response.json(), {"detail": "Invalid fields: invalid, other"}
+            )
+
+        # Requesting every field returns the same as not requesting any
+        response = self.client.get("/api/v1/contracts")
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        response = self.client.get(
+            "/api/v1/contracts", params={"fields": ",".join(results[0])}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], results)
+
+        # Cached responses keep the requested fields
+        response = self.client.get(
+            f"/api/v1/contracts/{address}", params={"fields": "chainId"}
+        )
+        self.assertEqual(response.json()["results"], [{"chainId": 1}])
+
+    @db_session_context
+    async def test_contracts_etag(self):
+        address = "0x6eEF70Da339a98102a642969B3956DEa71A1096e"
+        contract = await contract_factory(address=address, chain_id=1)
+
+        for url in (f"/api/v1/contracts/{address}", "/api/v1/contracts"):
+            for params in ({}, {"fields": "address,name"}):
+                response = self.client.get(url, params=params)
+                self.assertEqual(response.status_code, 200)
+                etag = response.headers["etag"]
+                self.assertTrue(etag.startswith('W/"'))
+
+                response = self.client.get(
+                    url, params=params, headers={"If-None-Match": etag}
+                )
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.headers["etag"], etag)
+                self.assertEqual(response.content, b"")
+
+                response = self.client.get(
+                    url, params=params, headers={"If-None-Match": '"other"'}
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.headers["etag"], etag)
+
+        # Cached ETag is used without querying the database
+        response = self.client.get(f"/api/v1/contracts/{address}")
+        etag = response.headers["etag"]
+        with mock.patch.object(
+            ContractService, "get_contracts", side_effect=AssertionError
+        ):
+            response = self.client.get(
+                f"/api/v1/contracts/{address}", headers={"If-None-Match": etag}
+            )
+        self.assertEqual(response.status_code, 304)
+
+        # ETag changes when contracts are modified
+        contract.name = "Modified"
+        await contract.update()
+        await del_contract_cache(address)
+        response = self.client.get(
+            f"/api/v1/contracts/{address}", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+
+    @db_session_context
+    async def test_contracts_msgpack(self):
+        await self.create_pg_trgm_extension()
+        source = AbiSource(name="Etherscan", url="https://api.etherscan.io/api")
+        await source.create()
+        abi = Abi(abi_json=mock_abi_json, source_id=source.id)
+        await abi.create()
+        contract = await contract_factory(chain_id=1, name="Msgpack Contract")
+        contract.abi_id = abi.id
+        await contract.update()
+        address = fast_to_checksum_address(contract.address)
+        msgpack_headers = {"Accept": "application/msgpack"}
+
+        for url, params in (
+            (f"/api/v1/contracts/{address}", {}),
+            (f"/api/v1/contracts/{address}", {"fields": "address,abi"}),
+            ("/api/v1/contracts", {}),
+            ("/api/v1/contracts", {"fields": "address,name"}),
+            ("/api/v1/contracts/search", {"q": "Msgpack"}),
+            ("/api/v1/contracts/changes", {}),
+        ):
+            json_response = self.client.get(url, params=params)
+            self.assertEqual(json_response.status_code, 200)
+            self.assertEqual(json_response.headers["content-type"], "application/json")
+            response = self.client.get(url, params=params, headers=msgpack_headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers["content-type"], "application/msgpack")
+            self.assertIn("Accept", response.headers["vary"])
+            self.assertEqual(msgpack.unpackb(response.content), json_response.json())
+            if "etag" in json_response.headers:
+                # Every format has its own ETag
+                self.assertNotEqual(
+                    response.headers["etag"], json_response.headers["etag"]
+                )
+                response = self.client.get(
+                    url,
+                    params=params,
+                    headers={
+                        **msgpack_headers,
+                        "If-None-Match": response.headers["etag"],
+                    },
+                )
+                self.assertEqual(response.status_code, 304)
+
+        # Every format is cached on its own, and served from the cache
+        cached_values = await get_redis().hvals(  # type: ignore[misc]
+            get_key_for_contract(address)
+        )
+        self.assertEqual(len(cached_values), 4)
+        with mock.patch.object(
+            ContractService, "get_contracts", side_effect=AssertionError
+        ):
+            response = self.client.get(
+                f"/api/v1/contracts/{address}", headers=msgpack_headers
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(msgpack.unpackb(response.content)["count"], 1)
+
+        # JSON is preferred if requested with a higher quality
+        response = self.client.get(
+            f"/api/v1/contracts/{address}",
+            headers={"Accept": "application/json, application/msgpack;q=0.5"},
+        )
+        self.assertEqual(response.headers["content-type"], "application/json")
+
+        payload = {"contracts": [{"address": address, "chainId": 1}]}
+        json_response = self.client.post("/api/v1/contracts/batch", json=payload)
+        response = self.client.post(
+            "/api/v1/contracts/batch", json=payload, headers=msgpack_headers
+        )
+        self.assertEqual(response.headers["content-type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), json_response.json())
+
+    @db_session_context
+    async def test_contracts_cursor_pagination(self):
+        addresses = [
+            "0x0000000000000000000000000000000000000001",
+            "0x0000000000000000000000000000000000000002",
+            "0x0000000000000000000000000000000000000003",
+        ]
+        for address in addresses:
+            for chain_id in (1, 5):
+                await contract_factory(address=address, chain_id=chain_id)
+        expected = [(address, chain_id) for address in addresses for chain_id in (1, 5)]
+
+        def get_results(response_json: dict) -> list[tuple[str, int]]:
+            return [
+                (result["address"], result["chainId"])
+                for result in response_json["results"]
+            ]
+
+        response = self.client.get("/api/v1/contracts?limit=4&cursor=")
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(response_json["count"], 6)
+        self.assertIsNone(response_json["previous"])
+        self.assertEqual(get_results(response_json), expected[:4])
+        self.assertNotIn("offset", response_json["next"])
+
+        response = self.client.get(response_json["next"])
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(get_results(response_json), expected[4:])
+        self.assertIsNone(response_json["next"])
+
+        # Going back returns the previous rows
+        response = self.client.get(response_json["previous"])
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(get_results(response_json), expected[:4])
+        self.assertIsNone(response_json["previous"])
+        self.assertIsNotNone(response_json["next"])
+
+        # Filters are kept
+        response = self.client.get("/api/v1/contracts?limit=2&cursor=&chain_ids=5")
+        response_json = response.json()
+        self.assertEqual(get_results(response_json), expected[1::2][:2])
+        response = self.client.get(response_json["next"])
+        response_json = response.json()
+        self.assertEqual(get_results(response_json), expected[1::2][2:])
+
+        # Contracts for an address
+        response = self.client.get(f"/api/v1/contracts/{addresses[1]}?limit=1&cursor=")
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(get_results(response_json), [(addresses[1], 1)])
+        response = self.client.get(response_json["next"])
+        response_json = response.json()
+        self.assertEqual(get_results(response_json), [(addresses[1], 5)])
+        self.assertIsNone(response_json["next"])
+
+        response = self.client.get("/api/v1/contracts?cursor=invalid")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
+    @db_session_context
+    async def test_contracts_count_strategies(self):
+        for chain_id in range(0, 3):
+            await contract_factory(chain_id=chain_id)
+
+        response = self.client.get("/api/v1/contracts?limit=2&count=none")
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertIsNone(response_json["count"])
+        self.assertEqual(len(response_json["results"]), 2)
+        self.assertEqual(
+            response_json["next"],
+            "http://testserver/api/v1/contracts?count=none&limit=2&offset=2",
+        )
+        response = self.client.get(response_json["next"])
+        response_json = response.json()
+        self.assertEqual(len(response_json["results"]), 1)
+        self.assertIsNone(response_json["next"])
+
+        response = self.client.get("/api/v1/contracts?count=estimated")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json()["count"], int)
+
+        response = self.client.get("/api/v1/contracts?count=cached")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 3)
+
+        # Offset out of range still returns the exact count
+        response = self.client.get("/api/v1/contracts?offset=10")
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(response_json["count"], 3)
+        self.assertEqual(response_json["results"], [])
+        self.assertIsNone(response_json["next"])
+
+        response = self.client.get("/api/v1/contracts?count=invalid")
+        self.assertEqual(response.status_code, 422)
+
+    @db_session_context
+    async def test_contracts_batch(self):
+        contract_1 = await contract_factory(chain_id=1)
+        contract_2 = await contract_factory(chain_id=5)
+        address_1 = fast_to_checksum_address(contract_1.address)
+        address_2 = fast_to_checksum_address(contract_2.address)
+        missing_address = "0x5aFE3855358E112B5647B952709E6165e1c1eEEe"
+        payload = {
+            "contracts": [
+                {"address": address_2, "chainId": 5},
+                {"address": missing_address, "chainId": 1},
+                {"address": address_1, "chainId": 1},
+                {"address": address_1, "chainId": 5},
+                {"address": address_2, "chainId": 5},
+            ]
+        }
+        response = self.client.post("/api/v1/contracts/batch", json=payload)
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(
+            [(result["address"], result["chainId"]) for result in response_json],
+            [(address_2, 5), (address_1, 1)],
+        )
+        self.assertEqual(response_json[1]["name"], contract_1.name)
+        self.assertFalse(response_json[1]["trustedForDelegateCall"])
+        self.assertEqual(
+            response_json[1]["logoUrl"],
+            f"{settings.CONTRACT_LOGO_BASE_URL}/{address_1}.png",
+        )
+        self.assertNotIn("abi", response_json[1])
+
+        # Metadata is cached, even for contracts not found
+        contract_1.name = "Updated name"
+        await contract_1.update()
+        await contract_factory(address=missing_address, chain_id=1)
+        response = self.client.post("/api/v1/contracts/batch", json=payload)
+        self.assertEqual(response.json(), response_json)
+
+        # Cache is invalidated together with the rest of contract cache
+        await del_contract_cache(address_1)
+        await del_contract_cache(missing_address)
+        response = self.client.post("/api/v1/contracts/batch", json=payload)
+        response_json = response.json()
+        self.assertEqual(len(response_json), 3)
+        self.assertEqual(response_json[1]["address"], missing_address)
+        self.assertEqual(response_json[2]["name"], "Updated name")
+
+        response = self.client.post(
+            "/api/v1/contracts/batch",
+            json={"contracts": [{"address": address_1.lower(), "chainId": 1}]},
+        )
+        self.assertEqual(response.status_code, 422)
+        response = self.client.post("/api/v1/contracts/batch", json={"contracts": []})
+        self.assertEqual(response.status_code, 422)
+        response = self.client.post(
+            "/api/v1/contracts/batch",
+            json={
+                "contracts": [{"address": address_1, "chainId": 1}]
+                * (settings.CONTRACTS_BATCH_MAX_SIZE + 1)
+            },
+        )
+        self.assertEqual(response.status_code, 422)
+
+    @db_session_context
+    async def test_contracts_export(self):
+        response = self.client.get("/api/v1/contracts/export")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        self.assertEqual(response.content, b"")
+
+        contracts = [await contract_factory(chain_id=1) for _ in range(5)]
+        await contract_factory(chain_id=5)
+        contracts.sort(key=lambda contract: contract.address)
+
+        with mock.patch.object(settings, "CONTRACTS_EXPORT_BATCH_SIZE", 2):
+            response = self.client.get(
+                "/api/v1/contracts/export", params={"chain_ids": 1}
+            )
+        self.assertEqual(response.status_code, 200)
+        lines = response.text.splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(
+            [json.loads(line)["address"] for line in lines],
+            [fast_to_checksum_address(contract.address) for contract in contracts],
+        )
+        # Same format as the paginated endpoint
+        response = self.client.get("/api/v1/contracts", params={"chain_ids": 1})
+        self.assertEqual(
+            [json.loads(line) for line in lines], response.json()["results"]
+        )
+
+        response = self.client.get(
+            "/api/v1/contracts/export", params={"fields": "address,chainId"}
+        )
+        self.assertEqual(len(response.text.splitlines()), 6)
+        self.assertEqual(
+            set(json.loads(response.text.splitlines()[0])), {"address", "chainId"}
+        )
+
+        response = self.client.get(
+            "/api/v1/contracts/export", params={"fields": "invalid"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @db_session_context
+    async def test_contracts_search(self):
+        await self.create_pg_trgm_extension()
+        url = "/api/v1/contracts/search"
+        await contract_factory(name="Other Safe", display_name="Other Safe", chain_id=1)
+        await contract_factory(name="SafeProxy", display_name="Safe Proxy", chain_id=1)
+        await contract_factory(
+            name="MultiSend", display_name="Safe: MultiSend", chain_id=5
+        )
+        await contract_factory(name="Unrelated", display_name="Token 100%", chain_id=1)
+
+        response = self.client.get(url, params={"q": "safe"})
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(response_json["count"], 3)
+        # Prefix matches first
+        self.assertEqual(
+            [result["name"] for result in response_json["results"]],
+            ["SafeProxy", "MultiSend", "Other Safe"],
+        )
+
+        response = self.client.get(url, params={"q": "safe", "chain_ids": 5})
+        self.assertEqual(
+            [result["name"] for result in response.json()["results"]], ["MultiSend"]
+        )
+        response = self.client.get(
+            url, params={"q": "safe", "limit": 1, "fields": "name"}
+        )
+        response_json = response.json()
+        self.assertEqual(response_json["results"], [{"name": "SafeProxy"}])
+        self.assertIsNotNone(response_json["next"])
+
+        # Similar words are matched
+        response = self.client.get(url, params={"q": "proxi"})
+        self.assertEqual(
+            [result["name"] for result in response.json()["results"]], ["SafeProxy"]
+        )
+
+        # Wildcards are matched literally
+        response = self.client.get(url, params={"q": "100%"})
+        self.assertEqual(response.json()["count"], 1)
+        response = self.client.get(url, params={"q": "S_fe"})
+        self.assertEqual(response.json()["count"], 0)
+
+        response = self.client.get(url, params={"q": "sa"})
+        self.assertEqual(response.status_code, 422)
+
+    @db_session_context
+    @mock.patch.object(settings, "CONTRACTS_CHANGES_SETTLE_SECONDS", 0)
+    async def test_contracts_changes(self):
+        url = "/api/v1/contracts/changes"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"results": [], "since": None, "hasMore": False}
+        )
+
+        contracts = [await contract_factory() for _ in range(3)]
+        response = self.client.get(url, params={"limit": 2})
+        response_json = response.json()
+        self.assertEqual(
+            [result["address"] for result in response_json["results"]],
+            [fast_to_checksum_address(contract.address) for contract in contracts[:2]],
+        )
+        self.assertTrue(response_json["hasMore"])
+
+        response = self.client.get(
+            url, params={"limit": 2, "since": response_json["since"]}
+        )
+        response_json = response.json()
+        self.assertEqual(
+            [result["address"] for result in response_json["results"]],
+            [fast_to_checksum_address(contracts[2].address)],
+        )
+        self.assertFalse(response_json["hasMore"])
+        since = response_json["since"]
+
+        # Nothing changed, same cursor is returned
+        response = self.client.get(url, params={"since": since})
+        self.assertEqual(
+            response.json(), {"results": [], "since": since, "hasMore": False}
+        )
+
+        # Modified contracts are returned again
+        contracts[0].name = "Modified"
+        await contracts[0].update()
+        response = self.client.get(url, params={"since": since})
+        response_json = response.json()
+        self.assertEqual(len(response_json["results"]), 1)
+        self.assertEqual(response_json["results"][0]["name"], "Modified")
+        self.assertNotEqual(response_json["since"], since)
+
+        # Recent changes are not returned until they settle
+        with mock.patch.object(settings, "CONTRACTS_CHANGES_SETTLE_SECONDS", 60):
+            response = self.client.get(url)
+            self.assertEqual(response.json()["results"], [])
+
+        response = self.client.get(url, params={"since": "invalid"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
     @db_session_context
     async def test_view_list_all_contracts(self):
         response = self.client.get(
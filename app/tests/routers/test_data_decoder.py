@@ -1,7 +1,10 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
 from typing import cast
+from unittest import mock
 
-from eth_typing import ABIEvent, ABIFunction
+import msgpack
+import orjson
+from eth_typing import ABIEvent, ABIFunction, HexStr
 from fastapi.testclient import TestClient
 from hexbytes import HexBytes
 from safe_eth.eth.constants import NULL_ADDRESS
@@ -9,12 +12,24 @@ from safe_eth.eth.utils import get_empty_tx_params
 from safe_eth.util.util import to_0x_hex_str
 from web3 import Web3
 
+from ...config import settings
 from ...datasources.abis.gnosis_protocol import cowswap_settlement_v2_abi
-from ...datasources.db.database import db_session_context
+from ...datasources.db.database import db_session, db_session_context
 from ...datasources.db.models import Abi, AbiSource, Contract
 from ...main import app
+from ...routers.data_decoder import (
+    decode_ndjson_stream,
+    iter_ndjson_lines,
+    serialize_data_decoded,
+)
+from ...routers.models import DataDecodedPublic
 from ...services.abis import AbiService
-from ...services.data_decoder import DecodingAccuracyEnum, get_data_decoder_service
+from ...services.data_decoder import (
+    DataDecoded,
+    DataDecoderService,
+    DecodingAccuracyEnum,
+    get_data_decoder_service,
+)
 from ..datasources.db.async_db_test_case import AsyncDbTestCase
 from ..services.mocks_data_decoder import example_abi, example_swapped_abi
 
@@ -73,6 +88,17 @@ class TestRouterAbout(AsyncDbTestCase):
                 ],
             },
         )
+        json_response = response
+
+        # MessagePack mirrors the JSON response
+        response = self.client.post(
+            "/api/v1/data-decoder/",
+            json={"data": to_0x_hex_str(add_owner_with_threshold_data)},
+            headers={"Accept": "application/msgpack"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), json_response.json())
 
         response = self.client.post("/api/v1/data-decoder/", json={"data": "0x123"})
         self.assertEqual(response.status_code, 404)
@@ -113,6 +139,118 @@ class TestRouterAbout(AsyncDbTestCase):
             },
         )
 
+    @db_session_context
+    async def test_view_data_decoder_get(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        contract_address = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+        abi = Abi(abi_json=example_abi, relevance=101, source_id=source.id)
+        await abi.create()
+        contract = Contract(
+            address=HexBytes(contract_address), abi=abi, name="Droids", chain_id=1
+        )
+        await contract.create()
+        example_data = (
+            Web3()
+            .eth.contract(abi=example_abi)
+            .functions.buyDroid(4, 10)
+            .build_transaction(
+                get_empty_tx_params() | {"to": NULL_ADDRESS, "chainId": 1}
+            )["data"]
+        )
+        params = {"data": example_data, "to": contract_address, "chainId": 1}
+
+        response = self.client.get("/api/v1/data-decoder", params=params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.content,
+            self.client.post("/api/v1/data-decoder", json=params).content,
+        )
+        self.assertEqual(response.json()["accuracy"], "FULL_MATCH")
+        self.assertEqual(response.headers["cache-control"], "public, max-age=60")
+        etag = response.headers["etag"]
+
+        with mock.patch.object(
+            DataDecoderService, "get_data_decoded", side_effect=AssertionError
+        ):
+            response = self.client.get(
+                "/api/v1/data-decoder",
+                params=params,
+                headers={"If-None-Match": etag},
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], etag)
+
+        # ETag changes when the ABI of the contract changes
+        contract.name = "Modified"
+        await contract.update()
+        response = self.client.get("/api/v1/data-decoder", params=params)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+        etag = response.headers["etag"]
+
+        # ETag changes when new ABIs are loaded
+        swapped_abi = Abi(
+            abi_json=example_swapped_abi, relevance=100, source_id=source.id
+        )
+        await swapped_abi.create()
+        response = self.client.get("/api/v1/data-decoder", params=params)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+        etag = response.headers["etag"]
+
+        # ETag changes when the implementation of a proxy gets an ABI already stored
+        implementation = Contract(
+            address=HexBytes("0x" + "22" * 20), name="Implementation", chain_id=1
+        )
+        await implementation.create()
+        contract.implementation = implementation.address
+        await contract.update()
+        response = self.client.get("/api/v1/data-decoder", params=params)
+        etag = response.headers["etag"]
+        implementation.abi_id = swapped_abi.id
+        await implementation.update()
+        response = self.client.get("/api/v1/data-decoder", params=params)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+
+        # ETag is the same for every process, responses are not cached by processes that
+        # didn't load the latest ABIs yet
+        data_decoder_service = DataDecoderService()
+        await data_decoder_service.init()
+        await Abi(abi_json=cowswap_settlement_v2_abi, source_id=source.id).create()
+        with (
+            mock.patch(
+                "app.routers.data_decoder.get_data_decoder_service",
+                new_callable=mock.AsyncMock,
+                return_value=data_decoder_service,
+            ),
+            mock.patch.object(DataDecoderService, "load_new_abis", return_value=0),
+        ):
+            response = self.client.get("/api/v1/data-decoder", params=params)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("etag", response.headers)
+        self.assertEqual(response.headers["cache-control"], "no-store")
+        with mock.patch(
+            "app.routers.data_decoder.get_data_decoder_service",
+            new_callable=mock.AsyncMock,
+            return_value=data_decoder_service,
+        ):
+            response = self.client.get("/api/v1/data-decoder", params=params)
+        etag = response.headers["etag"]
+        response = self.client.get("/api/v1/data-decoder", params=params)
+        self.assertEqual(response.headers["etag"], etag)
+
+        response = self.client.get(
+            "/api/v1/data-decoder", params={"data": example_data, "chainId": 1}
+        )
+        self.assertEqual(response.status_code, 422)
+        response = self.client.get(
+            "/api/v1/data-decoder",
+            params={"data": "0x" + "00" * settings.DATA_DECODER_GET_DATA_MAX_LENGTH},
+        )
+        self.assertEqual(response.status_code, 422)
+
     @db_session_context
     async def test_view_data_decoder_with_chain_id(self):
         source = AbiSource(name="local", url="")
@@ -350,3 +488,147 @@ class TestRouterAbout(AsyncDbTestCase):
                 "accuracy": "ONLY_FUNCTION_MATCH",
             },
         )
+
+    @mock.patch.object(settings, "DATA_DECODER_STREAM_MAX_CONCURRENCY", 2)
+    @mock.patch.object(settings, "DATA_DECODER_STREAM_LINE_MAX_LENGTH", 512)
+    @db_session_context
+    async def test_view_data_decoder_stream(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        await Abi(abi_json=example_abi, relevance=100, source_id=source.id).create()
+        contract = Web3().eth.contract(abi=example_abi)
+        lines = [
+            orjson.dumps(
+                {
+                    "data": contract.functions.buyDroid(droid_id, 1).build_transaction(
+                        get_empty_tx_params() | {"to": NULL_ADDRESS, "chainId": 1}
+                    )["data"]
+                }
+            )
+            for droid_id in range(4)
+        ]
+        lines[1:1] = [
+            b"",
+            b"{invalid",
+            orjson.dumps({"data": "0x12345678"}),
+            orjson.dumps({"data": "0x" + "00" * 512}),
+        ]
+
+        response = self.client.post(
+            "/api/v1/data-decoder/stream",
+            content=b"\n".join(lines),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        results = [orjson.loads(line) for line in response.text.splitlines()]
+        # Blank line is ignored, order is kept
+        self.assertEqual(len(results), 7)
+        self.assertEqual(results[1]["error"], "Invalid input")
+        self.assertEqual(
+            results[2], {"error": "Cannot find function selector to decode data"}
+        )
+        self.assertEqual(results[3], {"error": "Line is too long"})
+        for droid_id, result in enumerate(results[:1] + results[4:]):
+            self.assertEqual(result["method"], "buyDroid")
+            self.assertEqual(result["parameters"][0]["value"], str(droid_id))
+            self.assertEqual(
+                result["accuracy"], DecodingAccuracyEnum.ONLY_FUNCTION_MATCH.name
+            )
+
+    @db_session_context
+    async def test_view_data_decoder_stream_releases_db_session(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        await Abi(abi_json=example_abi, relevance=100, source_id=source.id).create()
+        request_session_registered: list[bool] = []
+
+        async def decode_ndjson_stream_mock(*args):
+            # Runs when streaming starts, on the request database session scope
+            request_session_registered.append(db_session.registry.has())
+            async for line in decode_ndjson_stream(*args):
+                yield line
+
+        with mock.patch(
+            "app.routers.data_decoder.decode_ndjson_stream", decode_ndjson_stream_mock
+        ):
+            response = self.client.post(
+                "/api/v1/data-decoder/stream",
+                content=orjson.dumps({"data": "0x12345678"}),
+            )
+        self.assertEqual(response.status_code, 200)
+        # ABIs were loaded, but no connection is held while the stream is sent
+        self.assertEqual(request_session_registered, [False])
+
+    async def test_iter_ndjson_lines(self):
+        async def get_chunks():
+            for chunk in (b'{"a": 1}\n\n{"b"', b": 2}\n" + b"x" * 20, b"x\n{}", b"\n"):
+                yield chunk
+
+        self.assertEqual(
+            [line async for line in iter_ndjson_lines(get_chunks(), 10)],
+            [b'{"a": 1}', b'{"b": 2}', None, b"{}"],
+        )
+
+    def test_serialize_data_decoded(self):
+        data_decoded: DataDecoded = {
+            "method": "transfer",
+            "parameters": [
+                {
+                    "name": "to",
+                    "type": "address",
+                    "value": "0x5aFE3855358E112B5647B952709E6165e1c1eEEe",
+                },
+                {
+                    "name": "memo",
+                    "type": "string",
+                    "value": 'Non ascii "é😀" \x1f\n',
+                },
+            ],
+        }
+        multisend_decoded: DataDecoded = {
+            "method": "multiSend",
+            "parameters": [
+                {
+                    "name": "transactions",
+                    "type": "bytes",
+                    "value": "0x00",
+                    "value_decoded": [
+                        {
+                            "operation": 0,
+                            "to": NULL_ADDRESS,
+                            "value": "1",
+                            "data": HexStr("0xa9059cbb"),
+                            "data_decoded": data_decoded,
+                        },
+                        {
+                            "operation": 1,
+                            "to": NULL_ADDRESS,
+                            "value": "0",
+                            "data": None,
+                            "data_decoded": None,
+                        },
+                    ],
+                },
+                {
+                    "name": "tuple",
+                    "type": "(uint256,bool[])",
+                    "value": ("1", ("True", "False")),
+                    "value_decoded": None,
+                },
+                {
+                    "name": "data",
+                    "type": "bytes",
+                    "value": "0x",
+                    "value_decoded": data_decoded,
+                },
+            ],
+        }
+        # Output must be the same as serializing the Pydantic response model
+        for accuracy in DecodingAccuracyEnum:
+            expected = DataDecodedPublic.model_validate(
+                {**multisend_decoded, "accuracy": accuracy}
+            ).model_dump_json(by_alias=True)
+            self.assertEqual(
+                serialize_data_decoded(multisend_decoded, accuracy), expected.encode()
+            )
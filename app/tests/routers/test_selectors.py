@@ -0,0 +1,279 @@
+from unittest import mock
+
+import orjson
+from fastapi.testclient import TestClient
+
+from ...config import settings
+from ...datasources.db.database import db_session_context
+from ...datasources.db.models import Abi, AbiSource
+from ...main import app
+from ...routers import selectors
+from ...routers.selectors import _selectors_export_cache, get_selectors_etag
+from ...services.data_decoder import get_data_decoder_service
+from ..datasources.db.async_db_test_case import AsyncDbTestCase
+from ..services.mocks_data_decoder import example_abi
+
+
+class TestRouterSelectors(AsyncDbTestCase):
+    client: TestClient
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def setUp(self):
+        get_data_decoder_service.cache_clear()
+        _selectors_export_cache.clear()
+
+    def tearDown(self):
+        get_data_decoder_service.cache_clear()
+
+    async def _store_abis(self) -> AbiSource:
+        source = AbiSource(name="local", url="")
+        await source.create()
+        await Abi(abi_json=example_abi, relevance=100, source_id=source.id).create()
+        # `collate_propagate_storage(bytes16)` collides with `burn(uint256)`
+        for name, argument_type in (
+            ("burn", "uint256"),
+            ("collate_propagate_storage", "bytes16"),
+        ):
+            await Abi(
+                abi_json=[
+                    {
+                        "type": "function",
+                        "name": name,
+                        "inputs": [{"name": "value", "type": argument_type}],
+                        "outputs": [],
+                        "stateMutability": "nonpayable",
+                    }
+                ],
+                relevance=1,
+                source_id=source.id,
+            ).create()
+        return source
+
+    @db_session_context
+    async def test_view_selector(self):
+        await self._store_abis()
+
+        response = self.client.get("/api/v1/selectors/0x42966C68")
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(response_json["selector"], "0x42966c68")
+        self.assertCountEqual(
+            [candidate["signature"] for candidate in response_json["candidates"]],
+            ["burn(uint256)", "collate_propagate_storage(bytes16)"],
+        )
+        self.assertEqual(
+            response_json["candidates"][0]["abi"]["name"],
+            response_json["candidates"][0]["name"],
+        )
+        self.assertEqual(response.headers["cache-control"], "public, max-age=86400")
+        etag = response.headers["etag"]
+
+        response = self.client.get(
+            "/api/v1/selectors/0x42966c68", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], etag)
+
+        response = self.client.get("/api/v1/selectors/0x12345678")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("cache-control", response.headers)
+
+        response = self.client.get("/api/v1/selectors/0x1234")
+        self.assertEqual(response.status_code, 422)
+
+    @db_session_context
+    async def test_view_selector_loads_new_abis(self):
+        source = await self._store_abis()
+        data_decoder_service = await get_data_decoder_service()
+        etag = get_selectors_etag(data_decoder_service)
+        await Abi(
+            abi_json=[
+                {
+                    "type": "function",
+                    "name": "mint",
+                    "inputs": [{"name": "amount", "type": "uint256"}],
+                    "outputs": [],
+                    "stateMutability": "nonpayable",
+                }
+            ],
+            relevance=1,
+            source_id=source.id,
+        ).create()
+        # Every request runs on a new event loop, so the decoder would be built again
+        with mock.patch(
+            "app.routers.selectors.get_data_decoder_service",
+            new_callable=mock.AsyncMock,
+            return_value=data_decoder_service,
+        ):
+            response = self.client.get(
+                "/api/v1/selectors/0xa0712d68", headers={"If-None-Match": etag}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["candidates"][0]["signature"], "mint(uint256)")
+        self.assertNotEqual(response.headers["etag"], etag)
+
+    @db_session_context
+    async def test_view_selectors(self):
+        await self._store_abis()
+
+        response = self.client.get(
+            "/api/v1/selectors",
+            params={
+                "selectors": ["0x94b7f56a", "0x12345678", "0x42966c68", "0x94B7F56A"]
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        # Missing and repeated selectors are omitted
+        self.assertEqual(
+            [selector["selector"] for selector in response_json],
+            ["0x94b7f56a", "0x42966c68"],
+        )
+        self.assertEqual(
+            response_json[0]["candidates"][0]["signature"],
+            "buyDroid(uint256,uint256)",
+        )
+        self.assertEqual(len(response_json[1]["candidates"]), 2)
+        etag = response.headers["etag"]
+
+        response = self.client.get(
+            "/api/v1/selectors",
+            params={"selectors": ["0x94b7f56a"]},
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get("/api/v1/selectors", params={"selectors": ["0x12"]})
+        self.assertEqual(response.status_code, 422)
+        response = self.client.get("/api/v1/selectors")
+        self.assertEqual(response.status_code, 422)
+
+    @mock.patch.object(settings, "CACHE_RESPONSE_COMPRESSION_MIN_SIZE", 0)
+    @db_session_context
+    async def test_view_selectors_export(self):
+        source = await self._store_abis()
+
+        response = self.client.get(
+            "/api/v1/selectors/export", headers={"Accept-Encoding": "identity"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(response.headers["cache-control"], "public, no-cache")
+        etag = response.headers["etag"]
+        self.assertFalse(etag.startswith("W/"))
+        response_json = response.json()
+        data_decoder_service = await get_data_decoder_service()
+        generation = data_decoder_service.abi_index_generation
+        self.assertEqual(response_json["version"], 1)
+        self.assertEqual(response_json["generation"], generation)
+        self.assertIsNone(response_json["since"])
+        selectors = response_json["selectors"]
+        self.assertEqual(list(selectors), sorted(selectors))
+        self.assertEqual(
+            selectors["0x94b7f56a"],
+            [["buyDroid(uint256,uint256)", ["droidId", "numberOfDroids"]]],
+        )
+        self.assertCountEqual(
+            selectors["0x42966c68"],
+            [
+                ["burn(uint256)", ["value"]],
+                ["collate_propagate_storage(bytes16)", ["value"]],
+            ],
+        )
+
+        # Same artifact is compressed if accepted, with the same strong ETag
+        response = self.client.get(
+            "/api/v1/selectors/export", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["etag"], etag)
+        self.assertEqual(orjson.loads(response.content), response_json)
+        response = self.client.get(
+            "/api/v1/selectors/export", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # No changes since current generation
+        response = self.client.get(
+            "/api/v1/selectors/export", params={"since": generation}
+        )
+        self.assertEqual(response.json()["since"], generation)
+        self.assertEqual(response.json()["selectors"], {})
+
+        await Abi(
+            abi_json=[
+                {
+                    "type": "function",
+                    "name": "mint",
+                    "inputs": [{"name": "amount", "type": "uint256"}],
+                    "outputs": [],
+                    "stateMutability": "nonpayable",
+                }
+            ],
+            relevance=1,
+            source_id=source.id,
+        ).create()
+        # New ABIs are loaded by the endpoint. Every request runs on a new event loop, so the
+        # decoder would be built again
+        with mock.patch(
+            "app.routers.selectors.get_data_decoder_service",
+            new_callable=mock.AsyncMock,
+            return_value=data_decoder_service,
+        ):
+            response = self.client.get(
+                "/api/v1/selectors/export", params={"since": generation}
+            )
+        response_json = response.json()
+        self.assertEqual(
+            response_json["generation"], data_decoder_service.abi_index_generation
+        )
+        self.assertEqual(response_json["since"], generation)
+        self.assertEqual(
+            response_json["selectors"], {"0xa0712d68": [["mint(uint256)", ["amount"]]]}
+        )
+        self.assertNotEqual(response.headers["etag"], etag)
+
+        # Changes are not known before the index was built, full artifact is returned
+        response = self.client.get("/api/v1/selectors/export", params={"since": 0})
+        self.assertIsNone(response.json()["since"])
+        self.assertEqual(len(response.json()["selectors"]), len(selectors) + 1)
+
+        response = self.client.get("/api/v1/selectors/export", params={"since": -1})
+        self.assertEqual(response.status_code, 422)
+
+    @db_session_context
+    async def test_view_selectors_export_index_updated_while_rendering(self):
+        await self._store_abis()
+        data_decoder_service = await get_data_decoder_service()
+        generation = data_decoder_service.abi_index_generation
+        assert generation is not None
+        render_selectors_export = selectors.render_selectors_export
+
+        def render_selectors_export_mock(*args, **kwargs):
+            # New ABI loaded by the event loop while the artifact is rendered on a thread
+            data_decoder_service.fn_selectors_with_abis[b"\x00" * 4] = {
+                "type": "function",
+                "name": "new",
+                "inputs": [],
+            }
+            data_decoder_service.abi_index_generation = generation + 1
+            return render_selectors_export(*args, **kwargs)
+
+        with (
+            mock.patch(
+                "app.routers.selectors.get_data_decoder_service",
+                new_callable=mock.AsyncMock,
+                return_value=data_decoder_service,
+            ),
+            mock.patch.object(
+                selectors, "render_selectors_export", render_selectors_export_mock
+            ),
+        ):
+            response = self.client.get("/api/v1/selectors/export")
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(response_json["generation"], generation)
+        self.assertNotIn("0x00000000", response_json["selectors"])
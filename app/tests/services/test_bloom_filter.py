@@ -0,0 +1,34 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import os
+import unittest
+
+from ...services.bloom_filter import AddressBloomFilter
+
+
+class TestAddressBloomFilter(unittest.TestCase):
+    def test_address_bloom_filter(self):
+        bloom_filter = AddressBloomFilter(1_000, 0.01)
+        addresses = [os.urandom(20) for _ in range(1_000)]
+        for address in addresses:
+            bloom_filter.add(address)
+            self.assertTrue(address in bloom_filter)
+
+        # Addresses colliding with the ones already added are not counted
+        self.assertLessEqual(len(bloom_filter), 1_000)
+        self.assertGreater(len(bloom_filter), 990)
+        self.assertFalse(bloom_filter.is_saturated())
+        # No false negatives
+        self.assertTrue(all(address in bloom_filter for address in addresses))
+
+        # Same address is only counted once
+        count = len(bloom_filter)
+        self.assertFalse(bloom_filter.add(addresses[0]))
+        self.assertEqual(len(bloom_filter), count)
+
+        # False positive rate must be close to the configured one
+        false_positives = sum(os.urandom(20) in bloom_filter for _ in range(10_000))
+        self.assertLess(false_positives, 300)
+
+        while len(bloom_filter) <= 1_000:
+            bloom_filter.add(os.urandom(20))
+        self.assertTrue(bloom_filter.is_saturated())
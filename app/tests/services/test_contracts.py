@@ -1,6 +1,7 @@
 from app.datasources.db.database import db_session_context
+from app.datasources.db.models import Abi, AbiSource, Project
 from app.services.contract import ContractService
-from app.services.pagination import GenericPagination
+from app.services.pagination import CountStrategyEnum, GenericPagination
 from app.tests.datasources.db.async_db_test_case import AsyncDbTestCase
 from app.tests.datasources.db.factory import contract_factory
 
@@ -25,8 +26,11 @@ class TestContractService(AsyncDbTestCase):
         # Assertions
         self.assertEqual(count, 1)
         self.assertEqual(len(page), 1)
-        self.assertEqual(page[0].address, target_contract.address)
-        self.assertEqual(page[0].chain_id, target_contract.chain_id)
+        self.assertEqual(page[0]["address"], target_contract.address)
+        self.assertEqual(page[0]["chain_id"], target_contract.chain_id)
+        self.assertEqual(page[0]["name"], target_contract.name)
+        self.assertIsNone(page[0]["abi"])
+        self.assertIsNone(page[0]["project"])
 
     @db_session_context
     async def test_get_contracts_without_address_sorted(self):
@@ -65,7 +69,7 @@ class TestContractService(AsyncDbTestCase):
         self.assertEqual(count, 2)
         self.assertEqual(len(page), 2)
         self.assertEqual(
-            [contract.address for contract in page],
+            [contract["address"] for contract in page],
             [contract.address for contract in expected_contracts],
         )
 
@@ -79,7 +83,10 @@ class TestContractService(AsyncDbTestCase):
 
         self.assertEqual(count, 1)
         self.assertEqual(len(page), 1)
-        self.assertEqual([page], [expected_contracts])
+        self.assertEqual(
+            [(contract["address"], contract["chain_id"]) for contract in page],
+            [(contract.address, contract.chain_id) for contract in expected_contracts],
+        )
 
         page, count = await self.service.get_contracts(
             trusted_for_delegate_call=None, chain_ids=None
@@ -98,5 +105,103 @@ class TestContractService(AsyncDbTestCase):
         self.assertEqual(count, 4)
         self.assertEqual(len(page), 4)
         self.assertEqual(
-            [c.address for c in page], [c.address for c in expected_sorted]
+            [c["address"] for c in page], [c.address for c in expected_sorted]
+        )
+
+    @db_session_context
+    async def test_get_contracts_count_strategies(self):
+        for chain_id in range(0, 3):
+            await contract_factory(chain_id=chain_id)
+
+        service = ContractService(
+            pagination=GenericPagination(
+                limit=2, offset=None, count_strategy=CountStrategyEnum.NONE
+            )
+        )
+        page, count = await service.get_contracts()
+        self.assertIsNone(count)
+        self.assertEqual(len(page), 2)
+        self.assertTrue(service.pagination.has_next)
+
+        service = ContractService(
+            pagination=GenericPagination(
+                limit=2, offset=None, count_strategy=CountStrategyEnum.CACHED
+            )
+        )
+        page, count = await service.get_contracts()
+        self.assertEqual(count, 3)
+        # Count is cached, so new contracts are not counted until it expires
+        await contract_factory(chain_id=4)
+        page, count = await service.get_contracts()
+        self.assertEqual(count, 3)
+        # A different filter is not cached
+        page, count = await service.get_contracts(chain_ids=[4])
+        self.assertEqual(count, 1)
+
+        service = ContractService(
+            pagination=GenericPagination(
+                limit=2, offset=2, count_strategy=CountStrategyEnum.EXACT
+            )
+        )
+        page, count = await service.get_contracts()
+        self.assertEqual(count, 4)
+        self.assertEqual(len(page), 2)
+        self.assertFalse(service.pagination.has_next)
+
+        service = ContractService(
+            pagination=GenericPagination(
+                limit=2, offset=None, count_strategy=CountStrategyEnum.ESTIMATED
+            )
+        )
+        page, count = await service.get_contracts()
+        self.assertEqual(len(page), 2)
+        self.assertIsInstance(count, int)
+
+    @db_session_context
+    async def test_get_contracts_with_abi_and_project(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi = Abi(abi_json={"name": "Test"}, source_id=source.id)
+        await abi.create()
+        project = Project(name="Safe", description="Safe", logo_file="safe.png")
+        await project.create()
+        contract = await contract_factory(chain_id=1)
+        contract.abi_id = abi.id
+        contract.project_id = project.id
+        await contract.update()
+
+        page, _ = await self.service.get_contracts()
+        self.assertEqual(
+            page,
+            [
+                {
+                    "address": contract.address,
+                    "name": contract.name,
+                    "display_name": contract.display_name,
+                    "chain_id": 1,
+                    "modified": contract.modified,
+                    "trusted_for_delegate_call": False,
+                    "fetch_retries": 0,
+                    "abi": {
+                        "abi_hash": abi.abi_hash,
+                        "abi_json": {"name": "Test"},
+                        "modified": abi.modified,
+                    },
+                    "project": {"description": "Safe", "logo_file": "safe.png"},
+                }
+            ],
+        )
+
+        # ABI and project are not joined if not requested
+        page, _ = await self.service.get_contracts(fields={"name"})
+        self.assertEqual(
+            page,
+            [
+                {
+                    "address": contract.address,
+                    "name": contract.name,
+                    "chain_id": 1,
+                    "modified": contract.modified,
+                }
+            ],
         )
@@ -1,5 +1,8 @@
 # SPDX-License-Identifier: FSL-1.1-MIT
-from eth_typing import Address
+import datetime
+from unittest import mock
+
+from eth_typing import ABI, ABIFunction, Address
 from hexbytes import HexBytes
 from safe_eth.eth.constants import NULL_ADDRESS
 from safe_eth.eth.contracts import (
@@ -20,6 +23,12 @@ from app.datasources.abis.gnosis_protocol import (
     gnosis_protocol_abi,
 )
 
+from ...config import settings
+from ...datasources.cache.redis import (
+    del_contract_selectors_cache,
+    get_key_for_contract_selectors,
+    get_redis,
+)
 from ...datasources.db.database import db_session_context
 from ...datasources.db.models import Abi, AbiSource, Contract
 from ...services.data_decoder import (
@@ -27,6 +36,7 @@ from ...services.data_decoder import (
     DataDecoderService,
     DecodingAccuracyEnum,
     UnexpectedProblemDecoding,
+    del_contract_and_proxies_selectors_cache,
     get_data_decoder_service,
 )
 from ..datasources.db.async_db_test_case import AsyncDbTestCase
@@ -412,6 +422,7 @@ class TestDataDecoderService(AsyncDbTestCase):
         await abi.create()
         contract = Contract(address=b"c", abi=abi, name="SwappedContract", chain_id=1)
         await contract.create()
+        self.assertEqual(await decoder_service.load_new_contract_addresses(), 1)
 
         fn_name, arguments = await decoder_service.decode_transaction(
             example_data, address=Address(contract.address)
@@ -516,7 +527,11 @@ class TestDataDecoderService(AsyncDbTestCase):
         self.assertEqual(arguments, expected_arguments)
         self.assertEqual(accuracy, DecodingAccuracyEnum.FULL_MATCH)
 
-        # Init a new service to remove caches
+        # Init a new service and invalidate shared cache to remove caches
+        for chain_id in (1, 2):
+            await del_contract_selectors_cache(
+                to_0x_hex_str(contract_address), chain_id
+            )
         decoder_service = DataDecoderService()
         await decoder_service.init()
 
@@ -603,3 +618,486 @@ class TestDataDecoderService(AsyncDbTestCase):
             len(decoder_service.fn_selectors_with_abis), len_previous_selectors
         )
         self.assertEqual(decoder_service.last_abi_id, abi.id)
+
+    @db_session_context
+    async def test_get_selector_candidates(self):
+        def get_fn_abi(
+            name: str, argument_name: str, argument_type: str
+        ) -> ABIFunction:
+            return {
+                "type": "function",
+                "name": name,
+                "inputs": [{"name": argument_name, "type": argument_type}],
+                "outputs": [],
+                "stateMutability": "nonpayable",
+            }
+
+        # `burn(uint256)` and `collate_propagate_storage(bytes16)` share `0x42966c68`
+        selector = HexBytes("0x42966c68")
+        burn_fn_abi = get_fn_abi("burn", "amount", "uint256")
+        collate_fn_abi = get_fn_abi("collate_propagate_storage", "data", "bytes16")
+        source = AbiSource(name="local", url="")
+        await source.create()
+        await Abi(abi_json=[burn_fn_abi], relevance=100, source_id=source.id).create()
+        await Abi(abi_json=[collate_fn_abi], relevance=1, source_id=source.id).create()
+
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        self.assertEqual(
+            decoder_service.abi_index_generation, decoder_service.last_abi_id
+        )
+        candidates = decoder_service.get_selector_candidates(selector)
+        self.assertEqual(
+            candidates[0], decoder_service.fn_selectors_with_abis[selector]
+        )
+        self.assertCountEqual(candidates, [burn_fn_abi, collate_fn_abi])
+        self.assertEqual(decoder_service.get_selector_candidates(b"1234"), [])
+
+        # Same function on other ABI is not a new candidate
+        other_burn_fn_abi = get_fn_abi("burn", "value", "uint256")
+        abi = Abi(abi_json=[other_burn_fn_abi], relevance=1, source_id=source.id)
+        await abi.create()
+        self.assertEqual(await decoder_service.load_new_abis(), 0)
+        self.assertEqual(decoder_service.abi_index_generation, abi.id)
+        self.assertEqual(decoder_service.get_selector_candidates(selector), candidates)
+
+        # Colliding functions loaded later are candidates too
+        decoder_service = DataDecoderService()
+        decoder_service.fn_selectors_collisions = {}
+        decoder_service.fn_selectors_with_abis = {}
+        decoder_service.fn_selectors_generations = {}
+        decoder_service.last_abi_id = None
+        await decoder_service.add_abi([burn_fn_abi])
+        self.assertEqual(
+            decoder_service.get_selector_candidates(selector), [burn_fn_abi]
+        )
+        await decoder_service.add_abi([collate_fn_abi])
+        self.assertEqual(
+            decoder_service.get_selector_candidates(selector),
+            [burn_fn_abi, collate_fn_abi],
+        )
+
+    @db_session_context
+    async def test_get_selectors_changed_after(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        await Abi(abi_json=example_abi, relevance=100, source_id=source.id).create()
+        decoder_service = DataDecoderService()
+        self.assertIsNone(decoder_service.get_selectors_changed_after(None))
+        await decoder_service.init()
+        generation = decoder_service.abi_index_generation
+        assert generation is not None
+        self.assertEqual(decoder_service.fn_selectors_base_generation, generation)
+        self.assertIsNone(decoder_service.get_selectors_changed_after(None))
+        self.assertIsNone(decoder_service.get_selectors_changed_after(generation - 1))
+        self.assertIsNone(decoder_service.get_selectors_changed_after(generation + 1))
+        self.assertEqual(decoder_service.get_selectors_changed_after(generation), [])
+
+        # `buyDroid` is already known, only `mint` changed
+        abi = Abi(
+            abi_json=[
+                example_abi[-1],
+                {
+                    "type": "function",
+                    "name": "mint",
+                    "inputs": [{"name": "amount", "type": "uint256"}],
+                    "outputs": [],
+                    "stateMutability": "nonpayable",
+                },
+            ],
+            relevance=1,
+            source_id=source.id,
+        )
+        await abi.create()
+        await decoder_service.load_new_abis()
+        self.assertEqual(
+            decoder_service.get_selectors_changed_after(generation),
+            [HexBytes("0xa0712d68")],
+        )
+        self.assertEqual(decoder_service.get_selectors_changed_after(abi.id), [])
+
+    @db_session_context
+    async def test_contract_addresses_filter(self):
+        example_data = (
+            Web3()
+            .eth.contract(abi=example_abi)
+            .functions.buyDroid(4, 10)
+            .build_transaction(
+                get_empty_tx_params() | {"to": NULL_ADDRESS, "chainId": 1}
+            )["data"]
+        )
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi = Abi(abi_json=example_abi, relevance=100, source_id=source.id)
+        await abi.create()
+        abi_swapped = Abi(
+            abi_json=example_swapped_abi, relevance=1, source_id=source.id
+        )
+        await abi_swapped.create()
+        await Contract(address=b"a", abi=abi_swapped, name="A", chain_id=1).create()
+
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        self.assertTrue(decoder_service.may_have_contract_abi(Address(b"a")))
+        self.assertFalse(decoder_service.may_have_contract_abi(Address(b"b")))
+
+        # Addresses not in the filter must not hit the database
+        with mock.patch.object(
+            Contract, "get_abi_and_implementation_by_contract_address"
+        ) as get_abi_and_implementation_by_contract_address_mock:
+            fn_name, arguments = await decoder_service.decode_transaction(
+                example_data, address=Address(b"b"), chain_id=1
+            )
+            accuracy = await decoder_service.get_decoding_accuracy(
+                example_data, address=Address(b"b"), chain_id=1
+            )
+            get_abi_and_implementation_by_contract_address_mock.assert_not_called()
+        self.assertEqual(arguments, {"droidId": "4", "numberOfDroids": "10"})
+        self.assertEqual(accuracy, DecodingAccuracyEnum.ONLY_FUNCTION_MATCH)
+
+        # Contracts without ABI are not added
+        contract_without_abi = Contract(address=b"b", name="B", chain_id=1)
+        await contract_without_abi.create()
+        await decoder_service.load_new_contract_addresses()
+        self.assertFalse(decoder_service.may_have_contract_abi(Address(b"b")))
+
+        # Filter is updated incrementally when the contract gets an ABI
+        contract_without_abi.abi_id = abi_swapped.id
+        await contract_without_abi.update()
+        self.assertGreater(await decoder_service.load_new_contract_addresses(), 0)
+        self.assertTrue(decoder_service.may_have_contract_abi(Address(b"b")))
+        fn_name, arguments = await decoder_service.decode_transaction(
+            example_data, address=Address(b"b"), chain_id=1
+        )
+        self.assertEqual(fn_name, "buyDroid")
+        self.assertEqual(arguments, {"numberOfDroids": "4", "droidId": "10"})
+
+    @db_session_context
+    async def test_load_new_contract_addresses(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi = Abi(abi_json=example_abi, relevance=100, source_id=source.id)
+        await abi.create()
+        # Same address on multiple chains is only counted once
+        for chain_id in (1, 2):
+            await Contract(address=b"a", abi=abi, name="A", chain_id=chain_id).create()
+
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        filter_count = len(decoder_service.contract_addresses_filter)
+        self.assertEqual(filter_count, 1)
+        contract_addresses_filter = decoder_service.contract_addresses_filter
+
+        # Contracts already loaded must not be added again
+        for _ in range(3):
+            self.assertEqual(await decoder_service.load_new_contract_addresses(), 0)
+            self.assertEqual(
+                len(decoder_service.contract_addresses_filter), filter_count
+            )
+        self.assertIs(
+            decoder_service.contract_addresses_filter, contract_addresses_filter
+        )
+
+        await Contract(address=b"b", abi=abi, name="B", chain_id=1).create()
+        await Contract(address=b"a", abi=abi, name="A", chain_id=3).create()
+        self.assertEqual(await decoder_service.load_new_contract_addresses(), 1)
+        self.assertEqual(await decoder_service.load_new_contract_addresses(), 0)
+        self.assertEqual(len(decoder_service.contract_addresses_filter), 2)
+        self.assertFalse(decoder_service.contract_addresses_filter.is_saturated())
+
+        # Contracts committed after newer ones were read are not skipped
+        assert decoder_service.last_contract_modified is not None
+        await Contract(
+            address=b"c",
+            abi=abi,
+            name="C",
+            chain_id=1,
+            modified=decoder_service.last_contract_modified
+            - datetime.timedelta(seconds=1),
+        ).create()
+        self.assertFalse(decoder_service.may_have_contract_abi(Address(b"c")))
+        self.assertEqual(await decoder_service.load_new_contract_addresses(), 1)
+        self.assertTrue(decoder_service.may_have_contract_abi(Address(b"c")))
+        self.assertEqual(len(decoder_service.contract_addresses_filter), 3)
+
+    @db_session_context
+    async def test_build_contract_addresses_filter_swaps_when_built(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi = Abi(abi_json=example_abi, relevance=100, source_id=source.id)
+        await abi.create()
+        await Contract(address=b"a", abi=abi, name="A", chain_id=1).create()
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        await Contract(address=b"b", abi=abi, name="B", chain_id=1).create()
+
+        # Previous filter must be used until the new one is fully built
+        may_have_contract_abi = []
+        get_addresses_with_abi = Contract.get_addresses_with_abi
+
+        async def get_addresses_with_abi_mock(*args, **kwargs):
+            async for row in get_addresses_with_abi(*args, **kwargs):
+                may_have_contract_abi.append(
+                    decoder_service.may_have_contract_abi(Address(b"a"))
+                )
+                yield row
+
+        with mock.patch.object(
+            Contract, "get_addresses_with_abi", get_addresses_with_abi_mock
+        ):
+            await decoder_service._build_contract_addresses_filter()
+        self.assertEqual(may_have_contract_abi, [True, True])
+        self.assertTrue(decoder_service.may_have_contract_abi(Address(b"b")))
+
+    @db_session_context
+    async def test_get_contract_abi_selectors_shared_cache(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi = Abi(abi_json=example_abi, relevance=100, source_id=source.id)
+        await abi.create()
+        await Contract(address=b"a", abi=abi, name="A", chain_id=1).create()
+        redis = get_redis()
+
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        selectors_with_abis = await decoder_service.get_contract_abi_selectors(
+            Address(b"a"), 1
+        )
+        self.assertEqual(
+            selectors_with_abis,
+            await decoder_service._generate_selectors_with_abis_from_abi(example_abi),
+        )
+        self.assertIsNone(
+            await decoder_service.get_contract_abi_selectors(Address(b"a"), 2)
+        )
+        self.assertIsNotNone(await redis.get(get_key_for_contract_selectors("0x61", 1)))
+        self.assertGreater(
+            await redis.ttl(get_key_for_contract_selectors("0x61", 2)), 0
+        )
+
+        # A new service must use the shared cache and not query the database
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        with mock.patch.object(
+            Contract, "get_abi_and_implementation_by_contract_address"
+        ) as get_abi_and_implementation_by_contract_address_mock:
+            self.assertEqual(
+                await decoder_service.get_contract_abi_selectors(Address(b"a"), 1),
+                selectors_with_abis,
+            )
+            self.assertIsNone(
+                await decoder_service.get_contract_abi_selectors(Address(b"a"), 2)
+            )
+            get_abi_and_implementation_by_contract_address_mock.assert_not_called()
+
+        # Invalidating the cache must query the database again
+        await del_contract_selectors_cache("0x61", 2)
+        self.assertIsNone(await redis.get(get_key_for_contract_selectors("0x61", 2)))
+        self.assertIsNone(await redis.get(get_key_for_contract_selectors("0x61", None)))
+        self.assertIsNotNone(await redis.get(get_key_for_contract_selectors("0x61", 1)))
+
+    @db_session_context
+    async def test_get_contract_abi_selectors_local_cache_expires(self):
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi = Abi(abi_json=example_abi, relevance=100, source_id=source.id)
+        await abi.create()
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+
+        with mock.patch("app.services.lru_cache.time") as time_mock:
+            time_mock.monotonic.return_value = 1_000.0
+            self.assertIsNone(
+                await decoder_service.get_contract_abi_selectors(Address(b"a"), 1)
+            )
+            # ABI is downloaded by the worker, that can only invalidate Redis
+            await Contract(address=b"a", abi=abi, name="A", chain_id=1).create()
+            await del_contract_selectors_cache("0x61", 1)
+            time_mock.monotonic.return_value += (
+                settings.DATA_DECODER_CONTRACT_CACHE_MISSING_TTL - 1
+            )
+            self.assertIsNone(
+                await decoder_service.get_contract_abi_selectors(Address(b"a"), 1)
+            )
+            # Missing entries expire in memory like on Redis
+            time_mock.monotonic.return_value += 1
+            self.assertIsNotNone(
+                await decoder_service.get_contract_abi_selectors(Address(b"a"), 1)
+            )
+
+            # Entries read from Redis expire when the Redis entry does
+            decoder_service.contract_selectors_cache.clear()
+            await decoder_service.get_contract_abi_selectors(Address(b"a"), 1)
+            time_mock.monotonic.return_value += settings.DATA_DECODER_CONTRACT_CACHE_TTL
+            self.assertNotIn((b"a", 1), decoder_service.contract_selectors_cache)
+
+    @staticmethod
+    async def _get_contract_function_names(
+        decoder_service: DataDecoderService, address: Address
+    ) -> set[str]:
+        selectors_with_abis = await decoder_service.get_contract_abi_selectors(
+            address, 1
+        )
+        assert selectors_with_abis is not None
+        return {fn_abi["name"] for fn_abi in selectors_with_abis.values()}
+
+    @db_session_context
+    async def test_decode_proxy_contract_implementation_arrives_later(self):
+        proxy_abi: ABI = [
+            {
+                "inputs": [{"name": "newImplementation", "type": "address"}],
+                "name": "upgradeTo",
+                "outputs": [],
+                "stateMutability": "nonpayable",
+                "type": "function",
+            }
+        ]
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi_proxy = Abi(abi_json=proxy_abi, relevance=1, source_id=source.id)
+        await abi_proxy.create()
+        # Proxy of a proxy whose implementation `c` is not downloaded yet
+        await Contract(
+            address=b"a", abi=abi_proxy, name="Proxy", chain_id=1, implementation=b"b"
+        ).create()
+        await Contract(
+            address=b"b", abi=abi_proxy, name="Proxy", chain_id=1, implementation=b"c"
+        ).create()
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        redis = get_redis()
+
+        with mock.patch("app.services.lru_cache.time") as time_mock:
+            time_mock.monotonic.return_value = 1_000.0
+            for address in (b"a", b"b"):
+                self.assertEqual(
+                    await self._get_contract_function_names(
+                        decoder_service, Address(address)
+                    ),
+                    {"upgradeTo"},
+                )
+
+            # Worker downloads the implementation ABI
+            abi = Abi(abi_json=example_abi, relevance=100, source_id=source.id)
+            await abi.create()
+            implementation = Contract(
+                address=b"c", abi=abi, name="Implementation", chain_id=1
+            )
+            await implementation.create()
+            await del_contract_and_proxies_selectors_cache("0x63", 1)
+            for proxy_address in ("0x61", "0x62"):
+                self.assertIsNone(
+                    await redis.get(get_key_for_contract_selectors(proxy_address, 1))
+                )
+            time_mock.monotonic.return_value += (
+                settings.DATA_DECODER_CONTRACT_CACHE_MISSING_TTL
+            )
+            for address in (b"a", b"b"):
+                self.assertEqual(
+                    await self._get_contract_function_names(
+                        decoder_service, Address(address)
+                    ),
+                    {"upgradeTo", "buyDroid"},
+                )
+
+        # Complete proxy entries are invalidated when the implementation ABI changes
+        implementation_abi = Abi(abi_json=tuple_abi, relevance=1, source_id=source.id)
+        await implementation_abi.create()
+        implementation.abi_id = implementation_abi.id
+        await implementation.update()
+        self.assertGreater(
+            await redis.ttl(get_key_for_contract_selectors("0x61", 1)),
+            settings.DATA_DECODER_CONTRACT_CACHE_MISSING_TTL,
+        )
+        await del_contract_and_proxies_selectors_cache("0x63", 1)
+        decoder_service.contract_selectors_cache.clear()
+        self.assertEqual(
+            await self._get_contract_function_names(decoder_service, Address(b"a")),
+            {"upgradeTo", "createWithContext"},
+        )
+
+    @db_session_context
+    async def test_decode_proxy_contract(self):
+        example_data = (
+            Web3()
+            .eth.contract(abi=example_abi)
+            .functions.buyDroid(4, 10)
+            .build_transaction(
+                get_empty_tx_params() | {"to": NULL_ADDRESS, "chainId": 1}
+            )["data"]
+        )
+        proxy_abi = [
+            {
+                "inputs": [{"name": "newImplementation", "type": "address"}],
+                "name": "upgradeTo",
+                "outputs": [],
+                "stateMutability": "nonpayable",
+                "type": "function",
+            }
+        ]
+        source = AbiSource(name="local", url="")
+        await source.create()
+        abi = Abi(abi_json=example_abi, relevance=100, source_id=source.id)
+        await abi.create()
+        implementation_abi = Abi(
+            abi_json=example_swapped_abi, relevance=1, source_id=source.id
+        )
+        await implementation_abi.create()
+        abi_proxy = Abi(abi_json=proxy_abi, relevance=1, source_id=source.id)
+        await abi_proxy.create()
+        # Proxy of a proxy, and a proxy pointing to itself
+        await Contract(
+            address=b"a", abi=abi_proxy, name="Proxy", chain_id=1, implementation=b"b"
+        ).create()
+        await Contract(
+            address=b"b", abi=abi_proxy, name="Proxy", chain_id=1, implementation=b"c"
+        ).create()
+        await Contract(
+            address=b"c", abi=implementation_abi, name="Implementation", chain_id=1
+        ).create()
+        await Contract(
+            address=b"d", abi=abi_proxy, name="Proxy", chain_id=1, implementation=b"d"
+        ).create()
+
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        self.assertEqual(
+            await self._get_contract_function_names(decoder_service, Address(b"a")),
+            {"upgradeTo", "buyDroid"},
+        )
+        fn_name, arguments = await decoder_service.decode_transaction(
+            example_data, address=Address(b"a"), chain_id=1
+        )
+        accuracy = await decoder_service.get_decoding_accuracy(
+            example_data, address=Address(b"a"), chain_id=1
+        )
+        self.assertEqual(fn_name, "buyDroid")
+        self.assertEqual(arguments, {"numberOfDroids": "4", "droidId": "10"})
+        self.assertEqual(accuracy, DecodingAccuracyEnum.FULL_MATCH)
+
+        self.assertEqual(
+            await self._get_contract_function_names(decoder_service, Address(b"d")),
+            {"upgradeTo"},
+        )
+
+        # Depth limit is respected
+        decoder_service = DataDecoderService()
+        await decoder_service.init()
+        decoder_service.PROXY_IMPLEMENTATION_MAX_DEPTH = 1
+        await del_contract_selectors_cache("0x61", 1)
+        self.assertEqual(
+            await self._get_contract_function_names(decoder_service, Address(b"a")),
+            {"upgradeTo"},
+        )
+
+        # Proxies with missing implementations are cached for a shorter time
+        await Contract(
+            address=b"e", abi=abi_proxy, name="Proxy", chain_id=1, implementation=b"f"
+        ).create()
+        self.assertIsNotNone(
+            await decoder_service.get_contract_abi_selectors(Address(b"e"), 1)
+        )
+        self.assertLessEqual(
+            await get_redis().ttl(get_key_for_contract_selectors("0x65", 1)),
+            settings.DATA_DECODER_CONTRACT_CACHE_MISSING_TTL,
+        )
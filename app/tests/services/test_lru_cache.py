@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: FSL-1.1-MIT
+import unittest
+from unittest import mock
+
+from ...services.lru_cache import CacheStats, SizeBoundedLRUCache
+
+
+class TestSizeBoundedLRUCache(unittest.TestCase):
+    def test_size_bounded_lru_cache(self):
+        cache = SizeBoundedLRUCache(max_entries=3, max_size_bytes=100)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", 1, 10)
+        cache.set("b", None, 10)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b", "default"))
+        self.assertEqual(cache.get("c", "default"), "default")
+
+        # Least recently used entry is evicted when max entries are exceeded
+        cache.set("c", 3, 10)
+        cache.set("d", 4, 10)
+        self.assertNotIn("a", cache)
+        self.assertEqual(len(cache), 3)
+
+        # Entries are evicted until size fits
+        cache.set("e", 5, 95)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get("e"), 5)
+
+        # Entries bigger than the max size are not stored
+        cache.set("f", 6, 101)
+        self.assertNotIn("f", cache)
+
+        # Replacing an entry updates the size
+        cache.set("e", 5, 20)
+        self.assertEqual(cache.size_bytes, 20)
+
+        self.assertEqual(
+            cache.get_stats(),
+            CacheStats(
+                hits=3,
+                misses=2,
+                evictions=4,
+                entries=1,
+                size_bytes=20,
+                max_entries=3,
+                max_size_bytes=100,
+            ),
+        )
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size_bytes, 0)
+
+    def test_size_bounded_lru_cache_ttl(self):
+        cache = SizeBoundedLRUCache(max_entries=3, max_size_bytes=100)
+        with mock.patch("app.services.lru_cache.time.monotonic", return_value=1_000.0):
+            cache.set("a", 1, 10, ttl=5)
+            cache.set("b", None, 10, ttl=60)
+            cache.set("c", 3, 10)
+        with mock.patch("app.services.lru_cache.time.monotonic", return_value=1_010.0):
+            # Expired entries are missed and removed
+            self.assertNotIn("a", cache)
+            self.assertEqual(cache.get("a", "default"), "default")
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.size_bytes, 20)
+            self.assertIsNone(cache.get("b", "default"))
+            self.assertEqual(cache.get("c"), 3)
+        with mock.patch(
+            "app.services.lru_cache.time.monotonic", return_value=1_000_000.0
+        ):
+            self.assertEqual(cache.get("b", "default"), "default")
+            self.assertEqual(cache.get("c"), 3)
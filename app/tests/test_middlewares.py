@@ -0,0 +1,54 @@
+import logging
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from ..main import app
+from ..middlewares import RequestLogMiddleware
+
+
+class TestRequestLogMiddleware(unittest.TestCase):
+    client: TestClient
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def test_request_is_logged(self):
+        with self.assertLogs(level=logging.INFO) as logs:
+            response = self.client.get("/health?param=1")
+        self.assertEqual(response.status_code, 200)
+        record = next(
+            record for record in logs.records if record.getMessage() == "Http request"
+        )
+        self.assertEqual(
+            record.__dict__["http_request"]["url"], "http://testserver/health?param=1"
+        )
+        self.assertEqual(record.__dict__["http_request"]["route"], "/health")
+        self.assertEqual(record.__dict__["http_request"]["method"], "GET")
+        self.assertEqual(record.__dict__["http_response"]["status"], 200)
+        self.assertGreaterEqual(record.__dict__["http_response"]["totalTime"], 0)
+
+        with self.assertLogs(level=logging.INFO) as logs:
+            response = self.client.get("/not-found")
+        self.assertEqual(response.status_code, 404)
+        record = next(
+            record for record in logs.records if record.getMessage() == "Http request"
+        )
+        self.assertIsNone(record.__dict__["http_request"]["route"])
+        self.assertEqual(record.__dict__["http_response"]["status"], 404)
+
+    @patch.object(RequestLogMiddleware, "log_request")
+    def test_request_log_is_lazy(self, mock_log_request: MagicMock):
+        root_logger = logging.getLogger()
+        previous_level = root_logger.level
+        root_logger.setLevel(logging.WARNING)
+        try:
+            self.assertEqual(self.client.get("/health").status_code, 200)
+            mock_log_request.assert_not_called()
+            root_logger.setLevel(logging.INFO)
+            self.assertEqual(self.client.get("/health").status_code, 200)
+            mock_log_request.assert_called_once()
+        finally:
+            root_logger.setLevel(previous_level)
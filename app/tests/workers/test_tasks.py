@@ -23,7 +23,8 @@ from app.workers.tasks import (
     task_to_test,
 )
 
-from ...datasources.cache.redis import get_redis
+from ...datasources.cache.compression import decompress
+from ...datasources.cache.redis import get_redis, split_etag
 from ...services.contract_metadata_service import ContractMetadataService
 from ..datasources.db.async_db_test_case import AsyncDbTestCase
 from ..mocks.contract_metadata_mocks import (
@@ -143,6 +144,19 @@ class TestAsyncTasks(AsyncDbTestCase):
         self.assertIsNotNone(contract)
         self.assertIsNotNone(contract.abi_id)
         self.assertEqual(etherscan_get_contract_metadata_mock.call_count, 2)
+        # Default page of the contract view is pre-rendered
+        default_page = await redis.get(
+            f"contract_default_page:{contract_address.lower()}"
+        )
+        self.assertIsNotNone(default_page)
+        etag, default_page = split_etag(default_page)
+        self.assertIsNotNone(etag)
+        default_page_json = json.loads(decompress(default_page))
+        self.assertEqual(default_page_json["count"], 1)
+        self.assertEqual(
+            default_page_json["results"][0]["abi"]["abiHash"],
+            "0x" + contract.abi.abi_hash.hex(),
+        )
 
     @mock.patch.object(
         AsyncEtherscanClientV2, "async_get_contract_metadata", autospec=True
@@ -1,8 +1,16 @@
 from datetime import datetime
+from typing import Any
 
+import msgpack
+import orjson
+from pydantic import BaseModel
 from starlette.datastructures import URL
 from starlette.requests import Request
 
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 def datetime_to_str(value: datetime) -> str:
     """
@@ -34,3 +42,104 @@ def get_proxy_aware_url(request: Request) -> URL:
             path=prefix + request.url.path,
         )
     return request.url
+
+
+def _get_header_qualities(request: Request, header: str) -> dict[str, float]:
+    """
+    :param request: The FastAPI/Starlette request object
+    :param header: Header with a list of values and their `q` param, e.g. `Accept`
+    :return: Quality of every value in the header
+    """
+    qualities: dict[str, float] = {}
+    for accepted in request.headers.get(header, "").split(","):
+        value, _, params = accepted.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, param_value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(param_value)
+                except ValueError:
+                    quality = 0.0
+        qualities[value.strip().lower()] = quality
+    return qualities
+
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    """
+    Check the `Accept-Encoding` header of the request
+
+    :param request: The FastAPI/Starlette request object
+    :param encoding: Content coding, e.g. `gzip`
+    :return: `True` if the client accepts responses with the provided `encoding`
+    """
+    qualities = _get_header_qualities(request, "accept-encoding")
+    return qualities.get(encoding, qualities.get("*", 0.0)) > 0
+
+
+def get_accepted_media_type(request: Request | None) -> str:
+    """
+    Negotiate the media type of the response using the `Accept` header of the request.
+    MessagePack has the same schema as JSON, and it's only returned if explicitly
+    requested with at least the same quality as JSON.
+
+    :param request: The FastAPI/Starlette request object
+    :return: `MSGPACK_MEDIA_TYPE` if requested, `JSON_MEDIA_TYPE` otherwise
+    """
+    if request is None or "msgpack" not in request.headers.get("accept", ""):
+        return JSON_MEDIA_TYPE
+    qualities = _get_header_qualities(request, "accept")
+    msgpack_quality = max(
+        qualities.get(MSGPACK_MEDIA_TYPE, 0.0),
+        qualities.get("application/x-msgpack", 0.0),
+    )
+    json_quality = max(
+        qualities.get(JSON_MEDIA_TYPE, 0.0),
+        qualities.get("application/*", 0.0),
+        qualities.get("*/*", 0.0),
+    )
+    if msgpack_quality > 0 and msgpack_quality >= json_quality:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def encode_content(content: Any, media_type: str) -> bytes:
+    """
+    :param content: JSON compatible content, e.g. a `dict` with `str` keys
+    :param media_type: `JSON_MEDIA_TYPE` or `MSGPACK_MEDIA_TYPE`
+    :return: Content serialized
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(content)
+    return orjson.dumps(content)
+
+
+def serialize_model(model: BaseModel, media_type: str) -> bytes:
+    """
+    :param model: Pydantic model to serialize using its aliases
+    :param media_type: `JSON_MEDIA_TYPE` or `MSGPACK_MEDIA_TYPE`
+    :return: Model serialized, MessagePack mirrors the JSON schema
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(model.model_dump(mode="json", by_alias=True))
+    return model.model_dump_json(by_alias=True).encode()
+
+
+def is_etag_fresh(request: Request, etag: str) -> bool:
+    """
+    Check the `If-None-Match` header of the request using the weak comparison,
+    as required for `If-None-Match`
+
+    :param request: The FastAPI/Starlette request object
+    :param etag: Current ETag of the resource, e.g. `"abc"` or `W/"abc"`
+    :return: `True` if the client copy is up to date, so `304 Not Modified` can be returned
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(",")
+    )
@@ -9,11 +9,17 @@ from safe_eth.eth.utils import fast_to_checksum_address
 from safe_eth.util.util import to_0x_hex_str
 
 from app.config import settings
-from app.datasources.cache.redis import del_contract_cache, get_redis
+from app.datasources.cache.redis import (
+    del_contract_cache,
+    get_redis,
+    set_contract_default_page_cache,
+)
 from app.datasources.db.database import db_session_context, with_db_session_context
 from app.datasources.db.models import Contract
 from app.loggers.safe_logger import logging_task_context
+from app.services.contract import render_contracts_default_page
 from app.services.contract_metadata_service import get_contract_metadata_service
+from app.services.data_decoder import del_contract_and_proxies_selectors_cache
 from app.services.safe_contracts_service import get_safe_contract_service
 
 logger = logging.getLogger(__name__)
@@ -63,8 +69,15 @@ async def get_contract_metadata_task(
             )
             if result:
                 logger.info("Success download contract metadata")
-                # Force invalidate contract cache view
+                # Force invalidate contract cache view and decoder cache, also for the
+                # proxies using the contract, as they merge its selectors
                 await del_contract_cache(address)
+                async with with_db_session_context():
+                    await del_contract_and_proxies_selectors_cache(address, chain_id)
+                # And rebuild the default page of the contract view, so readers don't miss
+                async with with_db_session_context():
+                    if default_page := await render_contracts_default_page(address):
+                        await set_contract_default_page_cache(address, default_page)
             else:
                 logger.info("Failed to download contract metadata")
 
@@ -0,0 +1,43 @@
+"""Add trigram indexes for contract names
+
+Revision ID: d7e1f4a2b9c3
+Revises: c3a9d5e7f1b2
+Create Date: 2026-10-19 11:04:52.190716
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7e1f4a2b9c3"
+down_revision: str | None = "c3a9d5e7f1b2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Contracts search uses `pg_trgm` operators and functions
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_contract_name_trgm",
+        "contract",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_contract_display_name_trgm",
+        "contract",
+        ["display_name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"display_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_contract_display_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_contract_name_trgm")
@@ -0,0 +1,36 @@
+"""Add index for contract implementation field
+
+Revision ID: f2b8c4d6a1e3
+Revises: d7e1f4a2b9c3
+Create Date: 2026-10-19 16:27:45.903812
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8c4d6a1e3"
+down_revision: str | None = "d7e1f4a2b9c3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_contract_implementation",
+        "contract",
+        ["implementation"],
+        unique=False,
+        postgresql_where=sa.text("implementation IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_contract_implementation",
+        table_name="contract",
+        postgresql_where=sa.text("implementation IS NOT NULL"),
+    )